@@ -2,23 +2,37 @@ from typing import TypeVar
 
 from minio import Minio
 from redis import Redis
-from sklearn.svm import SVC
+from sklearn.svm import (
+    SVC,
+    LinearSVC
+)
 from pymongo import MongoClient
+from sklearn.pipeline import Pipeline
 from xgboost import XGBClassifier
 from catboost import CatBoostClassifier
 from lightgbm.sklearn import LGBMClassifier
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import (
+    SGDClassifier,
+    LogisticRegression
+)
 from sklearn.naive_bayes import (
     GaussianNB,
     MultinomialNB
 )
 
-from . import storage
+from . import (
+    svm,
+    storage
+)
 from .config import Config
-from .exceptions import LockException
+from .exceptions import (
+    LockException,
+    UnknownColumnsException,
+    TrainingCancelledException
+)
 from .algorithm_params import (
     TAlgorithmParams,
     AvailableAlgorithm,
@@ -33,6 +47,13 @@ minio = Minio(
     secret_key=global_config.minio.secret_key,
     secure=False
 )
+minio_presigner = Minio(
+    endpoint=global_config.minio.public_url or global_config.minio.url,
+    access_key=global_config.minio.access_key,
+    secret_key=global_config.minio.secret_key,
+    secure=global_config.minio.public_secure,
+    region=global_config.minio.region
+)
 
 mongodb_client = MongoClient(global_config.mongo.url)
 mongo_database = mongodb_client[global_config.mongo.database]
@@ -42,11 +63,20 @@ mongo_collection_classifications = mongo_database[global_config.mongo.classifica
 mongo_collection_common_classifications = mongo_database[
     global_config.mongo.common_classifications_collection
 ]
+mongo_collection_dataset_profiles = mongo_database[global_config.mongo.dataset_profiles_collection]
+mongo_collection_searches = mongo_database[global_config.mongo.searches_collection]
+mongo_collection_cascade_reports = mongo_database[global_config.mongo.cascade_reports_collection]
+mongo_collection_benchmarks = mongo_database[global_config.mongo.benchmarks_collection]
 
 ALGORITHM_CLASS_BY_NAME_MAPPING = {
     AvailableAlgorithm.MULTINOMIAL_NAIVE_BAYES: MultinomialNB,
     AvailableAlgorithm.GAUSSIAN_NAIVE_BAYES: GaussianNB,
     AvailableAlgorithm.SUPPORT_VECTOR_MACHINES: SVC,
+    AvailableAlgorithm.LINEAR_SUPPORT_VECTOR_MACHINES: LinearSVC,
+    AvailableAlgorithm.SGD_SUPPORT_VECTOR_MACHINES: svm.make_sgd_svm,
+    AvailableAlgorithm.KERNEL_APPROXIMATION_SUPPORT_VECTOR_MACHINES: (
+        svm.make_kernel_approximation_svm
+    ),
     AvailableAlgorithm.K_NEAREST_NEIGHBORS: KNeighborsClassifier,
     AvailableAlgorithm.LOGISTIC_REGRESSION: LogisticRegression,
     AvailableAlgorithm.DECISION_TREE: DecisionTreeClassifier,
@@ -63,11 +93,14 @@ TModel = TypeVar(
     MultinomialNB,
     GaussianNB,
     SVC,
+    LinearSVC,
+    SGDClassifier,
     KNeighborsClassifier,
     LogisticRegression,
     DecisionTreeClassifier,
     RandomForestClassifier,
     XGBClassifier,
     CatBoostClassifier,
-    LGBMClassifier
+    LGBMClassifier,
+    Pipeline
 )
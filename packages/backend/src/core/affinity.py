@@ -0,0 +1,148 @@
+import time
+import uuid
+import bisect
+import hashlib
+import logging
+import threading
+
+from redis import Redis
+
+from .enums import TaskQueue
+from .models import AffinityWorker
+
+logger = logging.getLogger(__name__)
+
+# Sorted set of worker node names scored by time of their last heartbeat
+WORKERS_KEY = "classification_affinity:workers"
+STATISTICS_KEY_PREFIX = "classification_affinity:statistics:"
+COMMANDS_KEY_PREFIX = "classification_affinity:commands:"
+
+# Lock is deleted only by dispatch which owns it, so late callbacks of timed out dispatch
+# do not release lock of the next classification
+RELEASE_SCRIPT = """
+local owned = redis.call('GET', KEYS[1]) == ARGV[1]
+if owned then
+    redis.call('DEL', KEYS[1])
+end
+redis.call('DEL', KEYS[2])
+return owned and 1 or 0
+"""
+
+
+class HashRing:
+    """
+    Consistent hash ring of worker nodes with virtual replicas.
+
+    When node joins or leaves, only keys of its ring segments move to other nodes,
+    so models stay on workers which have already cached them.
+    """
+
+    def __init__(self, nodes: list[str], replicas: int) -> None:
+        points = sorted(
+            (_hash(f"{node}#{replica}"), node) for node in nodes for replica in range(replicas)
+        )
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def get_node(self, key: str) -> str:
+        if not self._nodes:
+            raise ValueError("Hash ring has no nodes")
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._nodes[index]
+
+
+def get_worker_queue(node: str) -> str:
+    return f"{TaskQueue.CLASSIFICATION.value}.{node}"
+
+
+def register_worker(redis: Redis, node: str) -> None:
+    redis.zadd(WORKERS_KEY, {node: time.time()})
+
+
+def unregister_worker(redis: Redis, node: str) -> None:
+    redis.zrem(WORKERS_KEY, node)
+
+
+def get_alive_workers(redis: Redis, ttl: int) -> list[str]:
+    redis.zremrangebyscore(WORKERS_KEY, "-inf", time.time() - ttl)
+    return sorted(node.decode() for node in redis.zrange(WORKERS_KEY, 0, -1))
+
+
+def start_heartbeat(redis: Redis, node: str, interval: int) -> threading.Event:
+    """Refresh worker registration in background thread until returned event is set."""
+    stopped = threading.Event()
+
+    def beat() -> None:
+        while not stopped.is_set():
+            try:
+                register_worker(redis=redis, node=node)
+            except Exception:
+                logger.exception(f"Heartbeat of worker {node!r} failed")
+            stopped.wait(interval)
+        unregister_worker(redis=redis, node=node)
+
+    threading.Thread(target=beat, name="affinity-heartbeat", daemon=True).start()
+    return stopped
+
+
+def record_cache_access(redis: Redis, node: str, hit: bool) -> None:
+    redis.hincrby(f"{STATISTICS_KEY_PREFIX}{node}", "hits" if hit else "misses", 1)
+
+
+def get_workers_statistics(redis: Redis, ttl: int) -> list[AffinityWorker]:
+    workers = []
+    for node in get_alive_workers(redis=redis, ttl=ttl):
+        statistics = redis.hgetall(f"{STATISTICS_KEY_PREFIX}{node}")
+        hits, misses = int(statistics.get(b"hits", 0)), int(statistics.get(b"misses", 0))
+        workers.append(AffinityWorker(
+            node=node,
+            queue=get_worker_queue(node),
+            hits=hits,
+            misses=misses,
+            hit_rate=round(hits / (hits + misses), 6) if hits + misses else None
+        ))
+    return workers
+
+
+def start_dispatch(
+        redis: Redis,
+        lock_key: str,
+        commands_data: bytes,
+        lock_expiration: int,
+        timeout: int
+) -> str:
+    """
+    Take over classification lock by new dispatch and store its commands once.
+
+    Sub-tasks load commands by returned dispatch id instead of carrying them in messages.
+    """
+    dispatch_id = uuid.uuid4().hex
+    redis.set(f"{COMMANDS_KEY_PREFIX}{dispatch_id}", commands_data, ex=timeout)
+    redis.set(lock_key, dispatch_id, ex=lock_expiration)
+    return dispatch_id
+
+
+def load_dispatch_commands(redis: Redis, dispatch_id: str) -> bytes:
+    commands_data = redis.get(f"{COMMANDS_KEY_PREFIX}{dispatch_id}")
+    if commands_data is None:
+        raise ValueError(f"Commands of classification dispatch {dispatch_id!r} have expired")
+    return bytes(commands_data)
+
+
+def owns_lock(redis: Redis, lock_key: str, dispatch_id: str) -> bool:
+    return bool(redis.get(lock_key) == dispatch_id.encode())
+
+
+def release_dispatch(redis: Redis, lock_key: str, dispatch_id: str) -> bool:
+    """Delete commands of dispatch and its lock, return whether lock was still owned by it."""
+    return bool(redis.eval(
+        RELEASE_SCRIPT,
+        2,
+        lock_key,
+        f"{COMMANDS_KEY_PREFIX}{dispatch_id}",
+        dispatch_id
+    ))
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], "big")
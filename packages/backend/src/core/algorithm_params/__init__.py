@@ -5,7 +5,12 @@ from .lightgbm import LightGBMParams
 from .catboost import CatBoostParams
 from .base import BaseAlgorithmParams
 from .enums import AvailableAlgorithm
-from .support_vector_machines import SVCParams
+from .support_vector_machines import (
+    SVCParams,
+    SGDSVMParams,
+    LinearSVCParams,
+    KernelApproximationSVMParams
+)
 from .gaussian_naive_bayes import GaussianNBParams
 from .random_forest import RandomForestClassifierParams
 from .decision_tree import DecisionTreeClassifierParams
@@ -18,6 +23,9 @@ available_algorithms_params = {
     AvailableAlgorithm.GAUSSIAN_NAIVE_BAYES: GaussianNBParams,
     AvailableAlgorithm.MULTINOMIAL_NAIVE_BAYES: MultinomialNBClassifierParams,
     AvailableAlgorithm.SUPPORT_VECTOR_MACHINES: SVCParams,
+    AvailableAlgorithm.LINEAR_SUPPORT_VECTOR_MACHINES: LinearSVCParams,
+    AvailableAlgorithm.SGD_SUPPORT_VECTOR_MACHINES: SGDSVMParams,
+    AvailableAlgorithm.KERNEL_APPROXIMATION_SUPPORT_VECTOR_MACHINES: KernelApproximationSVMParams,
     AvailableAlgorithm.K_NEAREST_NEIGHBORS: KNearestNeighborsClassifierParams,
     AvailableAlgorithm.LOGISTIC_REGRESSION: LogisticRegressionClassifierParams,
     AvailableAlgorithm.DECISION_TREE: DecisionTreeClassifierParams,
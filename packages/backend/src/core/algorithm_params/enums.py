@@ -5,6 +5,9 @@ class AvailableAlgorithm(str, Enum):
     GAUSSIAN_NAIVE_BAYES = "GaussianNaiveBayes"
     MULTINOMIAL_NAIVE_BAYES = "MultinomialNaiveBayes"
     SUPPORT_VECTOR_MACHINES = "SupportVectorMachines"
+    LINEAR_SUPPORT_VECTOR_MACHINES = "LinearSupportVectorMachines"
+    SGD_SUPPORT_VECTOR_MACHINES = "SGDSupportVectorMachines"
+    KERNEL_APPROXIMATION_SUPPORT_VECTOR_MACHINES = "KernelApproximationSupportVectorMachines"
     K_NEAREST_NEIGHBORS = "KNearestNeighbors"
     LOGISTIC_REGRESSION = "LogisticRegression"
     DECISION_TREE = "DecisionTree"
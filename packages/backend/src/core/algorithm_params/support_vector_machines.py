@@ -2,7 +2,8 @@ from typing import Literal
 
 from pydantic import (
     Field,
-    field_validator
+    field_validator,
+    model_validator
 )
 
 from .base import BaseAlgorithmParams
@@ -10,6 +11,12 @@ from .base import BaseAlgorithmParams
 Gamma = Literal["scale", "auto"]
 DecisionFunctionShape = Literal["ovo", "ovr"]
 Kernel = Literal["linear", "poly", "rbf", "sigmoid", "precomputed"]
+LinearPenalty = Literal["l1", "l2"]
+LinearLoss = Literal["hinge", "squared_hinge"]
+SGDPenalty = Literal["l1", "l2", "elasticnet"]
+LearningRate = Literal["constant", "optimal", "invscaling", "adaptive"]
+KernelApproximation = Literal["nystroem", "random_fourier"]
+ApproximatedKernel = Literal["rbf", "laplacian", "poly", "sigmoid", "chi2"]
 
 
 class SVCParams(BaseAlgorithmParams):
@@ -38,3 +45,70 @@ class SVCParams(BaseAlgorithmParams):
             if value <= 0:
                 raise ValueError("Gamma must be greater than 0")
         return value
+
+
+class LinearSVCParams(BaseAlgorithmParams):
+    class Config:
+        title = "Linear Support Vector Machines"
+
+    C: float = Field(default=1.0, title="Regularization parameter", gt=0.0)
+    penalty: LinearPenalty = Field(default="l2", title="Penalty")
+    loss: LinearLoss = Field(default="squared_hinge", title="Loss function")
+    dual: bool = Field(default=False, title="Dual formulation")
+    tol: float = Field(default=1e-4, title="Tolerance for stopping criterion")
+    fit_intercept: bool = Field(default=True, title="Fit intercept")
+    max_iter: int = Field(default=1000, title="Maximum number of iterations")
+
+    @model_validator(mode="after")
+    def validate_solver_combination(self) -> "LinearSVCParams":
+        # Only these combinations are implemented by liblinear solver
+        if self.penalty == "l1" and self.loss == "hinge":
+            raise ValueError("Penalty l1 is not supported with hinge loss")
+        if self.penalty == "l1" and self.dual:
+            raise ValueError("Penalty l1 is supported only with primal formulation (dual=false)")
+        if self.loss == "hinge" and not self.dual:
+            raise ValueError("Hinge loss is supported only with dual formulation (dual=true)")
+        return self
+
+
+class SGDSVMParams(BaseAlgorithmParams):
+    class Config:
+        title = "SGD Support Vector Machines"
+
+    alpha: float = Field(default=1e-4, title="Regularization term multiplier", gt=0.0)
+    penalty: SGDPenalty = Field(default="l2", title="Penalty")
+    l1_ratio: float = Field(default=0.15, title="Elastic net mixing parameter", ge=0.0, le=1.0)
+    fit_intercept: bool = Field(default=True, title="Fit intercept")
+    max_iter: int = Field(default=1000, title="Maximum number of epochs")
+    tol: float | None = Field(default=1e-3, title="Tolerance for stopping criterion")
+    learning_rate: LearningRate = Field(default="optimal", title="Learning rate schedule")
+    eta0: float = Field(default=0.0, title="Initial learning rate")
+    early_stopping: bool = Field(default=False, title="Stop on validation score")
+    average: bool = Field(default=False, title="Average weights over updates")
+
+
+class KernelApproximationSVMParams(BaseAlgorithmParams):
+    class Config:
+        title = "Kernel Approximation Support Vector Machines"
+
+    kernel_approximation: KernelApproximation = Field(
+        default="nystroem",
+        title="Kernel approximation method"
+    )
+    kernel: ApproximatedKernel = Field(default="rbf", title="Kernel approximated by Nystroem")
+    gamma: float | None = Field(default=None, title="Kernel coefficient")
+    n_components: int = Field(default=300, title="Number of approximated features", gt=0)
+    C: float = Field(default=1.0, title="Regularization parameter", gt=0.0)
+    tol: float = Field(default=1e-4, title="Tolerance for stopping criterion")
+    max_iter: int = Field(default=1000, title="Maximum number of iterations")
+    random_state: int | None = Field(
+        default=0,
+        title="Seed of sampled components of kernel approximation"
+    )
+
+    @field_validator("gamma", mode="after")
+    @classmethod
+    def validate_gamma(cls, value: float | None) -> float | None:
+        if value is not None and value <= 0:
+            raise ValueError("Gamma must be greater than 0")
+        return value
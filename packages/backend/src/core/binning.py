@@ -0,0 +1,181 @@
+import os
+import uuid
+import hashlib
+import logging
+import pathlib
+from typing import Callable
+
+import numpy as np
+import lightgbm
+from catboost import (
+    Pool,
+    CatBoostClassifier
+)
+from lightgbm.sklearn import LGBMClassifier
+from sklearn.preprocessing import LabelEncoder
+
+from . import TModel
+
+logger = logging.getLogger(__name__)
+
+LIGHTGBM_MAX_BIN = 255
+CATBOOST_BORDER_COUNT = 254
+# Parameters of LightGBM scikit-learn wrapper which are not booster parameters
+LIGHTGBM_WRAPPER_PARAMS = ("n_estimators", "importance_type", "class_weight")
+
+
+def supports_binning(model: TModel) -> bool:
+    return isinstance(model, (LGBMClassifier, CatBoostClassifier))
+
+
+def get_lightgbm_dataset_params(model: LGBMClassifier) -> dict:
+    # Features are not pre-filtered, so binary dataset stays valid for any min_child_samples
+    return {
+        "max_bin": LIGHTGBM_MAX_BIN,
+        "bin_construct_sample_cnt": model.get_params()["subsample_for_bin"],
+        "feature_pre_filter": False,
+        "verbose": -1
+    }
+
+
+def train_lightgbm(
+        model: LGBMClassifier,
+        train_set: lightgbm.Dataset,
+        x_sample: np.ndarray,
+        y_sample: np.ndarray,
+        callbacks: list | None = None
+) -> LGBMClassifier:
+    """
+    Train booster of binary LightGBM wrapper on prepared dataset.
+
+    Dataset is built by caller, e.g. from cached binary file or from chunked sequence.
+    Fitted state of wrapper is set by its own fit on rows of ``get_class_sample_indices``,
+    and then its booster is replaced by the trained one, so stored model predicts and
+    pickles like a model fitted from raw data.
+    """
+    params = model.get_params()
+    booster_params = {
+        name: value for name, value in params.items()
+        if name not in LIGHTGBM_WRAPPER_PARAMS and value is not None
+    }
+    booster = lightgbm.train(
+        params={**booster_params, **get_lightgbm_dataset_params(model), "objective": "binary"},
+        train_set=train_set,
+        num_boost_round=params["n_estimators"],
+        callbacks=callbacks
+    )
+    model.set_params(n_estimators=1)
+    try:
+        model.fit(x_sample, y_sample)
+    finally:
+        model.set_params(n_estimators=params["n_estimators"])
+    model.booster_.model_from_string(booster.model_to_string())
+    return model
+
+
+def get_class_sample_indices(y: np.ndarray) -> np.ndarray:
+    """Return sorted indices of the first row of each class."""
+    return np.sort(np.unique(y, return_index=True)[1])
+
+
+def fit_binned(
+        model: TModel,
+        x_train: np.ndarray,
+        y_train: np.ndarray,
+        path_prefix: str,
+        callbacks: list | None = None
+) -> TModel:
+    """
+    Fit boosted model on its native pre-binned training data cached on worker disk.
+
+    Binned data is built once per dataset split and binning parameters, so repeated
+    trainings with other boosting parameters skip the binning phase.
+    """
+    if isinstance(model, LGBMClassifier):
+        return _fit_lightgbm(
+            model=model,
+            x_train=x_train,
+            y_train=y_train,
+            path_prefix=path_prefix,
+            callbacks=callbacks
+        )
+    if isinstance(model, CatBoostClassifier):
+        return _fit_catboost(
+            model=model,
+            x_train=x_train,
+            y_train=y_train,
+            path_prefix=path_prefix,
+            callbacks=callbacks
+        )
+    raise ValueError(f"Pre-binned training is not supported for model {type(model).__name__}")
+
+
+def _fit_lightgbm(
+        model: LGBMClassifier,
+        x_train: np.ndarray,
+        y_train: np.ndarray,
+        path_prefix: str,
+        callbacks: list | None
+) -> LGBMClassifier:
+    label_encoder = LabelEncoder().fit(y_train)
+    if len(label_encoder.classes_) != 2:
+        logger.info("Pre-binned LightGBM training supports only binary target, fit from raw data")
+        return model.fit(x_train, y_train, callbacks=callbacks)
+
+    dataset_params = get_lightgbm_dataset_params(model)
+    path = _get_binned_path(path_prefix=path_prefix, name="lightgbm", params=dataset_params)
+    if not path.exists():
+        logger.info(f"Build LightGBM binary dataset {path.name!r}")
+        dataset = lightgbm.Dataset(
+            x_train,
+            label=label_encoder.transform(y_train),
+            params=dataset_params
+        ).construct()
+        _save_atomically(path=path, save=dataset.save_binary)
+    else:
+        logger.info(f"Use cached LightGBM binary dataset {path.name!r}")
+
+    sample_indices = get_class_sample_indices(y_train)
+    return train_lightgbm(
+        model=model,
+        train_set=lightgbm.Dataset(str(path), params=dataset_params),
+        x_sample=x_train[sample_indices],
+        y_sample=y_train[sample_indices],
+        callbacks=callbacks
+    )
+
+
+def _fit_catboost(
+        model: CatBoostClassifier,
+        x_train: np.ndarray,
+        y_train: np.ndarray,
+        path_prefix: str,
+        callbacks: list | None
+) -> CatBoostClassifier:
+    quantization_params = {
+        "border_count": CATBOOST_BORDER_COUNT,
+        "nan_mode": model.get_params().get("nan_mode") or "Min"
+    }
+    path = _get_binned_path(path_prefix=path_prefix, name="catboost", params=quantization_params)
+    if not path.exists():
+        logger.info(f"Build CatBoost quantized pool {path.name!r}")
+        pool = Pool(x_train, label=y_train)
+        pool.quantize(**quantization_params)
+        _save_atomically(path=path, save=pool.save)
+    else:
+        logger.info(f"Use cached CatBoost quantized pool {path.name!r}")
+    return model.fit(Pool(f"quantized://{path}"), callbacks=callbacks, verbose=False)
+
+
+def _get_binned_path(path_prefix: str, name: str, params: dict) -> pathlib.Path:
+    key = hashlib.md5(repr(sorted(params.items())).encode()).hexdigest()[:12]
+    return pathlib.Path(f"{path_prefix}_{name}_{key}.bin")
+
+
+def _save_atomically(path: pathlib.Path, save: Callable[[str], object]) -> None:
+    temporary_path = path.parent / f".{uuid.uuid4().hex}.bin"
+    try:
+        save(str(temporary_path))
+        os.replace(temporary_path, path)
+    finally:
+        temporary_path.unlink(missing_ok=True)
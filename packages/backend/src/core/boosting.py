@@ -0,0 +1,98 @@
+import logging
+
+import numpy as np
+import lightgbm
+from xgboost import XGBClassifier
+from xgboost.callback import EarlyStopping
+from catboost import CatBoostClassifier
+from lightgbm.sklearn import LGBMClassifier
+
+from . import TModel
+from .algorithm_params import AvailableAlgorithm
+
+logger = logging.getLogger(__name__)
+
+BOOSTING_ALGORITHMS = (
+    AvailableAlgorithm.XGBOOST_CLASSIFIER,
+    AvailableAlgorithm.LIGHTGBM_CLASSIFIER,
+    AvailableAlgorithm.CATBOOST_CLASSIFIER
+)
+
+
+def fit_with_early_stopping(
+        model: TModel,
+        x_train: np.ndarray,
+        y_train: np.ndarray,
+        x_valid: np.ndarray,
+        y_valid: np.ndarray,
+        rounds: int,
+        callbacks: list | None = None
+) -> int:
+    """
+    Fit boosted model until validation loss stops improving for ``rounds`` iterations.
+
+    Native callback of each library is used, so boosting stops inside library loop.
+    Returns number of the best boosting round counted from one. ``callbacks`` are native
+    per-iteration callbacks of the library, e.g. for progress reporting.
+    """
+    if isinstance(model, XGBClassifier):
+        # Trees after the best iteration are dropped, so serialized model gets smaller
+        model.set_params(callbacks=[
+            EarlyStopping(rounds=rounds, save_best=True),
+            *(callbacks or [])
+        ])
+        try:
+            model.fit(x_train, y_train, eval_set=[(x_valid, y_valid)], verbose=False)
+        finally:
+            model.set_params(callbacks=None)
+        return int(model.get_booster().num_boosted_rounds())
+    if isinstance(model, LGBMClassifier):
+        model.fit(
+            x_train,
+            y_train,
+            eval_set=[(x_valid, y_valid)],
+            callbacks=[
+                lightgbm.early_stopping(stopping_rounds=rounds, verbose=False),
+                *(callbacks or [])
+            ]
+        )
+        best_iteration = int(model.best_iteration_)
+        # Trees after the best iteration are dropped explicitly, the same as XGBoost and
+        # CatBoost do, instead of relying on how lightgbm.train reloads its booster
+        booster = model.booster_
+        if booster.current_iteration() > best_iteration:
+            booster.model_from_string(booster.model_to_string(num_iteration=best_iteration))
+        model.set_params(n_estimators=best_iteration)
+        return best_iteration
+    if isinstance(model, CatBoostClassifier):
+        model.fit(
+            x_train,
+            y_train,
+            eval_set=(x_valid, y_valid),
+            early_stopping_rounds=rounds,
+            use_best_model=True,
+            callbacks=callbacks or None,
+            verbose=False
+        )
+        return int(model.get_best_iteration()) + 1
+    raise ValueError(f"Early stopping is not supported for model {type(model).__name__}")
+
+
+def fit_with_callbacks(
+        model: TModel,
+        x_train: np.ndarray,
+        y_train: np.ndarray,
+        callbacks: list | None = None
+) -> TModel:
+    """Fit model passing native per-iteration callbacks to boosting libraries."""
+    if not callbacks:
+        return model.fit(x_train, y_train)
+    if isinstance(model, XGBClassifier):
+        model.set_params(callbacks=callbacks)
+        try:
+            return model.fit(x_train, y_train, verbose=False)
+        finally:
+            model.set_params(callbacks=None)
+    if isinstance(model, (LGBMClassifier, CatBoostClassifier)):
+        return model.fit(x_train, y_train, callbacks=callbacks)
+    raise ValueError(f"Callbacks are not supported for model {type(model).__name__}")
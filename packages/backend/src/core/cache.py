@@ -0,0 +1,266 @@
+import os
+import json
+import uuid
+import hashlib
+import shutil
+import logging
+import pathlib
+from typing import (
+    Callable,
+    Iterator
+)
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from . import dtypes
+from .models import (
+    DatasetSplit,
+    DatasetArrays
+)
+
+logger = logging.getLogger(__name__)
+
+FEATURES_FILENAME = "features.npy"
+TARGET_FILENAME = "target.npy"
+COLUMNS_FILENAME = "columns.json"
+SPLITS_DIRNAME = "splits"
+BINNED_DIRNAME = "binned"
+MODEL_FILENAME = "model.pkl"
+
+
+def parse_dataset(file_data: bytes) -> tuple[np.ndarray, np.ndarray, list[str]]:
+    dataframe, columns = dtypes.read_csv(file_data=file_data, last_column_is_target=True)
+    x = np.ascontiguousarray(dataframe.iloc[:, :-1].to_numpy(dtype=dtypes.FEATURES_DTYPE))
+    y = dataframe.iloc[:, -1].to_numpy()
+    del dataframe
+    return x, y, columns
+
+
+def load_dataset(
+        md5: str,
+        cache_dir_path: str,
+        max_size: int,
+        loader: Callable[[], bytes]
+) -> DatasetArrays:
+    """Load parsed dataset arrays memory-mapped from worker disk cache, filling it on miss."""
+    dataset_dir = pathlib.Path(cache_dir_path) / md5
+    if not (dataset_dir / COLUMNS_FILENAME).exists():
+        logger.info(f"Dataset with md5 {md5!r} is not cached, start parsing")
+        x, y, columns = parse_dataset(file_data=loader())
+        _write_dataset(dataset_dir=dataset_dir, x=x, y=y, columns=columns)
+        evict(cache_dir_path=cache_dir_path, max_size=max_size, keep=md5)
+    else:
+        logger.info(f"Dataset with md5 {md5!r} was found in cache")
+    os.utime(dataset_dir)
+    return open_dataset(md5=md5, cache_dir_path=cache_dir_path)
+
+
+def load_dataset_streaming(
+        md5: str,
+        cache_dir_path: str,
+        max_size: int,
+        samples: int,
+        chunks: Callable[[], Iterator[pd.DataFrame]]
+) -> DatasetArrays:
+    """
+    Load dataset arrays like ``load_dataset``, but fill cache on miss chunk by chunk.
+
+    Arrays are written straight into memory-mapped files, so dataset is never fully
+    held in worker memory. Features are kept as float32, the same as in ``load_dataset``.
+    """
+    dataset_dir = pathlib.Path(cache_dir_path) / md5
+    if not (dataset_dir / COLUMNS_FILENAME).exists():
+        logger.info(f"Dataset with md5 {md5!r} is not cached, start streaming parsing")
+        _write_dataset_chunks(dataset_dir=dataset_dir, samples=samples, chunks=chunks())
+        evict(cache_dir_path=cache_dir_path, max_size=max_size, keep=md5)
+    else:
+        logger.info(f"Dataset with md5 {md5!r} was found in cache")
+    os.utime(dataset_dir)
+    return open_dataset(md5=md5, cache_dir_path=cache_dir_path)
+
+
+def open_dataset(md5: str, cache_dir_path: str) -> DatasetArrays:
+    """Open already cached dataset arrays memory-mapped, e.g. in child processes of worker."""
+    dataset_dir = pathlib.Path(cache_dir_path) / md5
+    if not (dataset_dir / COLUMNS_FILENAME).exists():
+        raise ValueError(f"Dataset with md5 {md5} was not found in cache")
+    with open(dataset_dir / COLUMNS_FILENAME) as file:
+        columns = json.load(file)
+    return DatasetArrays(
+        x=np.load(dataset_dir / FEATURES_FILENAME, mmap_mode="r"),
+        y=np.load(dataset_dir / TARGET_FILENAME, mmap_mode="r"),
+        columns=columns
+    )
+
+
+def load_split(
+        md5: str,
+        cache_dir_path: str,
+        samples: int,
+        training_data_proportion: float,
+        random_state: int
+) -> DatasetSplit:
+    """Load train and test indices for dataset, so the same split is reused between trainings."""
+    splits_dir = pathlib.Path(cache_dir_path) / md5 / SPLITS_DIRNAME
+    split_path = splits_dir / f"{_get_split_name(training_data_proportion, random_state)}.npz"
+    if not split_path.exists():
+        logger.info(
+            f"Split of dataset with md5 {md5!r} for proportion {training_data_proportion} "
+            f"and random state {random_state} is not cached, start splitting"
+        )
+        train_indices, test_indices = train_test_split(
+            np.arange(samples),
+            train_size=training_data_proportion,
+            random_state=random_state
+        )
+        splits_dir.mkdir(parents=True, exist_ok=True)
+        temporary_path = splits_dir / f".{uuid.uuid4().hex}.npz"
+        np.savez(temporary_path, train=train_indices, test=test_indices)
+        os.replace(temporary_path, split_path)
+    with np.load(split_path) as split:
+        return DatasetSplit(train_indices=split["train"], test_indices=split["test"])
+
+
+def get_binned_path_prefix(
+        md5: str,
+        cache_dir_path: str,
+        training_data_proportion: float,
+        random_state: int,
+        feature_mask: bytes | None = None
+) -> str:
+    """Return path prefix of algorithm-native binned training data of dataset split."""
+    binned_dir = pathlib.Path(cache_dir_path) / md5 / BINNED_DIRNAME
+    binned_dir.mkdir(parents=True, exist_ok=True)
+    name = _get_split_name(training_data_proportion, random_state)
+    if feature_mask:
+        name = f"{name}_{hashlib.md5(feature_mask).hexdigest()[:12]}"
+    return str(binned_dir / name)
+
+
+def load_model_file(
+        md5: str,
+        cache_dir_path: str,
+        max_size: int,
+        loader: Callable[[], bytes]
+) -> tuple[bytes, bool]:
+    """Load serialized model from worker disk cache, filling it on miss; return it and hit flag."""
+    model_dir = pathlib.Path(cache_dir_path) / md5
+    model_path = model_dir / MODEL_FILENAME
+    if model_path.exists():
+        logger.info(f"Model with md5 {md5!r} was found in cache")
+        os.utime(model_dir)
+        return model_path.read_bytes(), True
+    logger.info(f"Model with md5 {md5!r} is not cached, start downloading")
+    data = loader()
+    model_dir.mkdir(parents=True, exist_ok=True)
+    temporary_path = model_dir / f".{uuid.uuid4().hex}.pkl"
+    temporary_path.write_bytes(data)
+    os.replace(temporary_path, model_path)
+    evict(cache_dir_path=cache_dir_path, max_size=max_size, keep=md5)
+    return data, False
+
+
+def evict(cache_dir_path: str, max_size: int, keep: str | None = None) -> None:
+    """Remove least recently used datasets and models until cache fits into ``max_size`` bytes."""
+    cache_dir = pathlib.Path(cache_dir_path)
+    entries = [
+        (path.stat().st_mtime, _get_dir_size(path), path)
+        for path in cache_dir.iterdir() if path.is_dir() and not path.name.startswith(".")
+    ]
+    total_size = sum(size for _, size, _ in entries)
+    for _mtime, size, path in sorted(entries):
+        if total_size <= max_size:
+            return
+        if path.name == keep:
+            continue
+        logger.info(f"Evict cache entry with md5 {path.name!r}")
+        shutil.rmtree(path, ignore_errors=True)
+        total_size -= size
+
+
+def _write_dataset(
+        dataset_dir: pathlib.Path,
+        x: np.ndarray,
+        y: np.ndarray,
+        columns: list[str]
+) -> None:
+    # Files are written into temporary directory and renamed, so concurrent workers
+    # never see partially written dataset
+    temporary_dir = dataset_dir.parent / f".{dataset_dir.name}.{uuid.uuid4().hex}"
+    temporary_dir.mkdir(parents=True)
+    np.save(temporary_dir / FEATURES_FILENAME, x)
+    np.save(temporary_dir / TARGET_FILENAME, y)
+    with open(temporary_dir / COLUMNS_FILENAME, "w") as file:
+        json.dump(columns, file)
+    _commit_dataset_dir(temporary_dir=temporary_dir, dataset_dir=dataset_dir)
+
+
+def _write_dataset_chunks(
+        dataset_dir: pathlib.Path,
+        samples: int,
+        chunks: Iterator[pd.DataFrame]
+) -> None:
+    temporary_dir = dataset_dir.parent / f".{dataset_dir.name}.{uuid.uuid4().hex}"
+    temporary_dir.mkdir(parents=True)
+    x: np.ndarray | None = None
+    y: np.ndarray | None = None
+    columns: list[str] = []
+    offset = 0
+    try:
+        for chunk in chunks:
+            chunk_x = chunk.iloc[:, :-1].to_numpy(dtype=dtypes.FEATURES_DTYPE)
+            chunk_y = chunk.iloc[:, -1].to_numpy()
+            if x is None or y is None:
+                columns = [str(column) for column in chunk.columns[:-1]]
+                x = np.lib.format.open_memmap(
+                    temporary_dir / FEATURES_FILENAME,
+                    mode="w+",
+                    dtype=dtypes.FEATURES_DTYPE,
+                    shape=(samples, chunk_x.shape[1])
+                )
+                y = np.lib.format.open_memmap(
+                    temporary_dir / TARGET_FILENAME,
+                    mode="w+",
+                    dtype=chunk_y.dtype,
+                    shape=(samples,)
+                )
+            if offset + len(chunk_x) > samples:
+                raise ValueError(f"Dataset contains more than {samples} samples")
+            x[offset:offset + len(chunk_x)] = chunk_x
+            y[offset:offset + len(chunk_y)] = chunk_y
+            offset += len(chunk_x)
+        if x is None or y is None:
+            raise ValueError("Dataset does not contain any samples")
+        if offset != samples:
+            raise ValueError(f"Dataset contains {offset} samples instead of {samples}")
+        x.flush()
+        y.flush()
+        del x, y
+    except Exception:
+        shutil.rmtree(temporary_dir, ignore_errors=True)
+        raise
+    with open(temporary_dir / COLUMNS_FILENAME, "w") as file:
+        json.dump(columns, file)
+    _commit_dataset_dir(temporary_dir=temporary_dir, dataset_dir=dataset_dir)
+
+
+def _commit_dataset_dir(temporary_dir: pathlib.Path, dataset_dir: pathlib.Path) -> None:
+    try:
+        os.rename(temporary_dir, dataset_dir)
+    except OSError:
+        if (dataset_dir / COLUMNS_FILENAME).exists():
+            logger.info(f"Dataset {dataset_dir.name!r} was already cached by another process")
+            shutil.rmtree(temporary_dir, ignore_errors=True)
+            return
+        shutil.rmtree(dataset_dir, ignore_errors=True)
+        os.rename(temporary_dir, dataset_dir)
+
+
+def _get_split_name(training_data_proportion: float, random_state: int) -> str:
+    return f"{training_data_proportion!r}_{random_state}"
+
+
+def _get_dir_size(path: pathlib.Path) -> int:
+    return sum(file.stat().st_size for file in path.rglob("*") if file.is_file())
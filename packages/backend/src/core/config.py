@@ -1,5 +1,8 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
+from .enums import WorkerProfile
+
 
 class BaseConfig(BaseSettings):
     class Config:
@@ -24,6 +27,10 @@ class MongoConfig(BaseConfig):
     datasets_collection: str
     classifications_collection: str
     common_classifications_collection: str
+    dataset_profiles_collection: str
+    searches_collection: str
+    cascade_reports_collection: str
+    benchmarks_collection: str
 
 
 class RedisConfig(BaseConfig):
@@ -38,6 +45,12 @@ class MinioConfig(BaseConfig):
     trained_models_bucket_name: str
     preprocessed_datasets_bucket_name: str
     part_size: int = 8 * 1024 * 1024  # 1 megabyte
+    preview_chunk_size: int = 256 * 1024  # 256 kilobytes
+    public_url: str | None = None  # endpoint reachable by clients for presigned urls
+    public_secure: bool = False
+    region: str = "us-east-1"
+    presigned_url_expiration: int = 900  # 15 minutes
+    upload_expiration: int = 24 * 60 * 60  # 1 day
 
 
 class InitialFilesConfig(BaseConfig):
@@ -46,13 +59,57 @@ class InitialFilesConfig(BaseConfig):
     preprocessed_datasets_dir_path: str
 
 
+class CacheConfig(BaseConfig):
+    dir_path: str = "/tmp/obfuscation-detecting/cache"
+    max_size: int = 10 * 1024 * 1024 * 1024  # 10 gigabytes
+
+
+class CeleryConfig(BaseConfig):
+    worker_profile: WorkerProfile = WorkerProfile.ALL  # queues consumed by worker
+    visibility_timeout: int = 6 * 60 * 60  # 6 hours, longer than any late acknowledged task
+    # Priorities of task families, 0 is the highest priority for Redis broker
+    classification_priority: int = Field(default=0, ge=0, le=9)
+    maintenance_priority: int = Field(default=3, ge=0, le=9)
+    datasets_priority: int = Field(default=5, ge=0, le=9)
+    initialization_priority: int = Field(default=5, ge=0, le=9)
+    training_priority: int = Field(default=7, ge=0, le=9)
+    # Long tasks are acknowledged after execution, so they are redelivered if worker dies
+    classification_acks_late: bool = False
+    maintenance_acks_late: bool = False
+    datasets_acks_late: bool = True
+    initialization_acks_late: bool = False
+    training_acks_late: bool = True
+    # Messages reserved in advance by each worker process
+    interactive_prefetch_multiplier: int = 4
+    training_prefetch_multiplier: int = 1
+    # Per-model classification sub-tasks are routed to workers by consistent hashing of md5
+    classification_affinity: bool = True
+    affinity_replicas: int = 100  # virtual nodes of each worker on hash ring
+    affinity_heartbeat_interval: int = 10  # seconds
+    affinity_heartbeat_ttl: int = 30  # seconds, worker leaves ring without heartbeat
+    affinity_dispatch_timeout: int = 600  # seconds, then unfinished sub-tasks are dropped
+    model_cache_size: int = 4  # deserialized models kept in memory by worker process
+
+
 class Config(BaseConfig):
     app: AppConfig
     mongo: MongoConfig
     redis: RedisConfig
     minio: MinioConfig
     initial_files: InitialFilesConfig
+    cache: CacheConfig
+    celery: CeleryConfig
     locked_task_expiration: int = 1800  # 30 minutes
     locked_task_countdown: int = 15  # 15 seconds
     locked_task_max_retries: int = 100
     commands_column_name: str = "command"
+    dataset_chunk_size: int = 1000  # rows per chunk for streaming dataset parsing
+    training_chunk_size: int = 100000  # rows per chunk for out-of-core training
+    max_test_samples: int = 100000  # test rows kept in memory by out-of-core training
+    fused_scoring_verify_samples: int = 1000  # commands checked against per-model prediction
+    cascade_threshold: float = 0.9  # probability needed to decide command at cascade stage
+    profile_samples: int = 10000  # test rows used to benchmark inference of trained model
+    profile_single_rows: int = 200  # test rows predicted one by one to measure latency
+    split_random_state: int = 42
+    cpu_budget: int | None = None  # threads per worker host, cpu count by default
+    cpu_threads_per_task: int | None = None  # whole free budget by default
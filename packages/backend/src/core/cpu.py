@@ -0,0 +1,94 @@
+import os
+import time
+import uuid
+import socket
+import logging
+from typing import Iterator
+from contextlib import contextmanager
+
+from redis import Redis
+from sklearn.pipeline import Pipeline
+from threadpoolctl import threadpool_limits
+
+from . import TModel
+from .algorithm_params import AvailableAlgorithm
+
+logger = logging.getLogger(__name__)
+
+THREAD_PARAMETER_BY_ALGORITHM = {
+    AvailableAlgorithm.K_NEAREST_NEIGHBORS: "n_jobs",
+    AvailableAlgorithm.LOGISTIC_REGRESSION: "n_jobs",
+    AvailableAlgorithm.SGD_SUPPORT_VECTOR_MACHINES: "n_jobs",
+    AvailableAlgorithm.RANDOM_FOREST: "n_jobs",
+    AvailableAlgorithm.XGBOOST_CLASSIFIER: "n_jobs",
+    AvailableAlgorithm.LIGHTGBM_CLASSIFIER: "n_jobs",
+    AvailableAlgorithm.CATBOOST_CLASSIFIER: "thread_count"
+}
+
+# Leases are stored as "<threads>:<expiration timestamp>" in hash of worker host,
+# so threads of crashed tasks return to budget after lease expiration
+ACQUIRE_SCRIPT = """
+local used = 0
+local leases = redis.call('HGETALL', KEYS[1])
+for i = 1, #leases, 2 do
+    local threads, expires_at = string.match(leases[i + 1], '(%d+):(%d+)')
+    if tonumber(expires_at) < tonumber(ARGV[3]) then
+        redis.call('HDEL', KEYS[1], leases[i])
+    else
+        used = used + tonumber(threads)
+    end
+end
+local granted = math.max(1, math.min(tonumber(ARGV[2]), tonumber(ARGV[1]) - used))
+redis.call('HSET', KEYS[1], ARGV[4], granted .. ':' .. ARGV[5])
+return granted
+"""
+
+
+def get_cpu_budget(budget: int | None) -> int:
+    return budget or os.cpu_count() or 1
+
+
+@contextmanager
+def allocate_threads(
+        redis: Redis,
+        budget: int | None,
+        requested: int | None,
+        expiration: int
+) -> Iterator[int]:
+    """Lease threads from CPU budget of worker host and limit BLAS/OpenMP pools to them."""
+    budget = get_cpu_budget(budget)
+    key = f"cpu_budget:{socket.gethostname()}"
+    lease_id = uuid.uuid4().hex
+    now = int(time.time())
+    threads = int(redis.eval(
+        ACQUIRE_SCRIPT,
+        1,
+        key,
+        budget,
+        min(requested or budget, budget),
+        now,
+        lease_id,
+        now + expiration
+    ))
+    logger.info(f"Allocated {threads} of {budget} threads on {socket.gethostname()!r}")
+    try:
+        with threadpool_limits(limits=threads):
+            yield threads
+    finally:
+        redis.hdel(key, lease_id)
+
+
+def get_thread_params(algorithm_name: AvailableAlgorithm, threads: int | None) -> dict:
+    parameter = THREAD_PARAMETER_BY_ALGORITHM.get(algorithm_name)
+    if threads is None or parameter is None:
+        return {}
+    return {parameter: threads}
+
+
+def set_model_threads(model: TModel, algorithm_name: AvailableAlgorithm, threads: int) -> TModel:
+    thread_params = get_thread_params(algorithm_name=algorithm_name, threads=threads)
+    if thread_params:
+        # Accelerated models are pipelines with estimator of algorithm as the last step
+        estimator = model[-1] if isinstance(model, Pipeline) else model
+        estimator.set_params(**thread_params)
+    return model
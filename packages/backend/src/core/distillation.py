@@ -0,0 +1,34 @@
+import logging
+
+import numpy as np
+
+from . import TModel
+from .algorithm_params import AvailableAlgorithm
+
+logger = logging.getLogger(__name__)
+
+# Compact models which are cheap enough to screen all commands alone
+DISTILLATION_ALGORITHMS = (
+    AvailableAlgorithm.DECISION_TREE,
+    AvailableAlgorithm.RANDOM_FOREST,
+    AvailableAlgorithm.XGBOOST_CLASSIFIER,
+    AvailableAlgorithm.LIGHTGBM_CLASSIFIER,
+    AvailableAlgorithm.LOGISTIC_REGRESSION,
+    AvailableAlgorithm.LINEAR_SUPPORT_VECTOR_MACHINES,
+    AvailableAlgorithm.SGD_SUPPORT_VECTOR_MACHINES
+)
+
+
+def vote(predictions: list[np.ndarray]) -> np.ndarray:
+    """
+    Return majority vote of binary predictions of ensemble models.
+
+    Ties are resolved as obfuscated, the same as common classification does.
+    """
+    votes = np.column_stack([prediction.astype(np.int8) for prediction in predictions])
+    return (votes.mean(axis=1) >= 0.5).astype(np.int8)
+
+
+def calculate_agreement_rate(model: TModel, x: np.ndarray, votes: np.ndarray) -> float:
+    predictions = model.predict(x).astype(np.int8)
+    return float(np.round(np.mean(predictions == votes), 6))
@@ -0,0 +1,27 @@
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+# Training, cached and classified features share one dtype, so models see the same values.
+# Count and flag columns are not narrowed to integers: matrix holds them together with
+# ratio columns, and estimators upcast integer input to float64 on fit
+FEATURES_DTYPE = np.dtype(np.float32)
+
+
+def read_csv(
+        file_data: bytes,
+        non_feature_columns: list[str] | None = None,
+        last_column_is_target: bool = False
+) -> tuple[pd.DataFrame, list[str]]:
+    """Read CSV parsing feature columns directly as float32 instead of inferred float64."""
+    columns = [str(column) for column in pd.read_csv(BytesIO(file_data), nrows=0).columns]
+    excluded_columns = set(non_feature_columns or [])
+    if last_column_is_target:
+        excluded_columns.add(columns[-1])
+    feature_columns = [column for column in columns if column not in excluded_columns]
+    dataframe = pd.read_csv(
+        filepath_or_buffer=BytesIO(file_data),
+        dtype=dict.fromkeys(feature_columns, FEATURES_DTYPE)
+    )
+    return dataframe, feature_columns
@@ -4,3 +4,68 @@ from enum import Enum
 class Extension(str, Enum):
     PKL = "pkl"
     CSV = "csv"
+
+
+class DownloadMode(str, Enum):
+    STREAM = "stream"
+    REDIRECT = "redirect"
+    LINK = "link"
+
+
+class SearchStrategy(str, Enum):
+    GRID = "grid"
+    RANDOM = "random"
+    SUCCESSIVE_HALVING = "successive_halving"
+
+
+class JobStatus(str, Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class Metric(str, Enum):
+    ACCURACY = "accuracy"
+    PRECISION = "precision"
+    RECALL = "recall"
+
+
+class FeatureSelection(str, Enum):
+    VARIANCE = "variance"
+    ZERO_FRACTION = "zero_fraction"
+    IMPORTANCE = "importance"
+
+
+class Projection(str, Enum):
+    PCA = "pca"
+    RANDOM = "random"
+
+
+class ModelSortField(str, Enum):
+    CREATED_AT = "created_at"
+    TRAINING_TIME = "training_time"
+    PREDICTION_TIME = "prediction_time"
+    ACCURACY = "accuracy"
+    PRECISION = "precision"
+    RECALL = "recall"
+    LATENCY_P50 = "latency_p50"
+    LATENCY_P99 = "latency_p99"
+    THROUGHPUT = "throughput"
+    SERIALIZED_SIZE = "serialized_size"
+    DESERIALIZATION_TIME = "deserialization_time"
+    PEAK_MEMORY = "peak_memory"
+
+
+class TaskQueue(str, Enum):
+    INITIALIZATION = "initialization"
+    DATASETS = "datasets"
+    TRAINING = "training"
+    CLASSIFICATION = "classification"
+    MAINTENANCE = "maintenance"
+
+
+class WorkerProfile(str, Enum):
+    ALL = "all"
+    INTERACTIVE = "interactive"
+    TRAINING = "training"
@@ -1,2 +1,12 @@
 class LockException(Exception):
     pass
+
+
+class TrainingCancelledException(Exception):
+    pass
+
+
+class UnknownColumnsException(ValueError):
+    def __init__(self, columns: list[str]) -> None:
+        super().__init__(f"Unknown columns {columns}")
+        self.columns = columns
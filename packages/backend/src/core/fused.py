@@ -0,0 +1,101 @@
+import logging
+
+import numpy as np
+from sklearn.svm import LinearSVC
+from sklearn.linear_model import (
+    SGDClassifier,
+    LogisticRegression
+)
+from sklearn.naive_bayes import (
+    GaussianNB,
+    MultinomialNB
+)
+
+from . import TModel
+from .algorithm_params import AvailableAlgorithm
+
+logger = logging.getLogger(__name__)
+
+LINEAR_FAMILY_ALGORITHMS = (
+    AvailableAlgorithm.LOGISTIC_REGRESSION,
+    AvailableAlgorithm.LINEAR_SUPPORT_VECTOR_MACHINES,
+    AvailableAlgorithm.SGD_SUPPORT_VECTOR_MACHINES,
+    AvailableAlgorithm.MULTINOMIAL_NAIVE_BAYES,
+    AvailableAlgorithm.GAUSSIAN_NAIVE_BAYES
+)
+
+
+def get_decision_function(
+        model: TModel,
+        feature_mask: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray | None, float] | None:
+    """
+    Return linear weights, quadratic weights and intercept of binary decision score of model.
+
+    Second class is predicted for positive score, the same as ``predict`` of model does.
+    Gaussian naive Bayes log-likelihood ratio is quadratic in features, other models have
+    no quadratic weights. Weights are expanded to all dataset features by ``feature_mask``.
+    Returns None for models which can not be scored linearly.
+    """
+    if len(getattr(model, "classes_", ())) != 2:
+        return None
+    quadratic = None
+    if isinstance(model, (LogisticRegression, LinearSVC, SGDClassifier)):
+        linear = model.coef_[0].astype(np.float64)
+        intercept = float(model.intercept_[0])
+    elif isinstance(model, MultinomialNB):
+        linear = model.feature_log_prob_[1] - model.feature_log_prob_[0]
+        intercept = float(model.class_log_prior_[1] - model.class_log_prior_[0])
+    elif isinstance(model, GaussianNB):
+        theta, var = model.theta_, model.var_
+        log_prior = np.log(model.class_prior_)
+        linear = theta[1] / var[1] - theta[0] / var[0]
+        quadratic = 0.5 / var[0] - 0.5 / var[1]
+        intercept = float(
+            log_prior[1] - log_prior[0]
+            - 0.5 * np.sum(np.log(var[1] / var[0]))
+            - 0.5 * np.sum(np.square(theta[1]) / var[1] - np.square(theta[0]) / var[0])
+        )
+    else:
+        return None
+    if feature_mask is not None:
+        linear = _expand(weights=linear, feature_mask=feature_mask)
+        if quadratic is not None:
+            quadratic = _expand(weights=quadratic, feature_mask=feature_mask)
+    return linear, quadratic, intercept
+
+
+def score_models(
+        x: np.ndarray,
+        decision_functions: list[tuple[np.ndarray, np.ndarray | None, float]]
+) -> np.ndarray:
+    """Score feature matrix against all decision functions with one stacked matrix multiply."""
+    x = x.astype(np.float64)
+    linear = np.column_stack([linear for linear, _, _ in decision_functions])
+    intercepts = np.array([intercept for _, _, intercept in decision_functions])
+    scores = x @ linear + intercepts
+    if any(quadratic is not None for _, quadratic, _ in decision_functions):
+        quadratic = np.column_stack([
+            np.zeros(x.shape[1]) if quadratic is None else quadratic
+            for _, quadratic, _ in decision_functions
+        ])
+        scores += np.square(x) @ quadratic
+    return scores
+
+
+def predict_models(
+        models: list[TModel],
+        x: np.ndarray,
+        decision_functions: list[tuple[np.ndarray, np.ndarray | None, float]]
+) -> list[np.ndarray]:
+    scores = score_models(x=x, decision_functions=decision_functions)
+    return [
+        model.classes_[(scores[:, i] > 0).astype(np.intp)]
+        for i, model in enumerate(models)
+    ]
+
+
+def _expand(weights: np.ndarray, feature_mask: np.ndarray) -> np.ndarray:
+    expanded = np.zeros(len(feature_mask), dtype=np.float64)
+    expanded[feature_mask] = weights
+    return expanded
@@ -0,0 +1,68 @@
+import logging
+
+import numpy as np
+from sklearn.base import clone
+from xgboost import XGBClassifier
+from catboost import CatBoostClassifier
+from lightgbm.sklearn import LGBMClassifier
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
+from sklearn.naive_bayes import (
+    GaussianNB,
+    MultinomialNB
+)
+
+from . import TModel
+from .algorithm_params import AvailableAlgorithm
+
+logger = logging.getLogger(__name__)
+
+INCREMENTAL_ALGORITHMS = (
+    AvailableAlgorithm.GAUSSIAN_NAIVE_BAYES,
+    AvailableAlgorithm.MULTINOMIAL_NAIVE_BAYES,
+    AvailableAlgorithm.SGD_SUPPORT_VECTOR_MACHINES,
+    AvailableAlgorithm.RANDOM_FOREST,
+    AvailableAlgorithm.XGBOOST_CLASSIFIER,
+    AvailableAlgorithm.LIGHTGBM_CLASSIFIER,
+    AvailableAlgorithm.CATBOOST_CLASSIFIER
+)
+
+
+def update_model(
+        model: TModel,
+        x: np.ndarray,
+        y: np.ndarray,
+        additional_estimators: int
+) -> TModel:
+    """
+    Continue training of fitted model on new data only.
+
+    Naive Bayes and SGD models update their state with ``partial_fit``, random forest
+    grows ``additional_estimators`` trees with ``warm_start`` and boosted models add
+    ``additional_estimators`` rounds to the existing booster.
+    """
+    n_features = getattr(model, "n_features_in_", None)
+    if n_features is not None and n_features != x.shape[1]:
+        raise ValueError(f"Model expects {n_features} features, but new data has {x.shape[1]}")
+
+    if isinstance(model, (GaussianNB, MultinomialNB, SGDClassifier)):
+        model.partial_fit(x, y)
+        return model
+    if isinstance(model, RandomForestClassifier):
+        model.set_params(warm_start=True, n_estimators=model.n_estimators + additional_estimators)
+        model.fit(x, y)
+        model.set_params(warm_start=False)
+        return model
+    if isinstance(model, XGBClassifier):
+        updated_model = clone(model).set_params(n_estimators=additional_estimators)
+        updated_model.fit(x, y, xgb_model=model.get_booster(), verbose=False)
+        return updated_model
+    if isinstance(model, LGBMClassifier):
+        updated_model = clone(model).set_params(n_estimators=additional_estimators)
+        updated_model.fit(x, y, init_model=model.booster_)
+        return updated_model
+    if isinstance(model, CatBoostClassifier):
+        updated_model = clone(model).set_params(iterations=additional_estimators)
+        updated_model.fit(x, y, init_model=model, verbose=False)
+        return updated_model
+    raise ValueError(f"Incremental training is not supported for model {type(model).__name__}")
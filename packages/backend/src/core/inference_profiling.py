@@ -0,0 +1,76 @@
+import time
+import pickle
+import logging
+import pathlib
+
+import numpy as np
+
+from .models import InferenceProfile
+
+logger = logging.getLogger(__name__)
+
+PROC_STATUS_PATH = pathlib.Path("/proc/self/status")
+PROC_CLEAR_REFS_PATH = pathlib.Path("/proc/self/clear_refs")
+
+
+def profile_inference(
+        serialized_model: bytes,
+        x: np.ndarray,
+        single_rows: int
+) -> InferenceProfile:
+    """
+    Measure serving cost of serialized model on feature matrix.
+
+    Model is deserialized from bytes, so loading time and memory are measured the same way
+    as classification task pays them. Single command latency is measured on the first
+    ``single_rows`` rows, throughput on the whole matrix.
+    """
+    rss_before = _reset_peak_rss()
+    start_time = time.perf_counter()
+    model = pickle.loads(serialized_model)
+    deserialization_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    model.predict(x)
+    batch_time = time.perf_counter() - start_time
+    peak_rss = _read_status_bytes("VmHWM")
+
+    latencies = []
+    for i in range(min(single_rows, len(x))):
+        start_time = time.perf_counter()
+        model.predict(x[i:i + 1])
+        latencies.append(time.perf_counter() - start_time)
+    latencies = np.array(latencies or [0.0])
+
+    return InferenceProfile(
+        latency_p50=np.round(np.percentile(latencies, 50), 6),
+        latency_p99=np.round(np.percentile(latencies, 99), 6),
+        throughput=np.round(len(x) / batch_time, 2) if batch_time else 0.0,
+        serialized_size=len(serialized_model),
+        deserialization_time=np.round(deserialization_time, 6),
+        peak_memory=(
+            max(0, peak_rss - rss_before)
+            if rss_before is not None and peak_rss is not None else None
+        )
+    )
+
+
+def _reset_peak_rss() -> int | None:
+    # Writing 5 to clear_refs resets peak resident memory of process to current one
+    try:
+        PROC_CLEAR_REFS_PATH.write_text("5")
+    except OSError:
+        logger.warning("Peak resident memory can not be reset, memory growth is not measured")
+        return None
+    return _read_status_bytes("VmRSS")
+
+
+def _read_status_bytes(name: str) -> int | None:
+    try:
+        lines = PROC_STATUS_PATH.read_text().splitlines()
+    except OSError:
+        return None
+    for line in lines:
+        if line.startswith(f"{name}:"):
+            return int(line.split()[1]) * 1024
+    return None
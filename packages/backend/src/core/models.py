@@ -3,6 +3,7 @@ from bson import ObjectId
 from typing import TypeVar
 from datetime import datetime
 
+import numpy as np
 from pydantic import (
     Field,
     BaseModel,
@@ -10,6 +11,13 @@ from pydantic import (
 )
 
 from .algorithm_params import AvailableAlgorithm
+from .enums import (
+    Metric,
+    JobStatus,
+    SearchStrategy
+)
+
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 
 class FileContent(BaseModel):
@@ -20,6 +28,29 @@ class FileContent(BaseModel):
         arbitrary_types_allowed = True
 
 
+class DatasetArrays(BaseModel):
+    x: np.ndarray
+    y: np.ndarray
+    columns: list[str]
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class DatasetSplit(BaseModel):
+    train_indices: np.ndarray
+    test_indices: np.ndarray
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class DownloadLink(BaseModel):
+    url: str = Field(description="Presigned url for downloading file directly from MinIO")
+    filename: str = Field(description="Name of downloaded file")
+    expires_in: int = Field(description="Url lifetime in seconds")
+
+
 class ObjectIdModel(BaseModel):
     id: str = Field(alias="_id")
 
@@ -38,7 +69,7 @@ class DatetimeModel(BaseModel):
     def validate_created_at(cls, value: datetime | str | None) -> str | None:
         if value is None or isinstance(value, str):
             return value
-        return value.strftime("%Y-%m-%d %H:%M:%S")
+        return value.strftime(DATETIME_FORMAT)
 
 
 class DatasetDocument(DatetimeModel, ObjectIdModel):
@@ -60,6 +91,45 @@ class Dataset(DatetimeModel):
     features: int = Field(description="Total features in dataset")
 
 
+class DatasetProfile(BaseModel):
+    """Model for adding documents to MongoDB collection."""
+    md5: str = Field(description="MD5 hash of profiled dataset file in MinIO")
+    samples: int = Field(description="Total samples in dataset")
+    columns: list[str] = Field(description="Names of feature columns in dataset order")
+    target_name: str = Field(description="Name of target column")
+    statistics: bytes = Field(
+        description="Per-feature statistics packed as little-endian float64 matrix"
+    )
+    constant_columns: bytes = Field(description="Bit-packed flags of constant feature columns")
+    class_balance: dict[str, int] = Field(description="Number of samples per target class")
+
+
+class DatasetProfileDocument(ObjectIdModel, DatasetProfile):
+    id: str = Field(description="Id of dataset profile", alias="_id")
+
+
+class CrossValidationMetrics(BaseModel):
+    folds: int = Field(description="Number of stratified folds")
+    accuracy_mean: float = Field(description="Mean accuracy metric on validation folds")
+    accuracy_std: float = Field(description="Standard deviation of accuracy on validation folds")
+    precision_mean: float = Field(description="Mean precision metric on validation folds")
+    precision_std: float = Field(description="Standard deviation of precision on validation folds")
+    recall_mean: float = Field(description="Mean recall metric on validation folds")
+    recall_std: float = Field(description="Standard deviation of recall on validation folds")
+
+
+class InferenceProfile(BaseModel):
+    latency_p50: float = Field(description="Median prediction latency of single command in seconds")
+    latency_p99: float = Field(description="99th percentile of single command latency in seconds")
+    throughput: float = Field(description="Batch prediction throughput in rows per second")
+    serialized_size: int = Field(description="Size of serialized model in bytes")
+    deserialization_time: float = Field(description="Deserialization time of model in seconds")
+    peak_memory: int | None = Field(
+        default=None,
+        description="Peak resident memory growth in bytes while loading model and predicting batch"
+    )
+
+
 class ModelDocument(DatetimeModel, ObjectIdModel):
     id: str = Field(description="Id of trained model", alias="_id")
     dataset_id: str | None = Field(
@@ -68,17 +138,58 @@ class ModelDocument(DatetimeModel, ObjectIdModel):
     name: str = Field(description="Name of file with .pkl extension")
     md5: str = Field(description="MD5 hash of file in MinIO")
     algorithm: AvailableAlgorithm = Field(description="Algorithm name")
+    parent_id: str | None = Field(
+        default=None,
+        description="Id of model which was retrained into this model"
+    )
+    version: int = Field(default=1, description="Version of model, incremented on retraining")
+    teacher_ids: list[str] | None = Field(
+        default=None,
+        description="Ids of ensemble models whose votes were distilled into this model"
+    )
     created_at: str | None = Field(description="Datetime of starting training")
     training_time: float | None = Field(description="Training time in seconds")
+    prediction_time: float | None = Field(
+        default=None,
+        description="Prediction time on test data in seconds"
+    )
+    best_iteration: int | None = Field(
+        default=None,
+        description="Best boosting round on validation data if early stopping was used"
+    )
     training_data_proportion: float = Field(
         gt=0.0,
         lt=1.0,
         description="Proportion of training data"
     )
     parameters: dict = Field(description="Training parameters")
+    features: int | None = Field(
+        default=None,
+        description="Number of features used by model, all dataset features if not set"
+    )
+    feature_mask: bytes | None = Field(
+        default=None,
+        description="Bit-packed mask of dataset feature columns used by model"
+    )
     accuracy: float = Field(ge=0.0, le=1.0, description="Accuracy metric on test data")
     precision: float = Field(ge=0.0, le=1.0, description="Precision metric on test data")
     recall: float = Field(ge=0.0, le=1.0, description="Recall metric on test data")
+    neighbors_recall: float | None = Field(
+        default=None,
+        description="Recall of projected KNN index against exact neighbors search on test data"
+    )
+    agreement_rate: float | None = Field(
+        default=None,
+        description="Share of test commands where distilled model agrees with ensemble vote"
+    )
+    cross_validation: CrossValidationMetrics | None = Field(
+        default=None,
+        description="Metrics of stratified k-fold cross-validation on training data"
+    )
+    inference_profile: InferenceProfile | None = Field(
+        default=None,
+        description="Serving cost of model measured on test data"
+    )
 
 
 class Model(DatetimeModel):
@@ -89,13 +200,54 @@ class Model(DatetimeModel):
     )
     md5: str = Field(description="MD5 hash of file in MinIO")
     algorithm: AvailableAlgorithm = Field(description="Algorithm name")
+    parent_id: str | None = Field(
+        default=None,
+        description="Id of model which was retrained into this model"
+    )
+    version: int = Field(default=1, description="Version of model, incremented on retraining")
+    teacher_ids: list[str] | None = Field(
+        default=None,
+        description="Ids of ensemble models whose votes were distilled into this model"
+    )
     created_at: str | None = Field(description="Datetime of starting training")
     training_time: float | None = Field(description="Training time in seconds")
+    prediction_time: float | None = Field(
+        default=None,
+        description="Prediction time on test data in seconds"
+    )
+    best_iteration: int | None = Field(
+        default=None,
+        description="Best boosting round on validation data if early stopping was used"
+    )
     training_data_proportion: float = Field(description="Proportion of training data")
     parameters: dict = Field(description="Training parameters")
+    features: int | None = Field(
+        default=None,
+        description="Number of features used by model, all dataset features if not set"
+    )
+    feature_mask: bytes | None = Field(
+        default=None,
+        description="Bit-packed mask of dataset feature columns used by model"
+    )
     accuracy: float = Field(description="Accuracy metric on test data")
     precision: float = Field(description="Precision metric on test data")
     recall: float = Field(description="Recall metric on test data")
+    neighbors_recall: float | None = Field(
+        default=None,
+        description="Recall of projected KNN index against exact neighbors search on test data"
+    )
+    agreement_rate: float | None = Field(
+        default=None,
+        description="Share of test commands where distilled model agrees with ensemble vote"
+    )
+    cross_validation: CrossValidationMetrics | None = Field(
+        default=None,
+        description="Metrics of stratified k-fold cross-validation on training data"
+    )
+    inference_profile: InferenceProfile | None = Field(
+        default=None,
+        description="Serving cost of model measured on test data"
+    )
 
 
 class ModelDTO(BaseModel):
@@ -107,13 +259,130 @@ class ModelDTO(BaseModel):
     )
     md5: str = Field(description="MD5 hash of file in MinIO")
     algorithm: AvailableAlgorithm = Field(description="Algorithm name")
+    parent_id: str | None = Field(
+        default=None,
+        description="Id of model which was retrained into this model"
+    )
+    version: int = Field(default=1, description="Version of model, incremented on retraining")
+    teacher_ids: list[str] | None = Field(
+        default=None,
+        description="Ids of ensemble models whose votes were distilled into this model"
+    )
     created_at: str | None = Field(description="Datetime of starting training")
     training_time: float | None = Field(description="Training time in seconds")
+    prediction_time: float | None = Field(
+        default=None,
+        description="Prediction time on test data in seconds"
+    )
+    best_iteration: int | None = Field(
+        default=None,
+        description="Best boosting round on validation data if early stopping was used"
+    )
     training_data_proportion: float = Field(description="Proportion of training data")
     parameters: dict = Field(description="Training parameters")
+    features: int | None = Field(
+        default=None,
+        description="Number of features used by model, all dataset features if not set"
+    )
     accuracy: float = Field(description="Accuracy metric on test data")
     precision: float = Field(description="Precision metric on test data")
     recall: float = Field(description="Recall metric on test data")
+    neighbors_recall: float | None = Field(
+        default=None,
+        description="Recall of projected KNN index against exact neighbors search on test data"
+    )
+    agreement_rate: float | None = Field(
+        default=None,
+        description="Share of test commands where distilled model agrees with ensemble vote"
+    )
+    cross_validation: CrossValidationMetrics | None = Field(
+        default=None,
+        description="Metrics of stratified k-fold cross-validation on training data"
+    )
+    inference_profile: InferenceProfile | None = Field(
+        default=None,
+        description="Serving cost of model measured on test data"
+    )
+
+
+class SearchTrial(BaseModel):
+    parameters: dict = Field(description="Training parameters of trial")
+    rung: int = Field(description="Successive halving rung, 0 for grid and random search")
+    training_samples: int = Field(description="Number of training samples used in trial")
+    training_time: float = Field(description="Training time in seconds")
+    prediction_time: float = Field(description="Prediction time on test data in seconds")
+    accuracy: float = Field(description="Accuracy metric on test data")
+    precision: float = Field(description="Precision metric on test data")
+    recall: float = Field(description="Recall metric on test data")
+
+
+class Search(DatetimeModel):
+    """Model for adding documents to MongoDB collection."""
+    dataset_id: str = Field(description="Id of preprocessed dataset used for search")
+    algorithm: AvailableAlgorithm = Field(description="Algorithm name")
+    strategy: SearchStrategy = Field(description="Search strategy")
+    parameter_space: dict[str, list] = Field(description="Candidate values of parameters")
+    scoring: Metric = Field(description="Metric used for ranking trials")
+    training_data_proportion: float = Field(description="Proportion of training data")
+    status: JobStatus = Field(description="Status of search job")
+    created_at: str | None = Field(description="Datetime of starting search")
+    search_time: float | None = Field(default=None, description="Search time in seconds")
+    trials: list[SearchTrial] = Field(default=[], description="Results of finished trials")
+    model_ids: list[str] = Field(default=[], description="Ids of registered top models")
+
+
+class SearchDocument(Search, ObjectIdModel):
+    id: str = Field(description="Id of search job", alias="_id")
+
+
+class BenchmarkResult(BaseModel):
+    model_id: str = Field(description="Id of evaluated trained model")
+    model_name: str = Field(description="Name of file of evaluated trained model")
+    algorithm: AvailableAlgorithm = Field(description="Algorithm name")
+    accuracy: float = Field(description="Accuracy metric on benchmark dataset")
+    precision: float = Field(description="Precision metric on benchmark dataset")
+    recall: float = Field(description="Recall metric on benchmark dataset")
+    prediction_time: float = Field(description="Prediction time on benchmark dataset in seconds")
+    throughput: float = Field(description="Prediction throughput in rows per second")
+
+
+class Benchmark(DatetimeModel):
+    """Model for adding documents to MongoDB collection."""
+    dataset_id: str = Field(description="Id of preprocessed dataset used for benchmark")
+    model_ids: list[str] = Field(description="Ids of benchmarked trained models")
+    status: JobStatus = Field(description="Status of benchmark job")
+    created_at: str | None = Field(description="Datetime of starting benchmark")
+    benchmark_time: float | None = Field(default=None, description="Benchmark time in seconds")
+    results: list[BenchmarkResult] = Field(
+        default=[],
+        description="Results of evaluated models sorted by accuracy"
+    )
+    failed_model_ids: list[str] = Field(default=[], description="Ids of models failed to evaluate")
+
+
+class BenchmarkDocument(Benchmark, ObjectIdModel):
+    id: str = Field(description="Id of benchmark job", alias="_id")
+
+
+class TrainingProgress(BaseModel):
+    """Model for transfer data between server and client."""
+    filename: str = Field(description="Name of file of model being trained")
+    task_id: str | None = Field(default=None, description="Id of Celery training task")
+    status: JobStatus = Field(description="Status of training task")
+    stage: str | None = Field(default=None, description="Current stage of training")
+    iteration: int | None = Field(default=None, description="Finished iterations of fit stage")
+    total_iterations: int | None = Field(default=None, description="Total iterations of fit")
+    interruptible: bool = Field(
+        default=False,
+        description="Whether current stage checks for cancellation by itself"
+    )
+    cancel_requested: bool = Field(default=False, description="Whether cancel was requested")
+    stage_times: dict[str, float] = Field(
+        default={},
+        description="Time spent in each finished stage in seconds"
+    )
+    started_at: float | None = Field(default=None, description="Unix time of starting training")
+    updated_at: float | None = Field(default=None, description="Unix time of last update")
 
 
 class ClassificationDocument(ObjectIdModel):
@@ -138,6 +407,36 @@ class ClassificationDTO(BaseModel):
     is_obfuscated: bool = Field(description="Binary classification status")
 
 
+class CascadeStage(BaseModel):
+    model_id: str = Field(description="Id of trained model used at stage")
+    threshold: float | None = Field(
+        description="Probability needed to decide command at stage, none for the last stage"
+    )
+    received: int = Field(description="Number of commands which reached stage")
+    decided: int = Field(description="Number of commands decided at stage")
+    escalation_rate: float = Field(description="Share of received commands passed to next stage")
+    prediction_time: float = Field(description="Prediction time of stage in seconds")
+
+
+class CascadeReport(DatetimeModel):
+    """
+    Model for adding documents to MongoDB collection and transfer data between server and client.
+    """
+    created_at: str | None = Field(description="Datetime of starting cascade classification")
+    commands: int = Field(description="Total number of classified commands")
+    stages: list[CascadeStage] = Field(description="Statistics of cascade stages in order")
+    classification_time: float = Field(description="Total classification time in seconds")
+
+
+class AffinityWorker(BaseModel):
+    """Model for transfer data between server and client."""
+    node: str = Field(description="Celery node name of worker")
+    queue: str = Field(description="Worker-specific queue of classification sub-tasks")
+    hits: int = Field(description="Models found in worker cache")
+    misses: int = Field(description="Models downloaded from storage by worker")
+    hit_rate: float | None = Field(description="Share of models found in worker cache")
+
+
 class CommonClassificationDocument(ObjectIdModel):
     id: str = Field(description="Id of classification", alias="_id")
     command: str = Field(description="PowerShell command to be classified")
@@ -155,7 +454,10 @@ class CommonClassification(BaseModel):
 TDocument = TypeVar(
     "TDocument",
     DatasetDocument,
+    DatasetProfileDocument,
     ModelDocument,
+    SearchDocument,
+    BenchmarkDocument,
     ClassificationDocument,
     CommonClassificationDocument
 )
@@ -0,0 +1,79 @@
+import logging
+
+import numpy as np
+from sklearn.pipeline import Pipeline
+from sklearn.decomposition import PCA
+from sklearn.random_projection import GaussianRandomProjection
+from sklearn.neighbors import (
+    KDTree,
+    BallTree,
+    NearestNeighbors,
+    KNeighborsClassifier
+)
+
+from . import TModel
+from .enums import Projection
+
+logger = logging.getLogger(__name__)
+
+PROJECTION_STEP = "projection"
+NEIGHBORS_STEP = "neighbors"
+RECALL_MAX_SAMPLES = 1000
+
+
+def build_projected_knn(
+        model: KNeighborsClassifier,
+        projection: Projection,
+        components: int,
+        random_state: int | None = None
+) -> Pipeline:
+    """
+    Wrap KNN into pipeline searching neighbors in reduced space with a tree index.
+
+    Fitted pipeline keeps only projected training matrix and tree built over it,
+    both are pickled with the model.
+    """
+    if projection == Projection.PCA:
+        projector = PCA(n_components=components, random_state=random_state)
+    else:
+        projector = GaussianRandomProjection(n_components=components, random_state=random_state)
+    metric = model.get_params()["metric"]
+    if model.algorithm in ("auto", "brute"):
+        if metric in KDTree.valid_metrics:
+            model.set_params(algorithm="kd_tree")
+        elif metric in BallTree.valid_metrics:
+            model.set_params(algorithm="ball_tree")
+    return Pipeline([(PROJECTION_STEP, projector), (NEIGHBORS_STEP, model)])
+
+
+def is_projected_knn(model: TModel) -> bool:
+    return isinstance(model, Pipeline) and NEIGHBORS_STEP in model.named_steps
+
+
+def calculate_neighbors_recall(
+        model: Pipeline,
+        x_train: np.ndarray,
+        x_test: np.ndarray,
+        max_samples: int = RECALL_MAX_SAMPLES
+) -> float:
+    """Share of exact nearest neighbors in original space found by projected index."""
+    knn: KNeighborsClassifier = model.named_steps[NEIGHBORS_STEP]
+    x_sample = x_test[:max_samples]
+    exact_neighbors = NearestNeighbors(
+        n_neighbors=knn.n_neighbors,
+        algorithm="brute",
+        metric=knn.metric,
+        p=knn.p,
+        n_jobs=knn.n_jobs
+    ).fit(x_train).kneighbors(x_sample, return_distance=False)
+    approximate_neighbors = knn.kneighbors(
+        model.named_steps[PROJECTION_STEP].transform(x_sample),
+        return_distance=False
+    )
+    found = sum(
+        len(np.intersect1d(exact, approximate, assume_unique=True))
+        for exact, approximate in zip(exact_neighbors, approximate_neighbors, strict=True)
+    )
+    recall = found / exact_neighbors.size
+    logger.info(f"Recall of projected KNN index against exact search is {recall:.4f}")
+    return float(np.round(recall, 6))
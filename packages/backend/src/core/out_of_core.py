@@ -0,0 +1,164 @@
+import glob
+import math
+import uuid
+import logging
+import pathlib
+from typing import (
+    Callable,
+    Iterator
+)
+
+import numpy as np
+import xgboost
+import lightgbm
+from xgboost import XGBClassifier
+from lightgbm.sklearn import LGBMClassifier
+from sklearn.linear_model import SGDClassifier
+from sklearn.naive_bayes import (
+    GaussianNB,
+    MultinomialNB
+)
+from sklearn.preprocessing import LabelEncoder
+
+from . import (
+    TModel,
+    binning
+)
+from .progress import ProgressReporter
+from .algorithm_params import AvailableAlgorithm
+
+logger = logging.getLogger(__name__)
+
+OUT_OF_CORE_ALGORITHMS = (
+    AvailableAlgorithm.GAUSSIAN_NAIVE_BAYES,
+    AvailableAlgorithm.MULTINOMIAL_NAIVE_BAYES,
+    AvailableAlgorithm.SGD_SUPPORT_VECTOR_MACHINES,
+    AvailableAlgorithm.XGBOOST_CLASSIFIER,
+    AvailableAlgorithm.LIGHTGBM_CLASSIFIER
+)
+
+
+def iter_chunks(
+        x: np.ndarray,
+        y: np.ndarray,
+        indices: np.ndarray,
+        chunk_size: int
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Yield rows of memory-mapped arrays by sorted indices, one chunk in memory at a time."""
+    indices = np.sort(indices)
+    for i in range(0, len(indices), chunk_size):
+        chunk_indices = indices[i:i + chunk_size]
+        yield x[chunk_indices], y[chunk_indices]
+
+
+def sample_test_indices(
+        test_indices: np.ndarray,
+        max_samples: int,
+        random_state: int
+) -> np.ndarray:
+    """Sample at most ``max_samples`` test rows uniformly, so test data fits into memory."""
+    if len(test_indices) <= max_samples:
+        return np.sort(test_indices)
+    generator = np.random.default_rng(random_state)
+    return np.sort(generator.choice(test_indices, size=max_samples, replace=False))
+
+
+def fit_out_of_core(
+        model: TModel,
+        x: np.ndarray,
+        y: np.ndarray,
+        train_indices: np.ndarray,
+        chunk_size: int,
+        cache_dir_path: str,
+        reporter: ProgressReporter | None = None
+) -> TModel:
+    """Fit model on memory-mapped dataset, reading training rows chunk by chunk."""
+    if isinstance(model, (GaussianNB, MultinomialNB, SGDClassifier)):
+        classes = np.unique(y)
+        chunks = math.ceil(len(train_indices) / chunk_size)
+        for i, (x_chunk, y_chunk) in enumerate(
+            iter_chunks(x=x, y=y, indices=train_indices, chunk_size=chunk_size),
+            start=1
+        ):
+            model.partial_fit(x_chunk, y_chunk, classes=classes)
+            if reporter and reporter.report_iteration(iteration=i, total=chunks):
+                break
+        return model
+    if isinstance(model, XGBClassifier):
+        cache_prefix = str(pathlib.Path(cache_dir_path) / f".xgboost.{uuid.uuid4().hex}")
+        iterator = _ChunkIterator(
+            chunks=lambda: iter_chunks(x=x, y=y, indices=train_indices, chunk_size=chunk_size),
+            cache_prefix=cache_prefix
+        )
+        try:
+            # DMatrix built from iterator keeps its pages in external memory on worker disk
+            booster = xgboost.train(
+                params=model.get_xgb_params(),
+                dtrain=xgboost.DMatrix(iterator),
+                num_boost_round=model.n_estimators,
+                callbacks=reporter.get_callbacks(model) if reporter else None
+            )
+        finally:
+            for path in glob.glob(f"{cache_prefix}*"):
+                pathlib.Path(path).unlink(missing_ok=True)
+        model.load_model(bytearray(booster.save_raw()))
+        return model
+    if isinstance(model, LGBMClassifier):
+        indices = np.sort(train_indices)
+        y_train = y[indices]
+        label_encoder = LabelEncoder().fit(y_train)
+        if len(label_encoder.classes_) != 2:
+            raise ValueError("Out-of-core LightGBM training supports only binary target")
+        dataset_params = binning.get_lightgbm_dataset_params(model)
+        # Bins are constructed from sampled rows and the dataset is filled batch by batch,
+        # so only one chunk of features is read from memory-mapped matrix at a time
+        train_set = lightgbm.Dataset(
+            _ChunkSequence(x=x, indices=indices, batch_size=chunk_size),
+            label=label_encoder.transform(y_train),
+            params=dataset_params
+        )
+        sample_indices = indices[binning.get_class_sample_indices(y_train)]
+        return binning.train_lightgbm(
+            model=model,
+            train_set=train_set,
+            x_sample=x[sample_indices],
+            y_sample=y[sample_indices],
+            callbacks=reporter.get_callbacks(model) if reporter else None
+        )
+    raise ValueError(f"Out-of-core training is not supported for model {type(model).__name__}")
+
+
+class _ChunkIterator(xgboost.DataIter):
+    def __init__(
+            self,
+            chunks: Callable[[], Iterator[tuple[np.ndarray, np.ndarray]]],
+            cache_prefix: str
+    ) -> None:
+        self._chunks = chunks
+        self._iterator = chunks()
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data: Callable) -> int:
+        chunk = next(self._iterator, None)
+        if chunk is None:
+            return 0
+        x_chunk, y_chunk = chunk
+        input_data(data=x_chunk, label=y_chunk)
+        return 1
+
+    def reset(self) -> None:
+        self._iterator = self._chunks()
+
+
+class _ChunkSequence(lightgbm.Sequence):
+    def __init__(self, x: np.ndarray, indices: np.ndarray, batch_size: int) -> None:
+        self._x = x
+        self._indices = indices
+        self.batch_size = batch_size
+
+    def __getitem__(self, index: int | slice | list[int]) -> np.ndarray:
+        # LightGBM samples rows for bin construction only from float64 arrays
+        return self._x[self._indices[index]].astype(np.float64)
+
+    def __len__(self) -> int:
+        return len(self._indices)
@@ -0,0 +1,54 @@
+from typing import (
+    Any,
+    Callable
+)
+from concurrent.futures import (
+    Future,
+    Executor
+)
+
+import billiard
+from billiard.einfo import ExceptionInfo
+
+
+def get_process_pool(max_workers: int) -> Executor:
+    """
+    Return executor over forked billiard pool.
+
+    Celery prefork workers run tasks in daemonic processes, which are not allowed to start
+    children of ``multiprocessing``, while billiard lifts this restriction. Forked children
+    inherit loaded modules and open memory-mapped cache files of worker.
+    """
+    return _PoolExecutor(max_workers=max_workers)
+
+
+class _PoolExecutor(Executor):
+    def __init__(self, max_workers: int) -> None:
+        self._pool = billiard.get_context("fork").Pool(processes=max_workers)
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future[Any]:
+        future: Future[Any] = Future()
+        future.set_running_or_notify_cancel()
+        self._pool.apply_async(
+            fn,
+            args=args,
+            kwds=kwargs,
+            callback=future.set_result,
+            error_callback=lambda error: future.set_exception(_unwrap_error(error))
+        )
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        if wait and not cancel_futures:
+            self._pool.close()
+        else:
+            self._pool.terminate()
+        self._pool.join()
+
+
+def _unwrap_error(error: BaseException | ExceptionInfo) -> BaseException:
+    # Pool reports exceptions of children wrapped into exception info with traceback
+    if isinstance(error, ExceptionInfo):
+        exception: BaseException = error.exception
+        return exception
+    return error
@@ -0,0 +1,80 @@
+import logging
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from .models import DatasetProfile
+
+logger = logging.getLogger(__name__)
+
+PROFILE_STATISTICS = ("min", "max", "mean", "variance", "non_zero_count")
+STATISTICS_DTYPE = np.dtype("<f8")
+
+
+def calculate_dataset_profile(md5: str, file_data: bytes, chunk_size: int) -> DatasetProfile:
+    """Calculate per-feature statistics of dataset in one streaming pass over its chunks."""
+    samples = 0
+    columns: list[str] = []
+    target_name = ""
+    class_balance: dict[str, int] = {}
+    minimum = maximum = mean = m2 = non_zero = np.empty(0)
+
+    for chunk in pd.read_csv(filepath_or_buffer=BytesIO(file_data), chunksize=chunk_size):
+        features = chunk.iloc[:, :-1].to_numpy(dtype=np.float64)
+        target = chunk.iloc[:, -1]
+        chunk_samples = len(features)
+        chunk_mean = features.mean(axis=0)
+        chunk_m2 = np.square(features - chunk_mean).sum(axis=0)
+
+        if not samples:
+            columns = [str(column) for column in chunk.columns[:-1]]
+            target_name = str(chunk.columns[-1])
+            minimum = features.min(axis=0)
+            maximum = features.max(axis=0)
+            mean = chunk_mean
+            m2 = chunk_m2
+            non_zero = np.count_nonzero(features, axis=0).astype(np.float64)
+        else:
+            # Chan et al. pairwise update keeps variance stable across chunks
+            total = samples + chunk_samples
+            delta = chunk_mean - mean
+            mean = mean + delta * chunk_samples / total
+            m2 = m2 + chunk_m2 + np.square(delta) * samples * chunk_samples / total
+            minimum = np.minimum(minimum, features.min(axis=0))
+            maximum = np.maximum(maximum, features.max(axis=0))
+            non_zero += np.count_nonzero(features, axis=0)
+        samples += chunk_samples
+
+        for label, count in target.value_counts().items():
+            class_balance[str(label)] = class_balance.get(str(label), 0) + int(count)
+
+    if not samples:
+        raise ValueError(f"Dataset with md5 {md5!r} does not contain any samples")
+    logger.info(f"Profiled dataset with md5 {md5!r}: {samples} samples, {len(columns)} features")
+
+    statistics = np.vstack([minimum, maximum, mean, m2 / samples, non_zero])
+    return DatasetProfile(
+        md5=md5,
+        samples=samples,
+        columns=columns,
+        target_name=target_name,
+        statistics=np.ascontiguousarray(statistics, dtype=STATISTICS_DTYPE).tobytes(),
+        constant_columns=np.packbits(minimum == maximum).tobytes(),
+        class_balance=class_balance
+    )
+
+
+def decode_statistics(profile: DatasetProfile) -> dict[str, np.ndarray]:
+    statistics = np.frombuffer(profile.statistics, dtype=STATISTICS_DTYPE).reshape(
+        len(PROFILE_STATISTICS),
+        len(profile.columns)
+    )
+    return dict(zip(PROFILE_STATISTICS, statistics, strict=True))
+
+
+def decode_constant_columns(profile: DatasetProfile) -> np.ndarray:
+    return np.unpackbits(
+        np.frombuffer(profile.constant_columns, dtype=np.uint8),
+        count=len(profile.columns)
+    ).astype(bool)
@@ -0,0 +1,181 @@
+import time
+import logging
+from typing import (
+    Any,
+    Iterator
+)
+from contextlib import contextmanager
+
+import lightgbm
+from redis import Redis
+from xgboost import (
+    Booster,
+    XGBClassifier
+)
+from xgboost.callback import TrainingCallback
+from catboost import CatBoostClassifier
+from lightgbm.sklearn import LGBMClassifier
+
+from . import TModel
+from .enums import JobStatus
+from .models import TrainingProgress
+from .exceptions import TrainingCancelledException
+
+logger = logging.getLogger(__name__)
+
+# Iteration progress is published and cancel flag is read not more often than this
+PUBLISH_INTERVAL = 0.5
+STAGE_TIME_PREFIX = "stage_time:"
+
+
+class ProgressReporter:
+    """
+    Publish progress of training task into Redis hash and watch its cancel flag.
+
+    Cancellation is checked on entering each stage and on reported iterations of fit.
+    Time of nested stage is excluded from outer stage, so e.g. download inside dataset
+    loading is not counted as parsing.
+    """
+
+    def __init__(self, redis: Redis, name: str, expiration: int) -> None:
+        self.redis = redis
+        self.key = get_progress_key(name)
+        self.cancel_key = get_cancel_key(name)
+        self.expiration = expiration
+        self._stages: list[list] = []
+        self._published_at = 0.0
+        self._cancelled = False
+
+    def start(self, task_id: str) -> None:
+        self.redis.delete(self.key, self.cancel_key)
+        self._publish({
+            "task_id": task_id,
+            "status": JobStatus.RUNNING.value,
+            "started_at": time.time()
+        })
+
+    def finish(self, task_id: str, status: JobStatus) -> None:
+        # Progress may already belong to another task with the same filename
+        if self.redis.hget(self.key, "task_id") != task_id.encode():
+            return
+        self._publish({"status": status.value, "interruptible": 0})
+        self.redis.hdel(self.key, "stage")
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        self.raise_if_cancelled()
+        self._stages.append([name, time.time(), 0.0])
+        self._publish({"stage": name, "interruptible": 0})
+        try:
+            yield
+        finally:
+            _, started_at, nested_time = self._stages.pop()
+            elapsed = time.time() - started_at
+            if self._stages:
+                self._stages[-1][2] += elapsed
+                self._publish({"stage": self._stages[-1][0]})
+            self.redis.hincrbyfloat(self.key, f"{STAGE_TIME_PREFIX}{name}", elapsed - nested_time)
+
+    def report_iteration(self, iteration: int, total: int | None) -> bool:
+        """Publish finished iteration of fit stage and return whether training is cancelled."""
+        now = time.time()
+        if now - self._published_at >= PUBLISH_INTERVAL or iteration == total:
+            self._publish({
+                "iteration": iteration,
+                "total_iterations": total if total is not None else "",
+                "interruptible": 1
+            })
+            self._cancelled = bool(self.redis.exists(self.cancel_key))
+        return self._cancelled
+
+    def raise_if_cancelled(self) -> None:
+        if self._cancelled or self.redis.exists(self.cancel_key):
+            logger.info(f"Training with progress key {self.key!r} was cancelled")
+            raise TrainingCancelledException()
+
+    def get_callbacks(self, model: TModel) -> list:
+        """Return native per-iteration callbacks of boosting library of model."""
+        if isinstance(model, XGBClassifier):
+            return [_XGBoostCallback(reporter=self, total=model.n_estimators)]
+        if isinstance(model, LGBMClassifier):
+            return [_LightGBMCallback(reporter=self)]
+        if isinstance(model, CatBoostClassifier):
+            return [_CatBoostCallback(reporter=self, total=model.get_params().get("iterations"))]
+        return []
+
+    def _publish(self, mapping: dict) -> None:
+        self._published_at = time.time()
+        self.redis.hset(self.key, mapping={**mapping, "updated_at": self._published_at})
+        self.redis.expire(self.key, self.expiration)
+
+
+def get_progress_key(name: str) -> str:
+    return f"training_progress:{name}"
+
+
+def get_cancel_key(name: str) -> str:
+    return f"training_cancel:{name}"
+
+
+def get_progress(redis: Redis, name: str) -> TrainingProgress | None:
+    fields = {
+        key.decode(): value.decode() for key, value in redis.hgetall(get_progress_key(name)).items()
+    }
+    if not fields:
+        return None
+    return TrainingProgress(
+        filename=name,
+        task_id=fields.get("task_id"),
+        status=fields["status"],
+        stage=fields.get("stage"),
+        iteration=fields.get("iteration") or None,
+        total_iterations=fields.get("total_iterations") or None,
+        interruptible=fields.get("interruptible") == "1",
+        cancel_requested=bool(redis.exists(get_cancel_key(name))),
+        stage_times={
+            key.removeprefix(STAGE_TIME_PREFIX): round(float(value), 6)
+            for key, value in fields.items() if key.startswith(STAGE_TIME_PREFIX)
+        },
+        started_at=fields.get("started_at"),
+        updated_at=fields.get("updated_at")
+    )
+
+
+def request_cancel(redis: Redis, name: str, expiration: int) -> None:
+    redis.set(get_cancel_key(name), "cancel", ex=expiration)
+
+
+class _XGBoostCallback(TrainingCallback):
+    def __init__(self, reporter: ProgressReporter, total: int) -> None:
+        super().__init__()
+        self.reporter = reporter
+        self.total = total
+
+    def after_iteration(
+            self,
+            model: Booster,
+            epoch: int,
+            evals_log: TrainingCallback.EvalsLog
+    ) -> bool:
+        return self.reporter.report_iteration(iteration=epoch + 1, total=self.total)
+
+
+class _LightGBMCallback:
+    order = 40
+
+    def __init__(self, reporter: ProgressReporter) -> None:
+        self.reporter = reporter
+
+    def __call__(self, env: lightgbm.callback.CallbackEnv) -> None:
+        if self.reporter.report_iteration(iteration=env.iteration + 1, total=env.end_iteration):
+            raise TrainingCancelledException()
+
+
+class _CatBoostCallback:
+    def __init__(self, reporter: ProgressReporter, total: int | None) -> None:
+        self.reporter = reporter
+        self.total = total
+
+    def after_iteration(self, info: Any) -> bool:
+        # CatBoost continues training while callback returns True
+        return not self.reporter.report_iteration(iteration=info.iteration, total=self.total)
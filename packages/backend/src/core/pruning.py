@@ -0,0 +1,95 @@
+import logging
+
+import numpy as np
+from sklearn.ensemble import ExtraTreesClassifier
+
+from .enums import FeatureSelection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD_BY_SELECTION = {
+    FeatureSelection.VARIANCE: 0.0,
+    FeatureSelection.ZERO_FRACTION: 0.99,
+    FeatureSelection.IMPORTANCE: 0.99
+}
+IMPORTANCE_ESTIMATORS = 100
+
+
+def select_features(
+        x: np.ndarray,
+        y: np.ndarray,
+        selection: FeatureSelection,
+        threshold: float | None,
+        chunk_size: int,
+        random_state: int,
+        threads: int = 1
+) -> np.ndarray:
+    """
+    Return boolean mask of feature columns kept for training.
+
+    Variance selection keeps features with variance above threshold, zero fraction
+    selection drops features which are zero in at least threshold fraction of samples
+    and importance selection keeps the most important features of extremely randomized
+    trees until their cumulative importance reaches threshold.
+    """
+    if threshold is None:
+        threshold = DEFAULT_THRESHOLD_BY_SELECTION[selection]
+    if selection == FeatureSelection.VARIANCE:
+        mask = _calculate_variance(x=x, chunk_size=chunk_size) > threshold
+    elif selection == FeatureSelection.ZERO_FRACTION:
+        non_zero = np.zeros(x.shape[1], dtype=np.int64)
+        for i in range(0, len(x), chunk_size):
+            non_zero += np.count_nonzero(x[i:i + chunk_size], axis=0)
+        mask = 1.0 - non_zero / len(x) < threshold
+    else:
+        importances = ExtraTreesClassifier(
+            n_estimators=IMPORTANCE_ESTIMATORS,
+            random_state=random_state,
+            n_jobs=threads
+        ).fit(x, y).feature_importances_
+        order = np.argsort(importances)[::-1]
+        kept = int(np.searchsorted(np.cumsum(importances[order]), threshold)) + 1
+        mask = np.zeros(x.shape[1], dtype=bool)
+        mask[order[:kept]] = True
+    if not mask.any():
+        raise ValueError(
+            f"Feature selection {selection.value} with threshold {threshold} removed all features"
+        )
+    logger.info(f"Feature selection {selection.value} kept {mask.sum()} of {len(mask)} features")
+    return mask
+
+
+def encode_mask(mask: np.ndarray) -> bytes:
+    return np.packbits(mask).tobytes()
+
+
+def decode_mask(feature_mask: bytes, features: int) -> np.ndarray:
+    return np.unpackbits(np.frombuffer(feature_mask, dtype=np.uint8), count=features).astype(bool)
+
+
+def count_features(feature_mask: bytes) -> int:
+    return int(np.unpackbits(np.frombuffer(feature_mask, dtype=np.uint8)).sum())
+
+
+def apply_mask(x: np.ndarray, feature_mask: bytes | None) -> np.ndarray:
+    """Select columns of model from full feature matrix, no-op for models without mask."""
+    if feature_mask is None:
+        return x
+    return x[:, decode_mask(feature_mask=feature_mask, features=x.shape[1])]
+
+
+def _calculate_variance(x: np.ndarray, chunk_size: int) -> np.ndarray:
+    samples = 0
+    mean = m2 = np.zeros(x.shape[1], dtype=np.float64)
+    for i in range(0, len(x), chunk_size):
+        chunk = x[i:i + chunk_size].astype(np.float64)
+        chunk_samples = len(chunk)
+        chunk_mean = chunk.mean(axis=0)
+        chunk_m2 = np.square(chunk - chunk_mean).sum(axis=0)
+        # Chan et al. pairwise update, the same as in dataset profiling
+        total = samples + chunk_samples
+        delta = chunk_mean - mean
+        mean = mean + delta * chunk_samples / total
+        m2 = m2 + chunk_m2 + np.square(delta) * samples * chunk_samples / total
+        samples = total
+    return m2 / max(samples, 1)
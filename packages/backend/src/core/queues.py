@@ -0,0 +1,104 @@
+import fnmatch
+import logging
+
+from celery import (
+    Task,
+    Celery
+)
+from kombu import Queue
+
+from .config import CeleryConfig
+from .enums import (
+    TaskQueue,
+    WorkerProfile
+)
+
+logger = logging.getLogger(__name__)
+
+# Patterns are matched in order, so deletes are routed before their modules
+QUEUE_BY_TASK_PATTERN = (
+    ("src.response.models.tasks.delete_model", TaskQueue.MAINTENANCE),
+    ("src.response.datasets.tasks.delete_dataset", TaskQueue.MAINTENANCE),
+    ("src.initializer.tasks.*", TaskQueue.INITIALIZATION),
+    ("src.response.datasets.tasks.*", TaskQueue.DATASETS),
+    ("src.response.classifications.tasks.*", TaskQueue.CLASSIFICATION),
+    ("src.response.models.tasks.*", TaskQueue.TRAINING),
+    ("src.response.searches.tasks.*", TaskQueue.TRAINING),
+    ("src.response.benchmarks.tasks.*", TaskQueue.TRAINING)
+)
+QUEUES_BY_PROFILE = {
+    WorkerProfile.ALL: tuple(TaskQueue),
+    WorkerProfile.INTERACTIVE: (
+        TaskQueue.CLASSIFICATION,
+        TaskQueue.MAINTENANCE,
+        TaskQueue.DATASETS,
+        TaskQueue.INITIALIZATION
+    ),
+    WorkerProfile.TRAINING: (TaskQueue.TRAINING,)
+}
+
+
+def get_task_queue(task_name: str) -> TaskQueue | None:
+    for pattern, queue in QUEUE_BY_TASK_PATTERN:
+        if fnmatch.fnmatchcase(task_name, pattern):
+            return queue
+    return None
+
+
+def configure(celery: Celery, config: CeleryConfig) -> None:
+    """
+    Route each task family to its own queue and set its priority and acknowledgement.
+
+    Worker consumes only queues of its profile, so long trainings on training workers
+    never delay classifications and deletes on interactive ones.
+    """
+    queues = QUEUES_BY_PROFILE[config.worker_profile]
+    celery.conf.update(
+        task_queues=[Queue(queue.value, routing_key=queue.value) for queue in queues],
+        task_default_queue=TaskQueue.MAINTENANCE.value,
+        task_routes=(_route_task,),
+        task_annotations=(_QueueAnnotations(config),),
+        worker_prefetch_multiplier=(
+            config.interactive_prefetch_multiplier
+            if config.worker_profile == WorkerProfile.INTERACTIVE
+            else config.training_prefetch_multiplier
+        ),
+        broker_transport_options={
+            "visibility_timeout": config.visibility_timeout,
+            "priority_steps": list(range(10)),
+            "queue_order_strategy": "priority",
+            "sep": ":"
+        }
+    )
+    logger.info(f"Worker profile {config.worker_profile.value!r} consumes queues {queues}")
+
+
+def _route_task(
+        name: str,
+        args: tuple,
+        kwargs: dict,
+        options: dict,
+        task: Task | None = None,
+        **kw: object
+) -> dict | None:
+    # Explicit queue is kept, e.g. worker-specific queue of classification sub-task
+    if options.get("queue"):
+        return None
+    queue = get_task_queue(name)
+    if queue is None:
+        return None
+    return {"queue": queue.value, "routing_key": queue.value}
+
+
+class _QueueAnnotations:
+    def __init__(self, config: CeleryConfig) -> None:
+        self.config = config
+
+    def annotate(self, task: Task) -> dict | None:
+        queue = get_task_queue(task.name)
+        if queue is None:
+            return None
+        return {
+            "priority": getattr(self.config, f"{queue.value}_priority"),
+            "acks_late": getattr(self.config, f"{queue.value}_acks_late")
+        }
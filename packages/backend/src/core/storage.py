@@ -1,10 +1,23 @@
 import logging
 from io import BytesIO
+from typing import Iterator
+from datetime import timedelta
+from urllib.parse import quote
+from contextlib import contextmanager
 
 from minio import Minio
+from urllib3.response import HTTPResponse
+from minio.datatypes import Object
+from minio.commonconfig import (
+    CopySource,
+    ComposeSource
+)
 
 logger = logging.getLogger(__name__)
 
+# S3 limit on size of every composed part except the last one
+MIN_PART_SIZE = 5 * 1024 * 1024  # 5 mebibytes
+
 
 def upload_file(
         minio_client: Minio,
@@ -32,7 +45,111 @@ def download_file(minio_client: Minio, bucket_name: str, file_name: str) -> byte
     return file.read()
 
 
+@contextmanager
+def open_file_stream(
+        minio_client: Minio,
+        bucket_name: str,
+        file_name: str
+) -> Iterator[HTTPResponse]:
+    """Open file in MinIO for reading in chunks without loading it into memory."""
+    logger.info(f"Start streaming {file_name!r} from Minio bucket {bucket_name!r}")
+    file = minio_client.get_object(bucket_name=bucket_name, object_name=file_name)
+    try:
+        yield file
+    finally:
+        file.close()
+        file.release_conn()
+
+
+def download_file_range(
+        minio_client: Minio,
+        bucket_name: str,
+        file_name: str,
+        offset: int,
+        length: int
+) -> bytes:
+    logger.info(
+        f"Start downloading bytes {offset}-{offset + length - 1} of {file_name!r} "
+        f"from Minio bucket {bucket_name!r}"
+    )
+    file = minio_client.get_object(
+        bucket_name=bucket_name,
+        object_name=file_name,
+        offset=offset,
+        length=length
+    )
+    try:
+        return file.read()
+    finally:
+        file.close()
+        file.release_conn()
+
+
+def get_presigned_url(
+        minio_client: Minio,
+        bucket_name: str,
+        file_name: str,
+        filename: str,
+        expiration: int
+) -> str:
+    logger.info(f"Generate presigned url for {file_name!r} from Minio bucket {bucket_name!r}")
+    return minio_client.presigned_get_object(
+        bucket_name=bucket_name,
+        object_name=file_name,
+        expires=timedelta(seconds=expiration),
+        response_headers={"response-content-disposition": _get_content_disposition(filename)}
+    )
+
+
+def copy_file(minio_client: Minio, bucket_name: str, source_name: str, file_name: str) -> str:
+    logger.info(f"Start copying {source_name!r} to {file_name!r} in Minio bucket {bucket_name!r}")
+    response = minio_client.copy_object(
+        bucket_name=bucket_name,
+        object_name=file_name,
+        source=CopySource(bucket_name=bucket_name, object_name=source_name)
+    )
+    logger.info(f"File {source_name!r} was copied to {file_name!r} in Minio bucket {bucket_name!r}")
+    return response.etag
+
+
+def list_files(minio_client: Minio, bucket_name: str, prefix: str) -> list[Object]:
+    return list(minio_client.list_objects(bucket_name=bucket_name, prefix=prefix, recursive=True))
+
+
+def compose_file(
+        minio_client: Minio,
+        bucket_name: str,
+        file_name: str,
+        source_names: list[str]
+) -> str:
+    """Concatenate files in given order into a new file by server-side copy."""
+    logger.info(
+        f"Start composing {file_name!r} from {len(source_names)} files "
+        f"in Minio bucket {bucket_name!r}"
+    )
+    response = minio_client.compose_object(
+        bucket_name=bucket_name,
+        object_name=file_name,
+        sources=[
+            ComposeSource(bucket_name=bucket_name, object_name=source_name)
+            for source_name in source_names
+        ]
+    )
+    logger.info(f"File {file_name!r} was composed in Minio bucket {bucket_name!r}")
+    return response.etag
+
+
 def delete_file(minio_client: Minio, bucket_name: str, file_name: str) -> None:
     logger.info(f"Start deleting {file_name!r} from Minio bucket {bucket_name!r}")
     minio_client.remove_object(bucket_name=bucket_name, object_name=file_name)
     logger.info(f"File {file_name!r} was deleted from Minio bucket {bucket_name!r}")
+
+
+def _get_content_disposition(filename: str) -> str:
+    # Non-ASCII names, e.g. Cyrillic ones, are given by RFC 5987 parameter, while
+    # ASCII fallback is kept for clients which do not support it
+    fallback = "".join(
+        char if char.isascii() and char.isprintable() and char not in '"\\' else "_"
+        for char in filename
+    )
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
@@ -0,0 +1,52 @@
+from typing import Any
+
+from sklearn.pipeline import Pipeline
+from sklearn.svm import LinearSVC
+from sklearn.linear_model import SGDClassifier
+from sklearn.kernel_approximation import (
+    Nystroem,
+    RBFSampler
+)
+
+APPROXIMATION_STEP = "approximation"
+SVM_STEP = "svm"
+
+
+def make_sgd_svm(**params: Any) -> SGDClassifier:
+    """Linear SVM trained by stochastic gradient descent on hinge loss."""
+    return SGDClassifier(loss="hinge", **params)
+
+
+def make_kernel_approximation_svm(
+        kernel_approximation: str,
+        kernel: str,
+        gamma: float | None,
+        n_components: int,
+        C: float,
+        tol: float,
+        max_iter: int,
+        random_state: int | None = None
+) -> Pipeline:
+    """
+    Linear SVM over explicit approximation of kernel feature map.
+
+    Training is linear in number of samples and prediction cost depends on
+    ``n_components`` instead of number of support vectors.
+    """
+    if kernel_approximation == "nystroem":
+        approximator = Nystroem(
+            kernel=kernel,
+            gamma=gamma,
+            n_components=n_components,
+            random_state=random_state
+        )
+    else:
+        approximator = RBFSampler(
+            gamma=gamma or 1.0,
+            n_components=n_components,
+            random_state=random_state
+        )
+    return Pipeline([
+        (APPROXIMATION_STEP, approximator),
+        (SVM_STEP, LinearSVC(C=C, tol=tol, max_iter=max_iter, dual=False))
+    ])
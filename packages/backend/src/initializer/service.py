@@ -7,6 +7,7 @@ from pymongo.collection import Collection
 
 from ..core import (
     storage,
+    profiling,
     global_config,
     service as core_service
 )
@@ -40,26 +41,35 @@ def load_datasets(
         statistics_dir_path: str,
         minio_client: Minio,
         bucket_name: str,
-        dataset_collection: Collection
+        dataset_collection: Collection,
+        profile_collection: Collection
 ) -> None:
     dataset_files_directory = pathlib.Path(dataset_dir_path)
     statistics = load_statistics(dir_path=dataset_dir_path, statistics_dir_path=statistics_dir_path)
     datasets = []
+    profiles = []
     for file in dataset_files_directory.iterdir():
         if not statistics.get(file.name):
             continue
         logger.info(f"Loading dataset {file.name!r}")
         dataset = Dataset(**statistics[file.name])
         datasets.append(dataset)
+        file_data = file.read_bytes()
+        profiles.append(profiling.calculate_dataset_profile(
+            md5=dataset.md5,
+            file_data=file_data,
+            chunk_size=global_config.dataset_chunk_size
+        ))
         storage.upload_file(
             minio_client=minio_client,
             bucket_name=bucket_name,
             file_name=dataset.md5,
-            file_data=file.read_bytes(),
+            file_data=file_data,
             part_size=global_config.minio.part_size
         )
     logger.info(f"Adding datasets {', '.join(dataset.name for dataset in datasets)!r} to database")
     dataset_collection.insert_many([dataset.model_dump() for dataset in datasets])
+    profile_collection.insert_many([profile.model_dump() for profile in profiles])
 
 
 def load_models(
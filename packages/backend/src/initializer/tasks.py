@@ -6,7 +6,8 @@ from . import service
 from ..core import (
     minio,
     mongo_collection_models,
-    mongo_collection_datasets
+    mongo_collection_datasets,
+    mongo_collection_dataset_profiles
 )
 
 logger = logging.getLogger(__name__)
@@ -23,7 +24,8 @@ def load_preprocessed_datasets(
         statistics_dir_path=statistics_dir_path,
         minio_client=minio,
         bucket_name=minio_bucket_name,
-        dataset_collection=mongo_collection_datasets
+        dataset_collection=mongo_collection_datasets,
+        profile_collection=mongo_collection_dataset_profiles
     )
 
 
@@ -9,6 +9,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from ..core import mongodb_client
 from .models import router as models_router
 from .schemas import router as schemas_router
+from .searches import router as searches_router
+from .benchmarks import router as benchmarks_router
 from .datasets import router as datasets_router
 from .classifications import router as classifications_router
 
@@ -42,5 +44,7 @@ app.add_middleware(
 app.include_router(router=schemas_router)
 app.include_router(router=datasets_router)
 app.include_router(router=models_router)
+app.include_router(router=searches_router)
+app.include_router(router=benchmarks_router)
 app.include_router(router=classifications_router)
 add_pagination(parent=app)
@@ -0,0 +1,17 @@
+from pydantic import (
+    Field,
+    BaseModel,
+    model_validator
+)
+
+
+class BenchmarkParams(BaseModel):
+    dataset_id: str = Field(description="Id of labelled preprocessed dataset to evaluate models on")
+    model_ids: list[str] = Field(min_length=1, description="Ids of trained models to compare")
+    max_workers: int | None = Field(default=None, gt=0)
+
+    @model_validator(mode="after")
+    def validate_model_ids(self) -> "BenchmarkParams":
+        if len(set(self.model_ids)) != len(self.model_ids):
+            raise ValueError("Ids of benchmarked models must be unique")
+        return self
@@ -0,0 +1,59 @@
+from fastapi import (
+    Path,
+    status,
+    APIRouter
+)
+from fastapi.responses import JSONResponse
+from fastapi_pagination.utils import disable_installed_extensions_check
+from fastapi_pagination import (
+    Page,
+    paginate
+)
+
+from . import tasks
+from .models import BenchmarkParams
+from ...core.models import BenchmarkDocument
+from ...core import service as core_service
+from ...core import mongo_collection_benchmarks
+
+router = APIRouter(prefix="/benchmarks", tags=["Benchmarks"])
+disable_installed_extensions_check()
+
+
+@router.post(path="/", name="Сравнить модели на наборе данных")
+def run_benchmark(params: BenchmarkParams) -> JSONResponse:
+    tasks.run_benchmark.apply_async(kwargs=params.model_dump())
+    return JSONResponse(
+        status_code=status.HTTP_201_CREATED,
+        content={
+            "status": f"Benchmark of models {', '.join(params.model_ids)} "
+                      f"on dataset {params.dataset_id} is started"
+        }
+    )
+
+
+@router.get(
+    path="/",
+    name="Получить задачи сравнения моделей",
+    response_model=Page[BenchmarkDocument]
+)
+def get_benchmarks() -> Page[BenchmarkDocument]:
+    return paginate(
+        core_service.get_documents(
+            document_class=BenchmarkDocument,
+            collection=mongo_collection_benchmarks
+        )
+    )
+
+
+@router.get(
+    path="/{id}",
+    name="Получить результаты сравнения моделей",
+    response_model=BenchmarkDocument
+)
+def get_benchmark(id_: str = Path(alias="id")) -> BenchmarkDocument:
+    return core_service.get_document_by_id(
+        id_=id_,
+        collection=mongo_collection_benchmarks,
+        document_class=BenchmarkDocument
+    )
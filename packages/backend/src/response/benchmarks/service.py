@@ -0,0 +1,102 @@
+import time
+import pickle
+import logging
+from concurrent.futures import as_completed
+
+import numpy as np
+from threadpoolctl import threadpool_limits
+from sklearn.metrics import (
+    recall_score,
+    accuracy_score,
+    precision_score
+)
+
+from ...core import (
+    cpu,
+    cache,
+    pruning,
+    parallel
+)
+from ...core.models import (
+    ModelDocument,
+    BenchmarkResult
+)
+
+logger = logging.getLogger(__name__)
+
+
+def evaluate_model(
+        model_document: ModelDocument,
+        serialized_model: bytes,
+        md5: str,
+        cache_dir_path: str,
+        chunk_size: int,
+        threads: int
+) -> BenchmarkResult:
+    """Evaluate model on the whole cached dataset, used in child processes of worker."""
+    dataset = cache.open_dataset(md5=md5, cache_dir_path=cache_dir_path)
+    model = cpu.set_model_threads(
+        model=pickle.loads(serialized_model),
+        algorithm_name=model_document.algorithm,
+        threads=threads
+    )
+    predictions = []
+    prediction_time = 0.0
+    with threadpool_limits(limits=threads):
+        for i in range(0, len(dataset.y), chunk_size):
+            x_chunk = pruning.apply_mask(
+                x=np.asarray(dataset.x[i:i + chunk_size]),
+                feature_mask=model_document.feature_mask
+            )
+            start_time = time.time()
+            predictions.append(model.predict(x_chunk))
+            prediction_time += time.time() - start_time
+    y_pred = np.concatenate(predictions)
+    y_true = np.asarray(dataset.y)
+    return BenchmarkResult(
+        model_id=model_document.id,
+        model_name=model_document.name,
+        algorithm=model_document.algorithm,
+        accuracy=np.round(accuracy_score(y_true, y_pred), 6),
+        precision=np.round(precision_score(y_true, y_pred), 6),
+        recall=np.round(recall_score(y_true, y_pred), 6),
+        prediction_time=np.round(prediction_time, 6),
+        throughput=np.round(len(y_true) / prediction_time, 2) if prediction_time else 0.0
+    )
+
+
+def run_benchmark(
+        models: list[tuple[ModelDocument, bytes]],
+        md5: str,
+        cache_dir_path: str,
+        chunk_size: int,
+        max_workers: int,
+        threads: int
+) -> tuple[list[BenchmarkResult], list[str]]:
+    """Evaluate models in process pool and return results sorted by accuracy with failed ids."""
+    processes = min(max_workers, len(models), threads)
+    threads_per_model = max(1, threads // processes)
+    logger.info(f"Evaluate {len(models)} models in {processes} processes")
+    results = []
+    failed_model_ids = []
+    with parallel.get_process_pool(max_workers=processes) as executor:
+        futures = {
+            executor.submit(
+                evaluate_model,
+                model_document=model_document,
+                serialized_model=serialized_model,
+                md5=md5,
+                cache_dir_path=cache_dir_path,
+                chunk_size=chunk_size,
+                threads=threads_per_model
+            ): model_document for model_document, serialized_model in models
+        }
+        for future in as_completed(futures):
+            model_document = futures[future]
+            try:
+                results.append(future.result())
+            except Exception:
+                logger.exception(f"Evaluation of model {model_document.name!r} failed")
+                failed_model_ids.append(model_document.id)
+    results.sort(key=lambda result: (-result.accuracy, -result.throughput))
+    return results, failed_model_ids
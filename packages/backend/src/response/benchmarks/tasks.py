@@ -0,0 +1,106 @@
+import time
+import logging
+import datetime
+
+from bson import ObjectId
+
+from . import service
+from ... import worker
+from ...core.enums import JobStatus
+from ...core import (
+    cpu,
+    redis,
+    minio,
+    storage,
+    global_config,
+    service as core_service,
+    mongo_collection_models,
+    mongo_collection_datasets,
+    mongo_collection_benchmarks
+)
+from ...core.models import (
+    Benchmark,
+    ModelDocument,
+    DatasetDocument
+)
+from ..models import service as models_service
+
+logger = logging.getLogger(__name__)
+
+
+@worker.celery.task()
+def run_benchmark(
+        dataset_id: str,
+        model_ids: list[str],
+        max_workers: int | None
+) -> None:
+    logger.info(f"Start benchmark of models {model_ids} on dataset {dataset_id!r}")
+    dataset = core_service.get_document_by_id(
+        id_=dataset_id,
+        collection=mongo_collection_datasets,
+        document_class=DatasetDocument
+    )
+    benchmark = Benchmark(
+        dataset_id=dataset.id,
+        model_ids=model_ids,
+        status=JobStatus.RUNNING,
+        created_at=datetime.datetime.now(tz=datetime.timezone(datetime.timedelta(hours=3)))
+    )
+    benchmark_id = mongo_collection_benchmarks.insert_one(benchmark.model_dump()).inserted_id
+    start_time = time.time()
+    try:
+        model_documents = [
+            core_service.get_document_by_id(
+                id_=id_,
+                collection=mongo_collection_models,
+                document_class=ModelDocument
+            ) for id_ in model_ids
+        ]
+        # Dataset is cached on worker disk once, evaluating processes memory-map it
+        dataset_arrays = models_service.load_dataset(
+            dataset=dataset,
+            minio=minio,
+            bucket_name=global_config.minio.preprocessed_datasets_bucket_name,
+            cache_config=global_config.cache
+        )
+        logger.info(f"Loaded dataset with {len(dataset_arrays.y)} rows for benchmark")
+        models = [
+            (
+                model_document,
+                storage.download_file(
+                    minio_client=minio,
+                    bucket_name=global_config.minio.trained_models_bucket_name,
+                    file_name=model_document.md5
+                )
+            ) for model_document in model_documents
+        ]
+        with cpu.allocate_threads(
+            redis=redis,
+            budget=global_config.cpu_budget,
+            requested=global_config.cpu_threads_per_task,
+            expiration=global_config.locked_task_expiration
+        ) as threads:
+            results, failed_model_ids = service.run_benchmark(
+                models=models,
+                md5=dataset.md5,
+                cache_dir_path=global_config.cache.dir_path,
+                chunk_size=global_config.training_chunk_size,
+                max_workers=max_workers or threads,
+                threads=threads
+            )
+    except Exception:
+        mongo_collection_benchmarks.update_one(
+            filter={"_id": ObjectId(benchmark_id)},
+            update={"$set": {"status": JobStatus.FAILED}}
+        )
+        raise
+    mongo_collection_benchmarks.update_one(
+        filter={"_id": ObjectId(benchmark_id)},
+        update={"$set": {
+            "status": JobStatus.FAILED if not results else JobStatus.COMPLETED,
+            "benchmark_time": round(time.time() - start_time, 6),
+            "results": [result.model_dump() for result in results],
+            "failed_model_ids": failed_model_ids
+        }}
+    )
+    logger.info(f"Benchmark {benchmark_id!r} finished, failed models: {failed_model_ids}")
@@ -18,11 +18,18 @@ from . import service
 from ...core.enums import Extension
 from .models import ClassificationResponse
 from ...core import service as core_service
-from ...core.models import ClassificationDTO
+from ...core.models import (
+    CascadeReport,
+    AffinityWorker,
+    ClassificationDTO
+)
 from ...core import (
+    redis,
+    affinity,
     global_config,
     mongo_collection_models,
     mongo_collection_classifications,
+    mongo_collection_cascade_reports,
     mongo_collection_common_classifications
 )
 
@@ -33,7 +40,8 @@ disable_installed_extensions_check()
 @router.post(path="/", name="Классифицировать предобработанные команды")
 def classify_commands(
         models_ids: Annotated[list[str], Form()],
-        commands: UploadFile
+        commands: UploadFile,
+        fused_scoring: Annotated[bool, Form()] = False
 ) -> JSONResponse:
     if not core_service.is_right_file_extension(commands.filename, Extension.CSV):
         return JSONResponse(
@@ -46,7 +54,8 @@ def classify_commands(
     tasks.classify_commands.apply_async(
         kwargs={
             "commands_data": commands.file.read(),
-            "models_ids": models_ids[0].split(",")
+            "models_ids": models_ids[0].split(","),
+            "fused_scoring": fused_scoring
         }
     )
     return JSONResponse(
@@ -55,6 +64,81 @@ def classify_commands(
     )
 
 
+@router.post(path="/cascade", name="Классифицировать команды каскадом моделей")
+def classify_commands_cascade(
+        models_ids: Annotated[list[str], Form()],
+        commands: UploadFile,
+        thresholds: Annotated[str | None, Form()] = None
+) -> JSONResponse:
+    if not core_service.is_right_file_extension(commands.filename, Extension.CSV):
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "status": f"Wrong file {commands.filename} extension. "
+                          f"Expected {Extension.CSV.value}"
+            }
+        )
+    models_ids = models_ids[0].split(",")
+    stage_thresholds = None
+    if thresholds:
+        try:
+            stage_thresholds = [float(threshold) for threshold in thresholds.split(",")]
+        except ValueError:
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"status": f"Thresholds {thresholds!r} are not comma-separated numbers"}
+            )
+        # Comparisons with NaN are false, so it is rejected together with out of range values
+        invalid_thresholds = [
+            threshold for threshold in stage_thresholds if not 0 <= threshold <= 1
+        ]
+        if invalid_thresholds:
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"status": f"Thresholds {invalid_thresholds} are not in range [0, 1]"}
+            )
+        if len(stage_thresholds) != len(models_ids) - 1:
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "status": f"Expected {len(models_ids) - 1} thresholds for "
+                              f"{len(models_ids)} cascade models, got {len(stage_thresholds)}"
+                }
+            )
+    tasks.classify_commands_cascade.apply_async(
+        kwargs={
+            "commands_data": commands.file.read(),
+            "models_ids": models_ids,
+            "thresholds": stage_thresholds
+        }
+    )
+    return JSONResponse(
+        status_code=status.HTTP_201_CREATED,
+        content={"status": "Commands cascade classification is started"}
+    )
+
+
+@router.get(
+    path="/cascade",
+    name="Получить статистику последней каскадной классификации",
+    response_model=CascadeReport | None
+)
+def get_cascade_report() -> CascadeReport | None:
+    return service.get_cascade_report(cascade_report_collection=mongo_collection_cascade_reports)
+
+
+@router.get(
+    path="/affinity",
+    name="Получить воркеры классификации и попадания моделей в их кэш",
+    response_model=list[AffinityWorker]
+)
+def get_affinity_workers() -> list[AffinityWorker]:
+    return affinity.get_workers_statistics(
+        redis=redis,
+        ttl=global_config.celery.affinity_heartbeat_ttl
+    )
+
+
 @router.get(
     path="/commands",
     name="Получить результаты классификации команды на разных моделях",
@@ -81,13 +165,17 @@ def get_classifications(limit: int) -> ClassificationResponse:
 
 
 @router.get(path="/download", name="Скачать подробные результаты классификации")
-def download_classifications(filename: str) -> StreamingResponse:
+def download_classifications(
+        filename: str,
+        redirect_links: bool = Query(default=False)
+) -> StreamingResponse:
     file = service.download_classifications(
         filename=filename,
         model_collection=mongo_collection_models,
         classification_collection=mongo_collection_classifications,
         common_classification_collection=mongo_collection_common_classifications,
-        app_url=global_config.app.url
+        app_url=global_config.app.url,
+        redirect_links=redirect_links
     )
     return StreamingResponse(
         content=file.file,
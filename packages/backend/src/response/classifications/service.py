@@ -1,16 +1,28 @@
+import time
 import logging
 from io import BytesIO
 from urllib.parse import quote
 
+import numpy as np
 import pandas as pd
 from pymongo.collection import Collection
 
-from ...core import TModel
-from ...core.enums import Extension
+from ...core import (
+    TModel,
+    fused,
+    dtypes,
+    pruning
+)
+from ...core.enums import (
+    Extension,
+    DownloadMode
+)
 from .models import ClassificationResponse
 from ...core import service as core_service
 from ...core.models import (
     FileContent,
+    CascadeStage,
+    CascadeReport,
     ModelDocument,
     Classification,
     ClassificationDTO,
@@ -68,20 +80,33 @@ def get_command_classifications(
     return classifications
 
 
-def load_commands(data: bytes, commands_column_name: str) -> tuple[pd.DataFrame, list[str]]:
-    commands_dataframe = pd.read_csv(filepath_or_buffer=BytesIO(data))
-    commands_list = commands_dataframe[commands_column_name]
-    commands_dataframe = commands_dataframe.drop(commands_column_name, axis=1)
-    return commands_dataframe, commands_list
+def load_commands(data: bytes, commands_column_name: str) -> tuple[np.ndarray, list[str]]:
+    commands_dataframe, feature_columns = dtypes.read_csv(
+        file_data=data,
+        non_feature_columns=[commands_column_name]
+    )
+    commands_list = commands_dataframe[commands_column_name].astype(str).tolist()
+    features = np.ascontiguousarray(
+        commands_dataframe.loc[:, feature_columns].to_numpy(dtype=dtypes.FEATURES_DTYPE)
+    )
+    return features, commands_list
 
 
 def classify_commands(
         model: TModel,
         model_id: str,
-        dataframe: pd.DataFrame,
+        features: np.ndarray,
+        commands: list[str]
+) -> list[Classification]:
+    predictions = model.predict(features)
+    return build_classifications(model_id=model_id, predictions=predictions, commands=commands)
+
+
+def build_classifications(
+        model_id: str,
+        predictions: np.ndarray,
         commands: list[str]
 ) -> list[Classification]:
-    predictions = model.predict(dataframe.to_numpy())
     return [
         Classification(
             model_id=model_id,
@@ -91,6 +116,120 @@ def classify_commands(
     ]
 
 
+def classify_cascade(
+        stages: list[tuple[ModelDocument, TModel, float | None]],
+        features: np.ndarray,
+        commands: list[str]
+) -> tuple[list[Classification], list[CascadeStage]]:
+    """
+    Classify commands by ordered models, where each model decides only confident commands.
+
+    Commands with maximum class probability below stage threshold are escalated to the
+    next model, the last stage decides all remaining commands.
+    """
+    for model_document, model, _threshold in stages[:-1]:
+        if not hasattr(model, "predict_proba"):
+            raise ValueError(
+                f"Model {model_document.name!r} can not be used before the last cascade stage, "
+                f"because it does not predict probabilities"
+            )
+    pending = np.arange(len(commands))
+    classifications = []
+    stage_statistics = []
+    for i, (model_document, model, threshold) in enumerate(stages):
+        is_last_stage = i == len(stages) - 1
+        x = pruning.apply_mask(x=features[pending], feature_mask=model_document.feature_mask)
+        start_time = time.time()
+        if is_last_stage:
+            predictions = model.predict(x)
+            confident = np.ones(len(pending), dtype=bool)
+        else:
+            probabilities = model.predict_proba(x)
+            predictions = model.classes_[probabilities.argmax(axis=1)]
+            confident = probabilities.max(axis=1) >= threshold
+        prediction_time = np.round(time.time() - start_time, 6)
+
+        classifications.extend(
+            build_classifications(
+                model_id=model_document.id,
+                predictions=predictions[confident],
+                commands=[commands[index] for index in pending[confident]]
+            )
+        )
+        stage_statistics.append(
+            CascadeStage(
+                model_id=model_document.id,
+                threshold=None if is_last_stage else threshold,
+                received=len(pending),
+                decided=int(confident.sum()),
+                escalation_rate=np.round(1.0 - confident.mean(), 6) if len(pending) else 0.0,
+                prediction_time=prediction_time
+            )
+        )
+        logger.info(
+            f"Cascade stage {i} with model {model_document.name!r} decided "
+            f"{confident.sum()} of {len(pending)} commands"
+        )
+        pending = pending[~confident]
+        if not len(pending):
+            break
+    return classifications, stage_statistics
+
+
+def get_cascade_report(cascade_report_collection: Collection) -> CascadeReport | None:
+    document = cascade_report_collection.find_one({}, sort=[("created_at", -1)])
+    return None if document is None else CascadeReport(**document)
+
+
+def predict_fused(
+        models: list[tuple[ModelDocument, TModel]],
+        features: np.ndarray,
+        verify_samples: int
+) -> dict[str, np.ndarray]:
+    """
+    Predict with all linear-family models at once by one matrix multiply.
+
+    Fused predictions are compared with ``predict`` of every model on first
+    ``verify_samples`` commands, models with any mismatch are left for per-model path.
+    """
+    scored_models = []
+    decision_functions = []
+    for model_document, model in models:
+        feature_mask = None
+        if model_document.feature_mask is not None:
+            feature_mask = pruning.decode_mask(
+                feature_mask=model_document.feature_mask,
+                features=features.shape[1]
+            )
+        decision_function = fused.get_decision_function(model=model, feature_mask=feature_mask)
+        if decision_function is not None:
+            scored_models.append((model_document, model))
+            decision_functions.append(decision_function)
+    if not scored_models:
+        return {}
+
+    predictions = fused.predict_models(
+        models=[model for _, model in scored_models],
+        x=features,
+        decision_functions=decision_functions
+    )
+    sample = features[:verify_samples]
+    fused_predictions = {}
+    for (model_document, model), model_predictions in zip(scored_models, predictions, strict=True):
+        expected = model.predict(
+            pruning.apply_mask(x=sample, feature_mask=model_document.feature_mask)
+        )
+        if not np.array_equal(expected, model_predictions[:verify_samples]):
+            logger.warning(
+                f"Fused predictions of model {model_document.name!r} differ from its own, "
+                f"use per-model prediction"
+            )
+            continue
+        fused_predictions[model_document.id] = model_predictions
+    logger.info(f"Scored {len(fused_predictions)} linear-family models with one matrix multiply")
+    return fused_predictions
+
+
 def get_common_classification(
         classifications: list[ClassificationDocument]
 ) -> CommonClassification:
@@ -108,7 +247,8 @@ def download_classifications(
         model_collection: Collection,
         classification_collection: Collection,
         common_classification_collection: Collection,
-        app_url: str
+        app_url: str,
+        redirect_links: bool = False
 ) -> FileContent:
     filename = core_service.render_filename(raw_filename=filename, expected_extension=Extension.CSV)
     logger.info(f"Start downloading classifications to {filename}")
@@ -147,9 +287,13 @@ def download_classifications(
             command_data[command_classification.model_name] = int(
                 command_classification.is_obfuscated
             )
-            command_data[f"{command_classification.model_name}_download_link"] = (
-                f"{app_url}/api/v1/models/{models[command_classification.model_name].id}/download/"
+            download_link = (
+                f"{app_url}/api/v1/models/{models[command_classification.model_name].id}/download"
             )
+            if redirect_links:
+                # Model is downloaded from storage by presigned url instead of API process
+                download_link += f"?mode={DownloadMode.REDIRECT.value}"
+            command_data[f"{command_classification.model_name}_download_link"] = download_link
         df_data.append(command_data)
     return FileContent(
         file=BytesIO(pd.DataFrame(data=df_data).to_csv(index=False).encode('utf-8')),
@@ -1,49 +1,75 @@
+import time
 import pickle
+import datetime
 import logging
+from typing import Any
+from collections import OrderedDict
 
-from celery import Task
+import numpy as np
 from redis import Redis
+from celery import (
+    Task,
+    chord,
+    current_task
+)
 
 from . import service
 from ... import worker
+from ...core.fused import LINEAR_FAMILY_ALGORITHMS
 from ...core import (
+    cpu,
+    cache,
+    affinity,
     redis,
     minio,
+    pruning,
     storage,
     global_config,
     LockException,
     mongo_collection_models,
     service as core_service,
     mongo_collection_classifications,
+    mongo_collection_cascade_reports,
     mongo_collection_common_classifications
 )
 from ...core.models import (
+    CascadeReport,
     ModelDocument,
+    Classification,
     ClassificationDocument
 )
 
 logger = logging.getLogger(__name__)
 
+LOCK_KEY = "classification"
+
+# Deserialized models of worker process, the most recently used are at the end
+_models: OrderedDict[str, Any] = OrderedDict()
+
 
 class ClassificationTask(Task):
     redis: Redis
     locked_task_expiration: int
 
     def before_start(self, task_id, args, kwargs) -> None:
-        status = self.redis.set("classification", "lock", ex=self.locked_task_expiration, nx=True)
+        status = self.redis.set(LOCK_KEY, "lock", ex=self.locked_task_expiration, nx=True)
         if not status:
             raise LockException()
         logger.info("Cleaning up old classifications in database")
         mongo_collection_classifications.delete_many({})
         mongo_collection_common_classifications.delete_many({})
+        mongo_collection_cascade_reports.delete_many({})
 
     def on_success(self, retval, task_id, args, kwargs) -> None:
-        self.redis.delete("classification")
+        # Lock of dispatched classification is released by its finishing task
+        if retval is True:
+            return
+        self.redis.delete(LOCK_KEY)
 
     def on_failure(self, exc, task_id, args, kwargs, einfo) -> None:
         if isinstance(exc, LockException):
             return
-        self.redis.delete("classification")
+        self.redis.delete(LOCK_KEY)
 
 
 @worker.celery.task(
@@ -51,11 +77,22 @@ class ClassificationTask(Task):
     redis=redis,
     locked_task_expiration=global_config.locked_task_expiration
 )
-def classify_commands(commands_data: bytes, models_ids: list[str]) -> None:
+def classify_commands(
+        commands_data: bytes,
+        models_ids: list[str],
+        fused_scoring: bool = False
+) -> bool:
+    """
+    Classify commands with models and return whether it is finished by dispatched sub-tasks.
+
+    Models which are not fused are classified by per-model sub-tasks on workers chosen
+    by consistent hashing of model md5, so each model is mostly served by worker which
+    has already cached it. Without alive workers models are classified in this task.
+    """
     logger.info(f"Start classifying commands")
 
-    logger.info(f"Loading commands into Dataframe")
-    commands_dataframe, commands = service.load_commands(
+    logger.info("Loading commands into feature matrix")
+    commands_features, commands = service.load_commands(
         data=commands_data,
         commands_column_name=global_config.commands_column_name
     )
@@ -71,29 +108,212 @@ def classify_commands(commands_data: bytes, models_ids: list[str]) -> None:
     ]
     logger.info(f"Got trained models: md5 hashes={[model.md5 for model in model_documents]}")
 
+    fused_predictions = {}
+    if fused_scoring:
+        fused_predictions = service.predict_fused(
+            models=[
+                (model_document, _load_model(model_document))
+                for model_document in model_documents
+                if model_document.algorithm in LINEAR_FAMILY_ALGORITHMS
+            ],
+            features=commands_features,
+            verify_samples=global_config.fused_scoring_verify_samples
+        )
     for model_document in model_documents:
+        if model_document.id not in fused_predictions:
+            continue
         logger.info(
-            f"Classify commands with model: name={model_document.name}, md5={model_document.md5}"
+            f"Classify commands with fused scoring of model: "
+            f"name={model_document.name}, md5={model_document.md5}"
         )
-        model = pickle.loads(storage.download_file(
-            minio_client=minio,
-            bucket_name=global_config.minio.trained_models_bucket_name,
-            file_name=model_document.md5
-        ))
-        classifications = service.classify_commands(
-            model=model,
-            model_id=model_document.id,
-            dataframe=commands_dataframe,
-            commands=commands
+        _save_classifications(
+            model_document=model_document,
+            classifications=service.build_classifications(
+                model_id=model_document.id,
+                predictions=fused_predictions[model_document.id],
+                commands=commands
+            )
         )
-        mongo_collection_classifications.insert_many(
-            [classification.model_dump() for classification in classifications]
+    model_documents = [
+        model_document for model_document in model_documents
+        if model_document.id not in fused_predictions
+    ]
+
+    workers = []
+    if global_config.celery.classification_affinity:
+        workers = affinity.get_alive_workers(
+            redis=redis,
+            ttl=global_config.celery.affinity_heartbeat_ttl
         )
-        logger.info(
-            f"Classifications with model name={model_document.name}, md5={model_document.md5} "
-            f"were saved in database"
+    if model_documents and workers:
+        ring = affinity.HashRing(nodes=workers, replicas=global_config.celery.affinity_replicas)
+        timeout = global_config.celery.affinity_dispatch_timeout
+        dispatch_id = affinity.start_dispatch(
+            redis=redis,
+            lock_key=LOCK_KEY,
+            commands_data=commands_data,
+            lock_expiration=global_config.locked_task_expiration,
+            timeout=timeout
+        )
+        sub_tasks = []
+        for model_document in model_documents:
+            node = ring.get_node(model_document.md5)
+            logger.info(f"Route classification with model md5={model_document.md5} to {node}")
+            # Sub-tasks left in queue of dead worker are dropped when it comes back
+            sub_tasks.append(classify_commands_with_model.s(
+                dispatch_id=dispatch_id,
+                model_id=model_document.id
+            ).set(queue=affinity.get_worker_queue(node), expires=timeout))
+        chord(sub_tasks)(
+            finish_classification.si(dispatch_id=dispatch_id).on_error(
+                release_classification_lock.si(dispatch_id=dispatch_id)
+            )
+        )
+        # Chord callback never fires if worker of sub-task is gone, so lock is released
+        # by shared queue after timeout unless dispatch has already finished
+        release_classification_lock.apply_async(
+            kwargs={"dispatch_id": dispatch_id},
+            countdown=timeout
+        )
+        return True
+
+    with cpu.allocate_threads(
+        redis=redis,
+        budget=global_config.cpu_budget,
+        requested=global_config.cpu_threads_per_task,
+        expiration=global_config.locked_task_expiration
+    ) as threads:
+        for model_document in model_documents:
+            _classify_with_model(
+                model_document=model_document,
+                commands_features=commands_features,
+                commands=commands,
+                threads=threads
+            )
+
+    _save_common_classifications(commands)
+    return False
+
+
+@worker.celery.task()
+def classify_commands_with_model(dispatch_id: str, model_id: str) -> None:
+    """Classify commands with one model on worker which is likely to have it cached."""
+    commands_features, commands = service.load_commands(
+        data=affinity.load_dispatch_commands(redis=redis, dispatch_id=dispatch_id),
+        commands_column_name=global_config.commands_column_name
+    )
+    model_document = core_service.get_document_by_id(
+        id_=model_id,
+        collection=mongo_collection_models,
+        document_class=ModelDocument
+    )
+    with cpu.allocate_threads(
+        redis=redis,
+        budget=global_config.cpu_budget,
+        requested=global_config.cpu_threads_per_task,
+        expiration=global_config.locked_task_expiration
+    ) as threads:
+        _classify_with_model(
+            model_document=model_document,
+            commands_features=commands_features,
+            commands=commands,
+            threads=threads
+        )
+
+
+@worker.celery.task()
+def finish_classification(dispatch_id: str) -> None:
+    if not affinity.owns_lock(redis=redis, lock_key=LOCK_KEY, dispatch_id=dispatch_id):
+        logger.warning(f"Classification dispatch {dispatch_id!r} finished after its timeout")
+        return
+    try:
+        _save_common_classifications(mongo_collection_classifications.distinct("command"))
+    finally:
+        affinity.release_dispatch(redis=redis, lock_key=LOCK_KEY, dispatch_id=dispatch_id)
+
+
+@worker.celery.task()
+def release_classification_lock(dispatch_id: str) -> None:
+    if affinity.release_dispatch(redis=redis, lock_key=LOCK_KEY, dispatch_id=dispatch_id):
+        logger.warning(
+            f"Classification dispatch {dispatch_id!r} failed or timed out, lock is released"
         )
 
+
+@worker.celery.task(
+    base=ClassificationTask,
+    redis=redis,
+    locked_task_expiration=global_config.locked_task_expiration
+)
+def classify_commands_cascade(
+        commands_data: bytes,
+        models_ids: list[str],
+        thresholds: list[float] | None = None
+) -> None:
+    logger.info("Start cascade classifying commands")
+    created_at = datetime.datetime.now(tz=datetime.timezone(datetime.timedelta(hours=3)))
+    if thresholds is None:
+        thresholds = [global_config.cascade_threshold] * (len(models_ids) - 1)
+
+    commands_features, commands = service.load_commands(
+        data=commands_data,
+        commands_column_name=global_config.commands_column_name
+    )
+    logger.info(f"Got {len(commands)} commands")
+
+    model_documents = [
+        core_service.get_document_by_id(
+            id_=id_,
+            collection=mongo_collection_models,
+            document_class=ModelDocument
+        ) for id_ in models_ids
+    ]
+    logger.info(f"Got cascade models: md5 hashes={[model.md5 for model in model_documents]}")
+
+    with cpu.allocate_threads(
+        redis=redis,
+        budget=global_config.cpu_budget,
+        requested=global_config.cpu_threads_per_task,
+        expiration=global_config.locked_task_expiration
+    ) as threads:
+        start_time = time.time()
+        classifications, stages = service.classify_cascade(
+            stages=[
+                (
+                    model_document,
+                    cpu.set_model_threads(
+                        model=_load_model(model_document),
+                        algorithm_name=model_document.algorithm,
+                        threads=threads
+                    ),
+                    threshold
+                ) for model_document, threshold in zip(
+                    model_documents,
+                    [*thresholds, None],
+                    strict=True
+                )
+            ],
+            features=commands_features,
+            commands=commands
+        )
+        classification_time = round(time.time() - start_time, 6)
+
+    mongo_collection_classifications.insert_many(
+        [classification.model_dump() for classification in classifications]
+    )
+    mongo_collection_cascade_reports.insert_one(
+        CascadeReport(
+            created_at=created_at,
+            commands=len(commands),
+            stages=stages,
+            classification_time=classification_time
+        ).model_dump()
+    )
+    logger.info("Cascade classifications were saved in database")
+    _save_common_classifications(commands)
+
+
+def _save_common_classifications(commands: list[str]) -> None:
     common_classifications = []
     for command in set(commands):
         command_classifications = core_service.get_documents_by_query(
@@ -110,3 +330,69 @@ def classify_commands(commands_data: bytes, models_ids: list[str]) -> None:
         [classification.model_dump() for classification in common_classifications]
     )
     logger.info(f"Common classifications were saved in database")
+
+
+def _classify_with_model(
+        model_document: ModelDocument,
+        commands_features: np.ndarray,
+        commands: list[str],
+        threads: int
+) -> None:
+    logger.info(
+        f"Classify commands with model: "
+        f"name={model_document.name}, md5={model_document.md5}"
+    )
+    model = cpu.set_model_threads(
+        model=_load_model(model_document),
+        algorithm_name=model_document.algorithm,
+        threads=threads
+    )
+    _save_classifications(
+        model_document=model_document,
+        classifications=service.classify_commands(
+            model=model,
+            model_id=model_document.id,
+            features=pruning.apply_mask(
+                x=commands_features,
+                feature_mask=model_document.feature_mask
+            ),
+            commands=commands
+        )
+    )
+
+
+def _save_classifications(
+        model_document: ModelDocument,
+        classifications: list[Classification]
+) -> None:
+    mongo_collection_classifications.insert_many(
+        [classification.model_dump() for classification in classifications]
+    )
+    logger.info(
+        f"Classifications with model name={model_document.name}, "
+        f"md5={model_document.md5} were saved in database"
+    )
+
+
+def _load_model(model_document: ModelDocument) -> Any:
+    md5 = model_document.md5
+    model = _models.pop(md5, None)
+    hit = model is not None
+    if model is None:
+        data, hit = cache.load_model_file(
+            md5=md5,
+            cache_dir_path=global_config.cache.dir_path,
+            max_size=global_config.cache.max_size,
+            loader=lambda: storage.download_file(
+                minio_client=minio,
+                bucket_name=global_config.minio.trained_models_bucket_name,
+                file_name=md5
+            )
+        )
+        model = pickle.loads(data)
+    _models[md5] = model
+    while len(_models) > global_config.celery.model_cache_size:
+        _models.popitem(last=False)
+    if current_task and current_task.request.hostname:
+        affinity.record_cache_access(redis=redis, node=current_task.request.hostname, hit=hit)
+    return model
@@ -4,3 +4,42 @@ from pydantic import BaseModel
 class DatasetCharacteristics(BaseModel):
     features: int
     samples: int
+
+
+class DatasetPreview(BaseModel):
+    dataset_id: str
+    columns: list[str]
+    rows: list[list[float | int | str | None]]
+
+
+class UploadInitiation(BaseModel):
+    filename: str
+
+
+class DatasetUpload(BaseModel):
+    upload_id: str
+    filename: str
+
+
+class UploadedPart(BaseModel):
+    index: int
+    etag: str
+    size: int | None = None
+
+
+class FeatureProfile(BaseModel):
+    name: str
+    min: float
+    max: float
+    mean: float
+    variance: float
+    non_zero_count: int
+    is_constant: bool
+
+
+class DatasetProfileResponse(BaseModel):
+    dataset_id: str
+    samples: int
+    target_name: str
+    class_balance: dict[str, int]
+    features: list[FeatureProfile]
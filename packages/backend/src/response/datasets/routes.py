@@ -7,6 +7,7 @@ from fastapi import (
 )
 from fastapi.responses import (
     JSONResponse,
+    RedirectResponse,
     StreamingResponse
 )
 from fastapi_pagination.utils import disable_installed_extensions_check
@@ -19,11 +20,24 @@ from . import tasks
 from . import service
 from ...core.enums import Extension
 from ...core.models import DatasetDocument
+from .models import (
+    UploadedPart,
+    DatasetUpload,
+    DatasetPreview,
+    UploadInitiation,
+    DatasetProfileResponse
+)
 from ...core import service as core_service
+from ...core.enums import DownloadMode
 from ...core import (
+    redis,
     minio,
+    storage,
+    UnknownColumnsException,
+    minio_presigner,
     global_config,
-    mongo_collection_datasets
+    mongo_collection_datasets,
+    mongo_collection_dataset_profiles
 )
 
 router = APIRouter(prefix="/datasets", tags=["Datasets"])
@@ -54,6 +68,111 @@ def upload_datasets(datasets: list[UploadFile]) -> JSONResponse:
     )
 
 
+@router.post(
+    path="/uploads",
+    name="Начать возобновляемую загрузку набора данных",
+    response_model=DatasetUpload
+)
+def create_dataset_upload(params: UploadInitiation) -> DatasetUpload | JSONResponse:
+    if not core_service.is_right_file_extension(params.filename, Extension.CSV):
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "status": f"Wrong file {params.filename} extension. "
+                          f"Expected {Extension.CSV.value}"
+            }
+        )
+    return service.create_upload(
+        filename=params.filename,
+        redis=redis,
+        expiration=global_config.minio.upload_expiration
+    )
+
+
+@router.put(
+    path="/uploads/{upload_id}/parts/{index}",
+    name="Загрузить часть набора данных",
+    response_model=UploadedPart
+)
+def upload_dataset_part(
+        part: UploadFile,
+        upload_id: str = Path(),
+        index: int = Path(ge=1, le=10000),
+        last: bool = Query(default=False, description="Part is the last one of dataset")
+) -> UploadedPart | JSONResponse:
+    file_data = part.file.read()
+    if not file_data or (len(file_data) < storage.MIN_PART_SIZE and not last):
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "status": f"Part {index} has {len(file_data)} bytes, every part except "
+                          f"the last one must have at least {storage.MIN_PART_SIZE} bytes"
+            }
+        )
+    return service.upload_part(
+        upload_id=upload_id,
+        index=index,
+        file_data=file_data,
+        minio=minio,
+        bucket_name=global_config.minio.preprocessed_datasets_bucket_name,
+        redis=redis
+    )
+
+
+@router.get(
+    path="/uploads/{upload_id}/parts",
+    name="Получить загруженные части набора данных",
+    response_model=list[UploadedPart]
+)
+def get_dataset_upload_parts(upload_id: str = Path()) -> list[UploadedPart]:
+    return service.get_uploaded_parts(
+        upload_id=upload_id,
+        minio=minio,
+        bucket_name=global_config.minio.preprocessed_datasets_bucket_name,
+        redis=redis
+    )
+
+
+@router.post(path="/uploads/{upload_id}/complete", name="Завершить загрузку набора данных")
+def complete_dataset_upload(upload_id: str = Path()) -> JSONResponse:
+    try:
+        upload = service.complete_upload(
+            upload_id=upload_id,
+            minio=minio,
+            bucket_name=global_config.minio.preprocessed_datasets_bucket_name,
+            redis=redis
+        )
+    except ValueError as exc:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"status": f"Upload {upload_id} can not be completed: {exc}"}
+        )
+    tasks.upload_dataset.apply_async(
+        kwargs={
+            "filename": upload.filename,
+            "object_name": service.get_upload_object_name(upload_id)
+        }
+    )
+    return JSONResponse(
+        status_code=status.HTTP_201_CREATED,
+        content={"status": f"Dataset {upload.filename} uploading is started"}
+    )
+
+
+@router.delete(path="/uploads/{upload_id}", name="Отменить загрузку набора данных")
+def abort_dataset_upload(upload_id: str = Path()) -> JSONResponse:
+    service.abort_upload(
+        upload_id=upload_id,
+        minio=minio,
+        bucket_name=global_config.minio.preprocessed_datasets_bucket_name,
+        redis=redis
+    )
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={"status": f"Dataset upload {upload_id} is aborted"}
+    )
+
+
 @router.get(path="/", name="Получить наборы данных", response_model=Page[DatasetDocument])
 def get_datasets() -> Page[DatasetDocument]:
     return paginate(
@@ -64,8 +183,22 @@ def get_datasets() -> Page[DatasetDocument]:
     )
 
 
-@router.get(path="/{id}/download", name="Скачать набор данных")
-def download_dataset(id_: str = Path(alias="id")) -> StreamingResponse:
+@router.get(path="/{id}/download", name="Скачать набор данных", response_model=None)
+def download_dataset(
+        id_: str = Path(alias="id"),
+        mode: DownloadMode = Query(default=DownloadMode.STREAM)
+) -> StreamingResponse | RedirectResponse | JSONResponse:
+    if mode != DownloadMode.STREAM:
+        link = service.get_dataset_download_link(
+            id_=id_,
+            minio=minio_presigner,
+            bucket_name=global_config.minio.preprocessed_datasets_bucket_name,
+            collection=mongo_collection_datasets,
+            expiration=global_config.minio.presigned_url_expiration
+        )
+        if mode == DownloadMode.REDIRECT:
+            return RedirectResponse(url=link.url, status_code=status.HTTP_302_FOUND)
+        return JSONResponse(status_code=status.HTTP_200_OK, content=link.model_dump())
     file = service.download_dataset(
         id_=id_,
         minio=minio,
@@ -79,6 +212,57 @@ def download_dataset(id_: str = Path(alias="id")) -> StreamingResponse:
     )
 
 
+@router.get(
+    path="/{id}/preview",
+    name="Просмотреть первые строки набора данных",
+    response_model=DatasetPreview
+)
+def preview_dataset(
+        id_: str = Path(alias="id"),
+        rows: int = Query(default=10, ge=1, le=1000),
+        columns: list[str] | None = Query(default=None)
+) -> DatasetPreview | JSONResponse:
+    try:
+        return service.preview_dataset(
+            id_=id_,
+            minio=minio,
+            bucket_name=global_config.minio.preprocessed_datasets_bucket_name,
+            collection=mongo_collection_datasets,
+            rows=rows,
+            chunk_size=global_config.minio.preview_chunk_size,
+            columns=columns
+        )
+    except UnknownColumnsException as exc:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"status": f"Dataset {id_} does not have columns {exc.columns}"}
+        )
+
+
+@router.get(
+    path="/{id}/profile",
+    name="Получить профиль признаков набора данных",
+    response_model=DatasetProfileResponse
+)
+def get_dataset_profile(
+        id_: str = Path(alias="id"),
+        columns: list[str] | None = Query(default=None)
+) -> DatasetProfileResponse | JSONResponse:
+    # Datasets uploaded before profiling was introduced do not have profiles
+    try:
+        return service.get_dataset_profile(
+            id_=id_,
+            dataset_collection=mongo_collection_datasets,
+            profile_collection=mongo_collection_dataset_profiles,
+            columns=columns
+        )
+    except ValueError as exc:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"status": f"Profile of dataset {id_} can not be found: {exc}"}
+        )
+
+
 @router.delete(path="/", name="Удалить наборы данных")
 def delete_datasets(ids: list[str] = Query()) -> JSONResponse:
     for id_ in ids:
@@ -1,20 +1,34 @@
+import uuid
 import logging
 from io import BytesIO
 from urllib.parse import quote
 
 import pandas as pd
 from minio import Minio
+from redis import Redis
 from pymongo.collection import Collection
 
-from .models import DatasetCharacteristics
 from ...core import (
     storage,
+    profiling,
+    UnknownColumnsException,
     service as core_service
 )
+from .models import (
+    UploadedPart,
+    DatasetUpload,
+    DatasetPreview,
+    FeatureProfile,
+    DatasetCharacteristics,
+    DatasetProfileResponse
+)
 from ...core.models import (
     FileContent,
+    DownloadLink,
     ModelDocument,
-    DatasetDocument
+    DatasetProfile,
+    DatasetDocument,
+    DatasetProfileDocument
 )
 
 logger = logging.getLogger(__name__)
@@ -45,11 +59,249 @@ def download_dataset(
     )
 
 
-def get_dataset_characteristics(file_data: bytes) -> DatasetCharacteristics:
-    dataframe = pd.read_csv(filepath_or_buffer=BytesIO(file_data))
-    return DatasetCharacteristics(
-        samples=len(dataframe),
-        features=len(dataframe.columns) - 1,  # -1 for target
+def get_dataset_download_link(
+        id_: str,
+        minio: Minio,
+        bucket_name: str,
+        collection: Collection,
+        expiration: int
+) -> DownloadLink:
+    dataset = core_service.get_document_by_id(
+        id_=id_,
+        collection=collection,
+        document_class=DatasetDocument
+    )
+    filename = quote(dataset.name)
+    return DownloadLink(
+        url=storage.get_presigned_url(
+            minio_client=minio,
+            bucket_name=bucket_name,
+            file_name=dataset.md5,
+            filename=dataset.name,
+            expiration=expiration
+        ),
+        filename=filename,
+        expires_in=expiration
+    )
+
+
+def preview_dataset(
+        id_: str,
+        minio: Minio,
+        bucket_name: str,
+        collection: Collection,
+        rows: int,
+        chunk_size: int,
+        columns: list[str] | None = None
+) -> DatasetPreview:
+    dataset = core_service.get_document_by_id(
+        id_=id_,
+        collection=collection,
+        document_class=DatasetDocument
+    )
+    # Header line plus requested rows are read with range requests from the start of file
+    data = bytearray()
+    lines = 0
+    while lines <= rows and len(data) < dataset.size:
+        chunk = storage.download_file_range(
+            minio_client=minio,
+            bucket_name=bucket_name,
+            file_name=dataset.md5,
+            offset=len(data),
+            length=min(chunk_size, dataset.size - len(data))
+        )
+        if not chunk:
+            break
+        data.extend(chunk)
+        lines += chunk.count(b"\n")
+        chunk_size *= 2
+    if len(data) < dataset.size:
+        data = data[:data.rfind(b"\n") + 1]
+    logger.info(f"Read {len(data)} of {dataset.size} bytes for preview of dataset {dataset.name!r}")
+
+    if columns:
+        header = pd.read_csv(filepath_or_buffer=BytesIO(data), nrows=0).columns
+        unknown_columns = [column for column in columns if column not in header]
+        if unknown_columns:
+            raise UnknownColumnsException(unknown_columns)
+    dataframe = pd.read_csv(filepath_or_buffer=BytesIO(data), nrows=rows, usecols=columns)
+    if columns:
+        dataframe = dataframe[columns]
+    dataframe = dataframe.astype(object).where(dataframe.notna(), None)
+    return DatasetPreview(
+        dataset_id=dataset.id,
+        columns=[str(column) for column in dataframe.columns],
+        rows=dataframe.to_numpy().tolist()
+    )
+
+
+def create_upload(filename: str, redis: Redis, expiration: int) -> DatasetUpload:
+    upload_id = uuid.uuid4().hex
+    redis.hset(
+        _get_upload_key(upload_id),
+        mapping={"filename": filename, "object_name": get_upload_object_name(upload_id)}
+    )
+    redis.expire(_get_upload_key(upload_id), expiration)
+    logger.info(f"Upload {upload_id!r} of dataset {filename!r} was initiated")
+    return DatasetUpload(upload_id=upload_id, filename=filename)
+
+
+def upload_part(
+        upload_id: str,
+        index: int,
+        file_data: bytes,
+        minio: Minio,
+        bucket_name: str,
+        redis: Redis
+) -> UploadedPart:
+    """Store part as its own staging object, so parts can be sent in parallel and retried."""
+    _get_upload(upload_id=upload_id, redis=redis)
+    etag = storage.upload_file(
+        minio_client=minio,
+        bucket_name=bucket_name,
+        file_name=_get_part_object_name(upload_id=upload_id, index=index),
+        file_data=file_data
+    )
+    return UploadedPart(index=index, etag=etag, size=len(file_data))
+
+
+def get_uploaded_parts(
+        upload_id: str,
+        minio: Minio,
+        bucket_name: str,
+        redis: Redis
+) -> list[UploadedPart]:
+    _get_upload(upload_id=upload_id, redis=redis)
+    parts = storage.list_files(
+        minio_client=minio,
+        bucket_name=bucket_name,
+        prefix=_get_part_object_name(upload_id=upload_id, index=None)
+    )
+    return sorted(
+        (
+            UploadedPart(
+                index=int(part.object_name.rsplit("/", 1)[-1]),
+                etag=part.etag.strip('"'),
+                size=part.size
+            ) for part in parts if part.object_name
+        ),
+        key=lambda part: part.index
+    )
+
+
+def complete_upload(
+        upload_id: str,
+        minio: Minio,
+        bucket_name: str,
+        redis: Redis
+) -> DatasetUpload:
+    upload = _get_upload(upload_id=upload_id, redis=redis)
+    parts = get_uploaded_parts(
+        upload_id=upload_id,
+        minio=minio,
+        bucket_name=bucket_name,
+        redis=redis
+    )
+    validate_parts(parts)
+    part_names = [_get_part_object_name(upload_id=upload_id, index=part.index) for part in parts]
+    storage.compose_file(
+        minio_client=minio,
+        bucket_name=bucket_name,
+        file_name=upload["object_name"],
+        source_names=part_names
+    )
+    _delete_parts(minio=minio, bucket_name=bucket_name, part_names=part_names)
+    redis.delete(_get_upload_key(upload_id))
+    logger.info(f"Upload {upload_id!r} of dataset {upload['filename']!r} was completed")
+    return DatasetUpload(upload_id=upload_id, filename=upload["filename"])
+
+
+def validate_parts(parts: list[UploadedPart]) -> None:
+    """Check that parts are numbered from 1 without gaps and only the last one is small."""
+    if not parts:
+        raise ValueError("Upload does not contain any parts")
+    missing_indices = sorted(set(range(1, parts[-1].index + 1)) - {part.index for part in parts})
+    if missing_indices:
+        raise ValueError(f"Parts {missing_indices} were not uploaded")
+    small_indices = [
+        part.index for part in parts[:-1] if (part.size or 0) < storage.MIN_PART_SIZE
+    ]
+    if small_indices:
+        raise ValueError(
+            f"Parts {small_indices} are smaller than {storage.MIN_PART_SIZE} bytes, "
+            f"only the last part can be smaller"
+        )
+
+
+def abort_upload(upload_id: str, minio: Minio, bucket_name: str, redis: Redis) -> None:
+    upload = _get_upload(upload_id=upload_id, redis=redis)
+    _delete_parts(
+        minio=minio,
+        bucket_name=bucket_name,
+        part_names=[
+            _get_part_object_name(upload_id=upload_id, index=part.index)
+            for part in get_uploaded_parts(
+                upload_id=upload_id,
+                minio=minio,
+                bucket_name=bucket_name,
+                redis=redis
+            )
+        ]
+    )
+    redis.delete(_get_upload_key(upload_id))
+    logger.info(f"Upload {upload_id!r} of dataset {upload['filename']!r} was aborted")
+
+
+def get_upload_object_name(upload_id: str) -> str:
+    return f"uploads/{upload_id}"
+
+
+def get_dataset_characteristics(profile: DatasetProfile) -> DatasetCharacteristics:
+    return DatasetCharacteristics(samples=profile.samples, features=len(profile.columns))
+
+
+def get_dataset_profile(
+        id_: str,
+        dataset_collection: Collection,
+        profile_collection: Collection,
+        columns: list[str] | None = None
+) -> DatasetProfileResponse:
+    dataset = core_service.get_document_by_id(
+        id_=id_,
+        collection=dataset_collection,
+        document_class=DatasetDocument
+    )
+    profiles = core_service.get_documents_by_query(
+        document_class=DatasetProfileDocument,
+        collection=profile_collection,
+        field_name="md5",
+        value=dataset.md5
+    )
+    if not profiles:
+        raise ValueError(f"Profile for dataset with id {id_} was not found")
+    profile = profiles[0]
+
+    statistics = profiling.decode_statistics(profile=profile)
+    constant_columns = profiling.decode_constant_columns(profile=profile)
+    selected_columns = set(columns) if columns else None
+    features = [
+        FeatureProfile(
+            name=name,
+            min=statistics["min"][i],
+            max=statistics["max"][i],
+            mean=statistics["mean"][i],
+            variance=statistics["variance"][i],
+            non_zero_count=int(statistics["non_zero_count"][i]),
+            is_constant=bool(constant_columns[i])
+        ) for i, name in enumerate(profile.columns)
+        if selected_columns is None or name in selected_columns
+    ]
+    return DatasetProfileResponse(
+        dataset_id=dataset.id,
+        samples=profile.samples,
+        target_name=profile.target_name,
+        class_balance=profile.class_balance,
+        features=features
     )
 
 
@@ -74,3 +326,25 @@ def update_related_trained_models(dataset: DatasetDocument, models_collection: C
         update={"$set": {"dataset_id": None}}
     )
     logger.info("Related trained models were updated successfully")
+
+
+def _get_part_object_name(upload_id: str, index: int | None) -> str:
+    # Without index returns prefix of all parts of upload
+    prefix = f"{get_upload_object_name(upload_id)}.parts/"
+    return prefix if index is None else f"{prefix}{index:05d}"
+
+
+def _delete_parts(minio: Minio, bucket_name: str, part_names: list[str]) -> None:
+    for part_name in part_names:
+        storage.delete_file(minio_client=minio, bucket_name=bucket_name, file_name=part_name)
+
+
+def _get_upload_key(upload_id: str) -> str:
+    return f"dataset_upload:{upload_id}"
+
+
+def _get_upload(upload_id: str, redis: Redis) -> dict[str, str]:
+    upload = redis.hgetall(_get_upload_key(upload_id))
+    if not upload:
+        raise ValueError(f"Upload with id {upload_id} was not found or has already expired")
+    return {key.decode(): value.decode() for key, value in upload.items()}
@@ -11,11 +11,13 @@ from ...core import (
     redis,
     minio,
     storage,
+    profiling,
     global_config,
     LockException,
     mongo_collection_models,
     service as core_service,
-    mongo_collection_datasets
+    mongo_collection_datasets,
+    mongo_collection_dataset_profiles
 )
 from ...core.models import (
     Dataset,
@@ -28,11 +30,23 @@ logger = logging.getLogger(__name__)
 class UploadingDatasetTask(Task):
     redis: Redis
     locked_task_expiration: int
+    md5: str
+    # Uploaded bytes or assembled upload loaded from storage, kept until task returns
+    file_data: bytes | None = None
 
     def before_start(self, task_id, args, kwargs) -> None:
+        file_data = kwargs.get("file_data")
+        if file_data is None:
+            logger.info(f"Loading uploaded dataset {kwargs['filename']!r} from storage")
+            file_data = storage.download_file(
+                minio_client=minio,
+                bucket_name=global_config.minio.preprocessed_datasets_bucket_name,
+                file_name=kwargs["object_name"]
+            )
+        self.file_data = file_data
         logger.info(f"Start calculating md5 hash for dataset {kwargs['filename']!r}")
         md5 = core_service.calculate_md5(
-            file_data=kwargs["file_data"],
+            file_data=file_data,
             chunk_size=global_config.minio.part_size
         )
         logger.info(f"Md5 hash for dataset {kwargs['filename']!r}: {md5!r}")
@@ -40,7 +54,7 @@ class UploadingDatasetTask(Task):
         if not status:
             logger.error(f"Dataset {kwargs['filename']!r} has already locked by another task")
             raise LockException()
-        setattr(self, 'md5', md5)
+        self.md5 = md5
 
     def on_success(self, retval, task_id, args, kwargs) -> None:
         self.redis.delete(self.md5)
@@ -50,6 +64,15 @@ class UploadingDatasetTask(Task):
             return
         self.redis.delete(self.md5)
 
+    def after_return(self, status, retval, task_id, args, kwargs, einfo) -> None:
+        self.file_data = None
+        if kwargs.get("object_name"):
+            storage.delete_file(
+                minio_client=minio,
+                bucket_name=global_config.minio.preprocessed_datasets_bucket_name,
+                file_name=kwargs["object_name"]
+            )
+
 
 @worker.celery.task(
     base=UploadingDatasetTask,
@@ -57,30 +80,50 @@ class UploadingDatasetTask(Task):
     redis=redis,
     locked_task_expiration=global_config.locked_task_expiration
 )
-def upload_dataset(self, file_data: bytes, filename: str) -> None:
+def upload_dataset(
+        self,
+        filename: str,
+        file_data: bytes | None = None,
+        object_name: str | None = None
+) -> None:
     logger.info(f"Start uploading dataset {filename!r}")
+    dataset_data: bytes = self.file_data
     if core_service.check_existing_file(md5=self.md5, collection=mongo_collection_datasets):
         raise FileExistsError(f"Dataset with md5 {self.md5} has already existed in database")
-    logger.info(f"Start calculating characteristics for dataset {filename!r}")
-    dataset_characteristics = service.get_dataset_characteristics(file_data=file_data)
+    logger.info(f"Start profiling dataset {filename!r}")
+    dataset_profile = profiling.calculate_dataset_profile(
+        md5=self.md5,
+        file_data=dataset_data,
+        chunk_size=global_config.dataset_chunk_size
+    )
+    dataset_characteristics = service.get_dataset_characteristics(profile=dataset_profile)
     logger.info(f"Characteristics for dataset {filename!r}: {dataset_characteristics}")
     dataset = Dataset(
         name=filename,
         md5=self.md5,
         created_at=datetime.datetime.now(tz=datetime.timezone(datetime.timedelta(hours=3))),
-        size=len(file_data),
+        size=len(dataset_data),
         samples=dataset_characteristics.samples,
         features=dataset_characteristics.features
     )
-    storage.upload_file(
-        minio_client=minio,
-        bucket_name=global_config.minio.preprocessed_datasets_bucket_name,
-        file_name=self.md5,
-        file_data=file_data,
-        part_size=global_config.minio.part_size
-    )
+    if object_name:
+        storage.copy_file(
+            minio_client=minio,
+            bucket_name=global_config.minio.preprocessed_datasets_bucket_name,
+            source_name=object_name,
+            file_name=self.md5
+        )
+    else:
+        storage.upload_file(
+            minio_client=minio,
+            bucket_name=global_config.minio.preprocessed_datasets_bucket_name,
+            file_name=self.md5,
+            file_data=dataset_data,
+            part_size=global_config.minio.part_size
+        )
     logger.info(f"Add dataset {filename!r} to database")
     mongo_collection_datasets.insert_one(dataset.model_dump())
+    mongo_collection_dataset_profiles.insert_one(dataset_profile.model_dump())
     logger.info(f"Dataset {filename!r} was uploaded to storage and added to database successfully")
 
 
@@ -106,6 +149,11 @@ def delete_dataset(id_: str) -> None:
     )
     md5 = dataset.md5
     core_service.delete_file(id_=id_, collection=mongo_collection_datasets)
+    core_service.delete_documents_by_query(
+        collection=mongo_collection_dataset_profiles,
+        field_name="md5",
+        value=md5
+    )
     logger.info(f"Dataset with id {id_!r} was deleted from database successfully")
     storage.delete_file(
         minio_client=minio,
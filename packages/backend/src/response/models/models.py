@@ -1,6 +1,22 @@
-from pydantic import BaseModel, Field
+from pydantic import (
+    Field,
+    BaseModel,
+    ValidationError,
+    model_validator
+)
 
-from ...core import AvailableAlgorithm
+from ...core import (
+    AvailableAlgorithm,
+    available_algorithms_params
+)
+from ...core.models import InferenceProfile
+from ...core.enums import (
+    Projection,
+    FeatureSelection
+)
+from ...core.boosting import BOOSTING_ALGORITHMS
+from ...core.distillation import DISTILLATION_ALGORITHMS
+from ...core.out_of_core import OUT_OF_CORE_ALGORITHMS
 
 
 class TrainingParams(BaseModel):
@@ -9,13 +25,164 @@ class TrainingParams(BaseModel):
     training_params: dict
     algorithm_name: AvailableAlgorithm
     training_data_proportion: float = Field(gt=0, lt=1)
+    cross_validation_folds: int | None = Field(default=None, ge=2, le=20)
+    early_stopping_rounds: int | None = Field(default=None, gt=0)
+    validation_proportion: float = Field(default=0.1, gt=0, lt=0.5)
+    out_of_core: bool = Field(
+        default=False,
+        description="Stream dataset from disk in chunks instead of loading it into memory"
+    )
+    feature_selection: FeatureSelection | None = Field(
+        default=None,
+        description="Method of pruning feature columns before training"
+    )
+    feature_selection_threshold: float | None = Field(
+        default=None,
+        ge=0,
+        description="Threshold of feature selection, default of selection method if not set"
+    )
+    projection: Projection | None = Field(
+        default=None,
+        description="Projection of features for KNN index in reduced space"
+    )
+    projection_components: int = Field(
+        default=32,
+        gt=0,
+        description="Number of dimensions of reduced space for KNN index"
+    )
+
+    @model_validator(mode="after")
+    def validate_training_params(self) -> "TrainingParams":
+        _validate_training_params(self.algorithm_name, self.training_params)
+        return self
+
+    @model_validator(mode="after")
+    def validate_early_stopping(self) -> "TrainingParams":
+        if self.early_stopping_rounds and self.algorithm_name not in BOOSTING_ALGORITHMS:
+            raise ValueError(
+                f"Early stopping is supported only for algorithms "
+                f"{[algorithm.value for algorithm in BOOSTING_ALGORITHMS]}"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def validate_projection(self) -> "TrainingParams":
+        if self.projection and self.algorithm_name != AvailableAlgorithm.K_NEAREST_NEIGHBORS:
+            raise ValueError(
+                f"Projection is supported only for algorithm "
+                f"{AvailableAlgorithm.K_NEAREST_NEIGHBORS.value}"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def validate_out_of_core(self) -> "TrainingParams":
+        if not self.out_of_core:
+            return self
+        if self.algorithm_name not in OUT_OF_CORE_ALGORITHMS:
+            raise ValueError(
+                f"Out-of-core training is supported only for algorithms "
+                f"{[algorithm.value for algorithm in OUT_OF_CORE_ALGORITHMS]}"
+            )
+        if self.cross_validation_folds or self.early_stopping_rounds or self.feature_selection:
+            raise ValueError(
+                "Out-of-core training can not be combined with cross-validation, "
+                "early stopping or feature selection"
+            )
+        return self
+
+
+class ModelSpec(BaseModel):
+    filename: str
+    training_params: dict
+    algorithm_name: AvailableAlgorithm
+
+    @model_validator(mode="after")
+    def validate_training_params(self) -> "ModelSpec":
+        _validate_training_params(self.algorithm_name, self.training_params)
+        return self
+
+
+class BatchTrainingParams(BaseModel):
+    dataset_id: str
+    models: list[ModelSpec] = Field(min_length=1)
+    training_data_proportion: float = Field(gt=0, lt=1)
+    max_workers: int | None = Field(default=None, gt=0)
+
+    @model_validator(mode="after")
+    def validate_filenames(self) -> "BatchTrainingParams":
+        filenames = [spec.filename for spec in self.models]
+        if len(set(filenames)) != len(filenames):
+            raise ValueError("Filenames of models in batch must be unique")
+        return self
+
+
+class RetrainingParams(BaseModel):
+    filename: str
+    dataset_id: str
+    training_data_proportion: float = Field(gt=0, lt=1)
+    additional_estimators: int = Field(
+        default=100,
+        gt=0,
+        description="Number of trees or boosting rounds added to ensemble models"
+    )
+
+
+class DistillationParams(BaseModel):
+    filename: str
+    dataset_id: str
+    teacher_ids: list[str] = Field(
+        min_length=2,
+        description="Ids of ensemble models whose majority vote is used as training target"
+    )
+    training_params: dict
+    algorithm_name: AvailableAlgorithm = AvailableAlgorithm.LIGHTGBM_CLASSIFIER
+    training_data_proportion: float = Field(gt=0, lt=1)
+
+    @model_validator(mode="after")
+    def validate_training_params(self) -> "DistillationParams":
+        _validate_training_params(self.algorithm_name, self.training_params)
+        return self
+
+    @model_validator(mode="after")
+    def validate_algorithm(self) -> "DistillationParams":
+        if self.algorithm_name not in DISTILLATION_ALGORITHMS:
+            raise ValueError(
+                f"Distillation is supported only into algorithms "
+                f"{[algorithm.value for algorithm in DISTILLATION_ALGORITHMS]}"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def validate_teacher_ids(self) -> "DistillationParams":
+        if len(set(self.teacher_ids)) != len(self.teacher_ids):
+            raise ValueError("Ids of ensemble models must be unique")
+        return self
 
 
 class TrainingStatistics(BaseModel):
     training_time: float
+    best_iteration: int | None = None
 
 
 class Metrics(BaseModel):
     accuracy: float
     precision: float
     recall: float
+    neighbors_recall: float | None = None
+    prediction_time: float | None = None
+    agreement_rate: float | None = None
+    inference_profile: InferenceProfile | None = None
+
+
+def _validate_training_params(algorithm_name: AvailableAlgorithm, training_params: dict) -> None:
+    # Params are checked on request, so invalid ones are not found only by training task
+    try:
+        available_algorithms_params[algorithm_name](**training_params)
+    except ValidationError as error:
+        messages = "; ".join(
+            f"{'.'.join(map(str, details['loc'])) or 'params'}: {details['msg']}"
+            for details in error.errors()
+        )
+        raise ValueError(
+            f"Invalid params of algorithm {algorithm_name.value}: {messages}"
+        ) from error
@@ -6,6 +6,7 @@ from fastapi import (
 )
 from fastapi.responses import (
     JSONResponse,
+    RedirectResponse,
     StreamingResponse
 )
 from fastapi_pagination.utils import disable_installed_extensions_check
@@ -16,10 +17,26 @@ from fastapi_pagination import (
 
 from . import tasks
 from . import service
-from ...core.models import ModelDTO
-from .models import TrainingParams
+from ... import worker
+from ...core import progress
+from ...core.models import (
+    ModelDTO,
+    TrainingProgress
+)
+from .models import (
+    TrainingParams,
+    RetrainingParams,
+    DistillationParams,
+    BatchTrainingParams
+)
+from ...core.enums import (
+    DownloadMode,
+    ModelSortField
+)
 from ...core import (
+    redis,
     minio,
+    minio_presigner,
     global_config,
     mongo_collection_models,
     mongo_collection_datasets
@@ -37,7 +54,15 @@ def train_model(params: TrainingParams) -> JSONResponse:
             "dataset_id": params.dataset_id,
             "training_params": params.training_params,
             "algorithm_name": params.algorithm_name,
-            "training_data_proportion": params.training_data_proportion
+            "training_data_proportion": params.training_data_proportion,
+            "cross_validation_folds": params.cross_validation_folds,
+            "early_stopping_rounds": params.early_stopping_rounds,
+            "validation_proportion": params.validation_proportion,
+            "out_of_core": params.out_of_core,
+            "feature_selection": params.feature_selection,
+            "feature_selection_threshold": params.feature_selection_threshold,
+            "projection": params.projection,
+            "projection_components": params.projection_components
         }
     )
     return JSONResponse(
@@ -49,18 +74,123 @@ def train_model(params: TrainingParams) -> JSONResponse:
     )
 
 
+@router.post(path="/batch", name="Обучить несколько моделей на одном наборе данных")
+def train_models(params: BatchTrainingParams) -> JSONResponse:
+    tasks.train_models.apply_async(
+        kwargs={
+            "dataset_id": params.dataset_id,
+            "models": [spec.model_dump() for spec in params.models],
+            "training_data_proportion": params.training_data_proportion,
+            "max_workers": params.max_workers
+        }
+    )
+    return JSONResponse(
+        status_code=status.HTTP_201_CREATED,
+        content={
+            "status": f"Training of models "
+                      f"{', '.join(spec.filename for spec in params.models)} is started"
+        }
+    )
+
+
+@router.post(path="/{id}/retrain", name="Дообучить модель на новых данных")
+def retrain_model(params: RetrainingParams, id_: str = Path(alias="id")) -> JSONResponse:
+    tasks.retrain_model.apply_async(
+        kwargs={
+            "filename": params.filename,
+            "model_id": id_,
+            "dataset_id": params.dataset_id,
+            "training_data_proportion": params.training_data_proportion,
+            "additional_estimators": params.additional_estimators
+        }
+    )
+    return JSONResponse(
+        status_code=status.HTTP_201_CREATED,
+        content={"status": f"Retraining of model {id_} on dataset {params.dataset_id} is started"}
+    )
+
+
+@router.post(path="/distill", name="Дистиллировать ансамбль моделей в одну модель")
+def distill_model(params: DistillationParams) -> JSONResponse:
+    tasks.distill_model.apply_async(
+        kwargs={
+            "filename": params.filename,
+            "dataset_id": params.dataset_id,
+            "teacher_ids": params.teacher_ids,
+            "training_params": params.training_params,
+            "algorithm_name": params.algorithm_name,
+            "training_data_proportion": params.training_data_proportion
+        }
+    )
+    return JSONResponse(
+        status_code=status.HTTP_201_CREATED,
+        content={
+            "status": f"Distillation of models {', '.join(params.teacher_ids)} into model "
+                      f"with algorithm {params.algorithm_name} is started"
+        }
+    )
+
+
+@router.get(
+    path="/training/{filename}",
+    name="Получить прогресс обучения модели",
+    response_model=TrainingProgress | None
+)
+def get_training_progress(filename: str) -> TrainingProgress | None:
+    return progress.get_progress(redis=redis, name=filename)
+
+
+@router.post(
+    path="/training/{filename}/cancel",
+    name="Отменить обучение модели",
+    response_model=None
+)
+def cancel_training(filename: str) -> JSONResponse:
+    state = service.cancel_training(
+        filename=filename,
+        redis=redis,
+        celery=worker.celery,
+        expiration=global_config.locked_task_expiration
+    )
+    if state is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"status": f"Training of model {filename} was not found"}
+        )
+    return JSONResponse(status_code=status.HTTP_200_OK, content=state.model_dump(mode="json"))
+
+
 @router.get(path="/", name="Получить модели", response_model=Page[ModelDTO])
-def get_models() -> Page[ModelDTO]:
+def get_models(
+        sort_by: ModelSortField | None = Query(default=None),
+        descending: bool = Query(default=False)
+) -> Page[ModelDTO]:
     return paginate(
         service.get_models(
             model_collection=mongo_collection_models,
-            dataset_collection=mongo_collection_datasets
+            dataset_collection=mongo_collection_datasets,
+            sort_by=sort_by,
+            descending=descending
         )
     )
 
 
-@router.get(path="/{id}/download", name="Скачать модель")
-def download_model(id_: str = Path(alias="id")) -> StreamingResponse:
+@router.get(path="/{id}/download", name="Скачать модель", response_model=None)
+def download_model(
+        id_: str = Path(alias="id"),
+        mode: DownloadMode = Query(default=DownloadMode.STREAM)
+) -> StreamingResponse | RedirectResponse | JSONResponse:
+    if mode != DownloadMode.STREAM:
+        link = service.get_model_download_link(
+            id_=id_,
+            minio=minio_presigner,
+            bucket_name=global_config.minio.trained_models_bucket_name,
+            collection=mongo_collection_models,
+            expiration=global_config.minio.presigned_url_expiration
+        )
+        if mode == DownloadMode.REDIRECT:
+            return RedirectResponse(url=link.url, status_code=status.HTTP_302_FOUND)
+        return JSONResponse(status_code=status.HTTP_200_OK, content=link.model_dump())
     file = service.download_model(
         id_=id_,
         minio=minio,
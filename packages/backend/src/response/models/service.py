@@ -1,14 +1,26 @@
 import time
 import pickle
 import logging
+import datetime
+import contextlib
 from io import BytesIO
+from typing import (
+    Any,
+    Iterator
+)
 from urllib.parse import quote
 
 import numpy as np
 import pandas as pd
+from redis import Redis
 from minio import Minio
+from celery import Celery
 from pymongo.collection import Collection
-from sklearn.model_selection import train_test_split
+from threadpoolctl import threadpool_limits
+from sklearn.model_selection import (
+    StratifiedKFold,
+    train_test_split
+)
 from sklearn.metrics import (
     recall_score,
     accuracy_score,
@@ -19,24 +31,58 @@ from ...core import service as core_service
 from ..classifications import service as classification_service
 from ...core import (
     TModel,
-    storage
+    cpu,
+    cache,
+    storage,
+    binning,
+    pruning,
+    neighbors,
+    boosting,
+    out_of_core,
+    progress,
+    inference_profiling,
+    incremental,
+    distillation,
+    AvailableAlgorithm,
+    available_algorithms_params,
+    ALGORITHM_CLASS_BY_NAME_MAPPING
+)
+from ...core.config import CacheConfig
+from ...core.progress import ProgressReporter
+from ...core.enums import (
+    JobStatus,
+    Projection,
+    ModelSortField
 )
 from .models import (
     Metrics,
     TrainingStatistics
 )
 from ...core.models import (
+    Model,
     ModelDTO,
+    DatasetSplit,
+    DatasetArrays,
     FileContent,
+    DownloadLink,
     ModelDocument,
     DatasetDocument,
-    ClassificationDocument
+    InferenceProfile,
+    TrainingProgress,
+    ClassificationDocument,
+    CrossValidationMetrics,
+    DATETIME_FORMAT
 )
 
 logger = logging.getLogger(__name__)
 
 
-def get_models(model_collection: Collection, dataset_collection: Collection) -> list[ModelDTO]:
+def get_models(
+        model_collection: Collection,
+        dataset_collection: Collection,
+        sort_by: ModelSortField | None = None,
+        descending: bool = False
+) -> list[ModelDTO]:
     model_documents = core_service.get_documents(
         document_class=ModelDocument,
         collection=model_collection
@@ -62,6 +108,8 @@ def get_models(model_collection: Collection, dataset_collection: Collection) ->
         else:
             dataset_name = dataset_documents[model_document.dataset_id].name
         models.append(ModelDTO(**model_document.model_dump(), dataset_name=dataset_name))
+    if sort_by:
+        models = _sort_models(models=models, sort_by=sort_by, descending=descending)
     return models
 
 
@@ -86,39 +134,514 @@ def download_model(
     )
 
 
-def split_dataset(
-        dataset_data: BytesIO,
-        training_data_proportion: float
-) -> tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
-    dataframe = pd.read_csv(filepath_or_buffer=dataset_data)
-    x, y = dataframe.iloc[:, :-1], dataframe.iloc[:, -1]
-    return train_test_split(x, y, train_size=training_data_proportion, random_state=42)
+def get_model_download_link(
+        id_: str,
+        minio: Minio,
+        bucket_name: str,
+        collection: Collection,
+        expiration: int
+) -> DownloadLink:
+    model = core_service.get_document_by_id(
+        id_=id_,
+        collection=collection,
+        document_class=ModelDocument
+    )
+    filename = quote(model.name)
+    return DownloadLink(
+        url=storage.get_presigned_url(
+            minio_client=minio,
+            bucket_name=bucket_name,
+            file_name=model.md5,
+            filename=model.name,
+            expiration=expiration
+        ),
+        filename=filename,
+        expires_in=expiration
+    )
+
+
+def load_dataset(
+        dataset: DatasetDocument,
+        minio: Minio,
+        bucket_name: str,
+        cache_config: CacheConfig,
+        reporter: ProgressReporter | None = None
+) -> DatasetArrays:
+    def download() -> bytes:
+        with reporter.stage("download") if reporter else contextlib.nullcontext():
+            return storage.download_file(
+                minio_client=minio,
+                bucket_name=bucket_name,
+                file_name=dataset.md5
+            )
 
+    with reporter.stage("parse") if reporter else contextlib.nullcontext():
+        return cache.load_dataset(
+            md5=dataset.md5,
+            cache_dir_path=cache_config.dir_path,
+            max_size=cache_config.max_size,
+            loader=download
+        )
 
-def train_model(
+
+def stream_dataset(
+        dataset: DatasetDocument,
+        minio: Minio,
+        bucket_name: str,
+        cache_config: CacheConfig,
+        chunk_size: int,
+        reporter: ProgressReporter | None = None
+) -> DatasetArrays:
+    def read_chunks() -> Iterator[pd.DataFrame]:
+        with storage.open_file_stream(
+            minio_client=minio,
+            bucket_name=bucket_name,
+            file_name=dataset.md5
+        ) as file:
+            yield from pd.read_csv(filepath_or_buffer=file, chunksize=chunk_size)
+
+    # Download and parsing are interleaved, so they are reported as one stage
+    with reporter.stage("parse") if reporter else contextlib.nullcontext():
+        return cache.load_dataset_streaming(
+            md5=dataset.md5,
+            cache_dir_path=cache_config.dir_path,
+            max_size=cache_config.max_size,
+            samples=dataset.samples,
+            chunks=read_chunks
+        )
+
+
+def train_model_out_of_core(
         model: TModel,
-        x_train: pd.DataFrame,
-        y_train: pd.Series
+        dataset: DatasetArrays,
+        train_indices: np.ndarray,
+        chunk_size: int,
+        cache_dir_path: str,
+        reporter: ProgressReporter | None = None
 ) -> tuple[TModel, TrainingStatistics]:
     start_time = time.time()
-    model.fit(x_train.to_numpy(), y_train.to_numpy())
+    model = out_of_core.fit_out_of_core(
+        model=model,
+        x=dataset.x,
+        y=dataset.y,
+        train_indices=train_indices,
+        chunk_size=chunk_size,
+        cache_dir_path=cache_dir_path,
+        reporter=reporter
+    )
     end_time = time.time()
     return model, TrainingStatistics(training_time=np.round(end_time - start_time, 6))
 
 
-def calculate_metrics(model: TModel, x_test: pd.DataFrame, y_test: pd.Series) -> Metrics:
-    y_pred = model.predict(x_test.to_numpy())
+def sample_test_data(
+        dataset: DatasetArrays,
+        test_indices: np.ndarray,
+        max_samples: int,
+        random_state: int
+) -> tuple[np.ndarray, np.ndarray]:
+    test_indices = out_of_core.sample_test_indices(
+        test_indices=test_indices,
+        max_samples=max_samples,
+        random_state=random_state
+    )
+    return dataset.x[test_indices], dataset.y[test_indices]
+
+
+def train_model(
+        model: TModel,
+        x_train: np.ndarray,
+        y_train: np.ndarray,
+        early_stopping_rounds: int | None = None,
+        validation_proportion: float = 0.1,
+        random_state: int | None = None,
+        binned_path_prefix: str | None = None,
+        reporter: ProgressReporter | None = None
+) -> tuple[TModel, TrainingStatistics]:
+    start_time = time.time()
+    best_iteration = None
+    callbacks = reporter.get_callbacks(model) if reporter else None
+    if early_stopping_rounds is None and binned_path_prefix and binning.supports_binning(model):
+        model = binning.fit_binned(
+            model=model,
+            x_train=x_train,
+            y_train=y_train,
+            path_prefix=binned_path_prefix,
+            callbacks=callbacks
+        )
+    elif early_stopping_rounds is None:
+        model = boosting.fit_with_callbacks(
+            model=model,
+            x_train=x_train,
+            y_train=y_train,
+            callbacks=callbacks
+        )
+    else:
+        x_fit, x_valid, y_fit, y_valid = train_test_split(
+            x_train,
+            y_train,
+            test_size=validation_proportion,
+            stratify=y_train,
+            random_state=random_state
+        )
+        best_iteration = boosting.fit_with_early_stopping(
+            model=model,
+            x_train=x_fit,
+            y_train=y_fit,
+            x_valid=x_valid,
+            y_valid=y_valid,
+            rounds=early_stopping_rounds,
+            callbacks=callbacks
+        )
+        logger.info(f"Boosting was stopped early, best iteration is {best_iteration}")
+    end_time = time.time()
+    return model, TrainingStatistics(
+        training_time=np.round(end_time - start_time, 6),
+        best_iteration=best_iteration
+    )
+
+
+def calculate_metrics(
+        model: TModel,
+        x_test: np.ndarray,
+        y_test: np.ndarray,
+        x_train: np.ndarray | None = None
+) -> Metrics:
+    """Evaluate model on test data, projected KNN is also checked against exact search."""
+    start_time = time.time()
+    y_pred = model.predict(x_test)
+    end_time = time.time()
+    neighbors_recall = None
+    if x_train is not None and neighbors.is_projected_knn(model):
+        neighbors_recall = neighbors.calculate_neighbors_recall(
+            model=model,
+            x_train=x_train,
+            x_test=x_test
+        )
     return Metrics(
         accuracy=np.round(accuracy_score(y_test, y_pred), 6),
         precision=np.round(precision_score(y_test, y_pred), 6),
-        recall=np.round(recall_score(y_test, y_pred), 6)
+        recall=np.round(recall_score(y_test, y_pred), 6),
+        neighbors_recall=neighbors_recall,
+        prediction_time=np.round(end_time - start_time, 6)
+    )
+
+
+def profile_model(
+        model: TModel,
+        x_test: np.ndarray,
+        samples: int,
+        single_rows: int
+) -> InferenceProfile:
+    logger.info(f"Benchmark inference of model on {min(samples, len(x_test))} test rows")
+    return inference_profiling.profile_inference(
+        serialized_model=serialize_model(model=model),
+        x=np.asarray(x_test[:samples]),
+        single_rows=single_rows
     )
 
 
+def create_model(
+        algorithm_name: AvailableAlgorithm,
+        training_params: dict,
+        threads: int | None = None,
+        projection: Projection | None = None,
+        projection_components: int = 32,
+        random_state: int | None = None
+) -> Any:
+    model = ALGORITHM_CLASS_BY_NAME_MAPPING[algorithm_name](
+        **available_algorithms_params[algorithm_name](**training_params).model_dump(),
+        **cpu.get_thread_params(algorithm_name=algorithm_name, threads=threads)
+    )
+    if projection:
+        return neighbors.build_projected_knn(
+            model=model,
+            projection=projection,
+            components=projection_components,
+            random_state=random_state
+        )
+    return model
+
+
 def serialize_model(model: TModel) -> bytes:
     return pickle.dumps(model)
 
 
+def load_model(model: ModelDocument, minio: Minio, bucket_name: str) -> Any:
+    logger.info(f"Load model with md5 {model.md5!r} from storage")
+    return pickle.loads(storage.download_file(
+        minio_client=minio,
+        bucket_name=bucket_name,
+        file_name=model.md5
+    ))
+
+
+def retrain_model(
+        model: TModel,
+        algorithm_name: AvailableAlgorithm,
+        x_train: np.ndarray,
+        y_train: np.ndarray,
+        additional_estimators: int,
+        threads: int
+) -> tuple[TModel, TrainingStatistics]:
+    start_time = time.time()
+    with threadpool_limits(limits=threads):
+        model = cpu.set_model_threads(model=model, algorithm_name=algorithm_name, threads=threads)
+        retrained_model = incremental.update_model(
+            model=model,
+            x=x_train,
+            y=y_train,
+            additional_estimators=additional_estimators
+        )
+    end_time = time.time()
+    return retrained_model, TrainingStatistics(training_time=np.round(end_time - start_time, 6))
+
+
+def label_with_ensemble(
+        teachers: list[tuple[ModelDocument, TModel]],
+        x: np.ndarray,
+        chunk_size: int
+) -> np.ndarray:
+    """Label rows with majority vote of ensemble models, predicting chunk by chunk."""
+    votes = []
+    for i in range(0, len(x), chunk_size):
+        x_chunk = x[i:i + chunk_size]
+        votes.append(distillation.vote([
+            model.predict(pruning.apply_mask(x=x_chunk, feature_mask=teacher.feature_mask))
+            for teacher, model in teachers
+        ]))
+    return np.concatenate(votes) if votes else np.empty(0, dtype=np.int8)
+
+
+def get_model_md5(serialized_model: bytes, collection: Collection, part_size: int) -> str:
+    md5 = core_service.calculate_md5(file_data=serialized_model, chunk_size=part_size)
+    logger.info(f"Got md5 {md5!r} for serialized model")
+    if core_service.check_existing_file(md5=md5, collection=collection):
+        logger.error(f"Model with md5 {md5!r} has already existed in database")
+        raise FileExistsError(f"Model with md5 {md5!r} has already existed in database")
+    return md5
+
+
+def save_model(
+        model: Model,
+        serialized_model: bytes,
+        minio: Minio,
+        bucket_name: str,
+        collection: Collection,
+        part_size: int
+) -> str:
+    storage.upload_file(
+        minio_client=minio,
+        bucket_name=bucket_name,
+        file_name=model.md5,
+        file_data=serialized_model,
+        part_size=part_size
+    )
+    logger.info(f"Add model with md5 {model.md5!r} to database")
+    result = collection.insert_one(model.model_dump())
+    logger.info(
+        f"Model with md5 {model.md5!r} and filename {model.name!r} "
+        f"was uploaded to storage and saved to database successfully"
+    )
+    return str(result.inserted_id)
+
+
+def fit_model(
+        algorithm_name: AvailableAlgorithm,
+        training_params: dict,
+        md5: str,
+        cache_dir_path: str,
+        split: DatasetSplit,
+        threads: int,
+        early_stopping_rounds: int | None = None,
+        validation_proportion: float = 0.1,
+        random_state: int | None = None,
+        feature_mask: bytes | None = None,
+        projection: Projection | None = None,
+        projection_components: int = 32,
+        profile_samples: int | None = None,
+        profile_single_rows: int = 200
+) -> tuple[TModel, TrainingStatistics, Metrics]:
+    """Train and evaluate model on cached dataset, used in child processes of worker."""
+    dataset = cache.open_dataset(md5=md5, cache_dir_path=cache_dir_path)
+    x_train = pruning.apply_mask(x=dataset.x[split.train_indices], feature_mask=feature_mask)
+    x_test = pruning.apply_mask(x=dataset.x[split.test_indices], feature_mask=feature_mask)
+    with threadpool_limits(limits=threads):
+        trained_model, training_statistics = train_model(
+            model=create_model(
+                algorithm_name=algorithm_name,
+                training_params=training_params,
+                threads=threads,
+                projection=projection,
+                projection_components=projection_components,
+                random_state=random_state
+            ),
+            x_train=x_train,
+            y_train=dataset.y[split.train_indices],
+            early_stopping_rounds=early_stopping_rounds,
+            validation_proportion=validation_proportion,
+            random_state=random_state
+        )
+        metrics = calculate_metrics(
+            model=trained_model,
+            x_test=x_test,
+            y_test=dataset.y[split.test_indices],
+            x_train=x_train
+        )
+        if profile_samples:
+            metrics.inference_profile = profile_model(
+                model=trained_model,
+                x_test=x_test,
+                samples=profile_samples,
+                single_rows=profile_single_rows
+            )
+    return trained_model, training_statistics, metrics
+
+
+def get_cross_validation_folds(
+        split: DatasetSplit,
+        y: np.ndarray,
+        folds: int,
+        random_state: int
+) -> list[DatasetSplit]:
+    """Split training indices into stratified folds, test indices are never used for them."""
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=random_state)
+    y_train = y[split.train_indices]
+    return [
+        DatasetSplit(
+            train_indices=split.train_indices[fold_train_indices],
+            test_indices=split.train_indices[fold_test_indices]
+        )
+        for fold_train_indices, fold_test_indices in splitter.split(
+            np.zeros((len(y_train), 1)),
+            y_train
+        )
+    ]
+
+
+def evaluate_fold(
+        algorithm_name: AvailableAlgorithm,
+        training_params: dict,
+        md5: str,
+        cache_dir_path: str,
+        split: DatasetSplit,
+        threads: int,
+        early_stopping_rounds: int | None = None,
+        validation_proportion: float = 0.1,
+        random_state: int | None = None,
+        feature_mask: bytes | None = None,
+        projection: Projection | None = None,
+        projection_components: int = 32
+) -> Metrics:
+    """Fit model on one fold in child process of worker and return only its metrics."""
+    _, _, metrics = fit_model(
+        algorithm_name=algorithm_name,
+        training_params=training_params,
+        md5=md5,
+        cache_dir_path=cache_dir_path,
+        split=split,
+        threads=threads,
+        early_stopping_rounds=early_stopping_rounds,
+        validation_proportion=validation_proportion,
+        random_state=random_state,
+        feature_mask=feature_mask,
+        projection=projection,
+        projection_components=projection_components
+    )
+    return metrics
+
+
+def summarize_cross_validation(fold_metrics: list[Metrics]) -> CrossValidationMetrics:
+    summary = {}
+    for name in ("accuracy", "precision", "recall"):
+        values = np.array([getattr(metrics, name) for metrics in fold_metrics])
+        summary[f"{name}_mean"] = np.round(values.mean(), 6)
+        summary[f"{name}_std"] = np.round(values.std(), 6)
+    return CrossValidationMetrics(folds=len(fold_metrics), **summary)
+
+
+def register_model(
+        trained_model: TModel,
+        filename: str,
+        dataset_id: str,
+        algorithm_name: AvailableAlgorithm,
+        training_params: dict,
+        training_data_proportion: float,
+        training_statistics: TrainingStatistics,
+        metrics: Metrics,
+        minio: Minio,
+        bucket_name: str,
+        collection: Collection,
+        part_size: int,
+        cross_validation: CrossValidationMetrics | None = None,
+        parent: ModelDocument | None = None,
+        feature_mask: bytes | None = None,
+        teacher_ids: list[str] | None = None
+) -> str:
+    logger.info(f"Serialize model of algorithm {algorithm_name!r}")
+    serialized_model = serialize_model(model=trained_model)
+    md5 = get_model_md5(
+        serialized_model=serialized_model,
+        collection=collection,
+        part_size=part_size
+    )
+    model = Model(
+        name=filename,
+        dataset_id=dataset_id,
+        md5=md5,
+        algorithm=algorithm_name,
+        parent_id=parent.id if parent else None,
+        version=parent.version + 1 if parent else 1,
+        teacher_ids=teacher_ids,
+        created_at=datetime.datetime.now(tz=datetime.timezone(datetime.timedelta(hours=3))),
+        training_time=training_statistics.training_time,
+        best_iteration=training_statistics.best_iteration,
+        training_data_proportion=training_data_proportion,
+        parameters=training_params,
+        features=pruning.count_features(feature_mask) if feature_mask else None,
+        feature_mask=feature_mask,
+        accuracy=metrics.accuracy,
+        precision=metrics.precision,
+        recall=metrics.recall,
+        neighbors_recall=metrics.neighbors_recall,
+        agreement_rate=metrics.agreement_rate,
+        prediction_time=metrics.prediction_time,
+        cross_validation=cross_validation,
+        inference_profile=metrics.inference_profile
+    )
+    return save_model(
+        model=model,
+        serialized_model=serialized_model,
+        minio=minio,
+        bucket_name=bucket_name,
+        collection=collection,
+        part_size=part_size
+    )
+
+
+def cancel_training(
+        filename: str,
+        redis: Redis,
+        celery: Celery,
+        expiration: int
+) -> TrainingProgress | None:
+    state = progress.get_progress(redis=redis, name=filename)
+    if state is None or state.status != JobStatus.RUNNING:
+        return state
+    logger.info(f"Request cancel of training model {filename!r} at stage {state.stage!r}")
+    progress.request_cancel(redis=redis, name=filename, expiration=expiration)
+    if state.stage == "fit" and not state.interruptible and state.task_id:
+        # Fit without iteration callbacks never checks cancel flag,
+        # so worker process is terminated and its lock is released here
+        logger.info(f"Terminate training task {state.task_id!r}")
+        celery.control.revoke(state.task_id, terminate=True)
+        redis.delete(filename)
+        progress.ProgressReporter(redis=redis, name=filename, expiration=expiration).finish(
+            task_id=state.task_id,
+            status=JobStatus.CANCELLED
+        )
+    return progress.get_progress(redis=redis, name=filename)
+
+
 def delete_related_classifications(
         model: ModelDocument,
         classifications_collection: Collection,
@@ -172,3 +695,32 @@ def delete_related_classifications(
         f"Common classifications were updated successfully for commands "
         f"in deleted related classifications with trained model {model.name}"
     )
+
+
+def _sort_models(
+        models: list[ModelDTO],
+        sort_by: ModelSortField,
+        descending: bool
+) -> list[ModelDTO]:
+    def get_value(model: ModelDTO) -> float | None:
+        if sort_by.value in ModelDTO.model_fields:
+            value = getattr(model, sort_by.value)
+        elif model.inference_profile is None:
+            return None
+        else:
+            value = getattr(model.inference_profile, sort_by.value)
+        if value is None:
+            return None
+        if sort_by == ModelSortField.CREATED_AT:
+            # Creation time of document is serialized into string by its model
+            return datetime.datetime.strptime(value, DATETIME_FORMAT).timestamp()
+        return float(value)
+
+    def get_key(model: ModelDTO) -> tuple[bool, float]:
+        # Models without value of field are placed last in both directions
+        value = get_value(model)
+        if value is None:
+            return True, 0.0
+        return False, -value if descending else value
+
+    return sorted(models, key=get_key)
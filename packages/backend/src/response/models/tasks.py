@@ -1,33 +1,56 @@
-import datetime
 import logging
-from io import BytesIO
+import contextlib
+from concurrent.futures import (
+    Future,
+    wait,
+    as_completed
+)
 
+import numpy as np
 from celery import Task
 from redis import Redis
+from threadpoolctl import threadpool_limits
 
 from . import service
 from ... import worker
-from ...core.enums import Extension
+from .models import (
+    Metrics,
+    ModelSpec,
+    TrainingStatistics
+)
+from ...core.enums import (
+    JobStatus,
+    Extension,
+    Projection,
+    FeatureSelection
+)
 from ...core.tasks import DeletingTask
+from ...core.progress import ProgressReporter
+from ...core.incremental import INCREMENTAL_ALGORITHMS
 from ...core import (
+    cpu,
+    TModel,
     redis,
+    cache,
+    pruning,
     minio,
+    distillation,
     storage,
+    parallel,
     LockException,
     global_config,
+    TrainingCancelledException,
     AvailableAlgorithm,
     service as core_service,
     mongo_collection_models,
     mongo_collection_datasets,
-    available_algorithms_params,
-    ALGORITHM_CLASS_BY_NAME_MAPPING,
     mongo_collection_classifications,
     mongo_collection_common_classifications
 )
 from ...core.models import (
-    Model,
     ModelDocument,
-    DatasetDocument
+    DatasetDocument,
+    CrossValidationMetrics
 )
 
 logger = logging.getLogger(__name__)
@@ -54,14 +77,27 @@ class TrainingModelTask(Task):
                 f"Model with name {kwargs['filename']!r} has already locked by another task"
             )
             raise LockException()
+        self._get_reporter(kwargs).start(task_id)
 
     def on_success(self, retval, task_id, args, kwargs) -> None:
         redis.delete(kwargs["filename"])
+        self._get_reporter(kwargs).finish(task_id, JobStatus.COMPLETED)
 
     def on_failure(self, exc, task_id, args, kwargs, einfo) -> None:
         if isinstance(exc, LockException):
             return
         redis.delete(kwargs["filename"])
+        self._get_reporter(kwargs).finish(
+            task_id,
+            JobStatus.CANCELLED if isinstance(exc, TrainingCancelledException) else JobStatus.FAILED
+        )
+
+    def _get_reporter(self, kwargs: dict) -> ProgressReporter:
+        return ProgressReporter(
+            redis=self.redis,
+            name=kwargs["filename"],
+            expiration=self.locked_task_expiration
+        )
 
 
 @worker.celery.task(
@@ -74,9 +110,22 @@ def train_model(
         dataset_id: str,
         training_params: dict,
         algorithm_name: AvailableAlgorithm,
-        training_data_proportion: float
+        training_data_proportion: float,
+        cross_validation_folds: int | None = None,
+        early_stopping_rounds: int | None = None,
+        validation_proportion: float = 0.1,
+        out_of_core: bool = False,
+        feature_selection: FeatureSelection | None = None,
+        feature_selection_threshold: float | None = None,
+        projection: Projection | None = None,
+        projection_components: int = 32
 ) -> None:
     logger.info(f"Start training model of algorithm {algorithm_name!r} for dataset {dataset_id!r}")
+    reporter = ProgressReporter(
+        redis=redis,
+        name=filename,
+        expiration=global_config.locked_task_expiration
+    )
     logger.info(f"Start searching for dataset with id {dataset_id!r} in database")
     dataset = core_service.get_document_by_id(
         id_=dataset_id,
@@ -88,65 +137,641 @@ def train_model(
         f"Found dataset with id {dataset_id!r} in database: "
         f"md5 {dataset.md5!r}, filename {dataset.name!r}"
     )
-    dataset_data = storage.download_file(
-        minio_client=minio,
+    if out_of_core:
+        trained_model, training_statistics, metrics = _train_model_out_of_core(
+            dataset=dataset,
+            algorithm_name=algorithm_name,
+            training_params=training_params,
+            training_data_proportion=training_data_proportion,
+            reporter=reporter
+        )
+        cross_validation = feature_mask = None
+    else:
+        (
+            trained_model,
+            training_statistics,
+            metrics,
+            cross_validation,
+            feature_mask
+        ) = _train_model_in_memory(
+            dataset=dataset,
+            algorithm_name=algorithm_name,
+            training_params=training_params,
+            training_data_proportion=training_data_proportion,
+            cross_validation_folds=cross_validation_folds,
+            early_stopping_rounds=early_stopping_rounds,
+            validation_proportion=validation_proportion,
+            feature_selection=feature_selection,
+            feature_selection_threshold=feature_selection_threshold,
+            projection=projection,
+            projection_components=projection_components,
+            reporter=reporter
+        )
+    with reporter.stage("upload"):
+        service.register_model(
+            trained_model=trained_model,
+            filename=filename,
+            dataset_id=dataset.id,
+            algorithm_name=algorithm_name,
+            training_params=training_params,
+            training_data_proportion=training_data_proportion,
+            training_statistics=training_statistics,
+            metrics=metrics,
+            minio=minio,
+            bucket_name=global_config.minio.trained_models_bucket_name,
+            collection=mongo_collection_models,
+            part_size=global_config.minio.part_size,
+            cross_validation=cross_validation,
+            feature_mask=feature_mask
+        )
+
+
+def _train_model_in_memory(
+        dataset: DatasetDocument,
+        algorithm_name: AvailableAlgorithm,
+        training_params: dict,
+        training_data_proportion: float,
+        cross_validation_folds: int | None,
+        early_stopping_rounds: int | None,
+        validation_proportion: float,
+        feature_selection: FeatureSelection | None,
+        feature_selection_threshold: float | None,
+        projection: Projection | None,
+        projection_components: int,
+        reporter: ProgressReporter
+) -> tuple[TModel, TrainingStatistics, Metrics, CrossValidationMetrics | None, bytes | None]:
+    dataset_arrays = service.load_dataset(
+        dataset=dataset,
+        minio=minio,
         bucket_name=global_config.minio.preprocessed_datasets_bucket_name,
-        file_name=dataset.md5
+        cache_config=global_config.cache,
+        reporter=reporter
     )
     logger.info(
         f"Split dataset for training and testing with proportion {training_data_proportion}"
     )
-    x_train, x_test, y_train, y_test = service.split_dataset(
-        dataset_data=BytesIO(dataset_data),
-        training_data_proportion=training_data_proportion
-    )
-    algorithm_model = ALGORITHM_CLASS_BY_NAME_MAPPING[algorithm_name](
-        **available_algorithms_params[algorithm_name](**training_params).model_dump()
-    )
-    logger.info(f"Train model of algorithm {algorithm_name!r}")
-    trained_model, training_statistics = service.train_model(
-        model=algorithm_model,
-        x_train=x_train,
-        y_train=y_train
-    )
-    logger.info(f"Serialize model of algorithm {algorithm_name!r}")
-    serialized_model = service.serialize_model(model=trained_model)
-    md5 = core_service.calculate_md5(
-        file_data=serialized_model,
-        chunk_size=global_config.minio.part_size
-    )
-    logger.info(f"Got md5 {md5!r} for serialized model")
-    if core_service.check_existing_file(md5=md5, collection=mongo_collection_models):
-        logger.error(f"Model with md5 {md5!r} has already existed in database")
-        raise FileExistsError(f"Model with md5 {md5!r} has already existed in database")
-    logger.info(f"Calculate metrics for model with md5 {md5!r}")
-    metrics = service.calculate_metrics(model=trained_model, x_test=x_test, y_test=y_test)
-    model = Model(
-        name=filename,
-        dataset_id=dataset.id,
-        md5=md5,
-        algorithm=algorithm_name,
-        created_at=datetime.datetime.now(tz=datetime.timezone(datetime.timedelta(hours=3))),
-        training_time=training_statistics.training_time,
+    with reporter.stage("split"):
+        split = cache.load_split(
+            md5=dataset.md5,
+            cache_dir_path=global_config.cache.dir_path,
+            samples=len(dataset_arrays.y),
+            training_data_proportion=training_data_proportion,
+            random_state=global_config.split_random_state
+        )
+        x_train = dataset_arrays.x[split.train_indices]
+        x_test = dataset_arrays.x[split.test_indices]
+        y_train = dataset_arrays.y[split.train_indices]
+        y_test = dataset_arrays.y[split.test_indices]
+    cross_validation = feature_mask = None
+    with cpu.allocate_threads(
+        redis=redis,
+        budget=global_config.cpu_budget,
+        requested=global_config.cpu_threads_per_task,
+        expiration=global_config.locked_task_expiration
+    ) as threads:
+        if feature_selection:
+            logger.info(f"Select features of dataset with {feature_selection.value} selection")
+            with reporter.stage("feature_selection"):
+                mask = pruning.select_features(
+                    x=x_train,
+                    y=y_train,
+                    selection=feature_selection,
+                    threshold=feature_selection_threshold,
+                    chunk_size=global_config.training_chunk_size,
+                    random_state=global_config.split_random_state,
+                    threads=threads
+                )
+            x_train, x_test = x_train[:, mask], x_test[:, mask]
+            feature_mask = pruning.encode_mask(mask)
+        binned_path_prefix = cache.get_binned_path_prefix(
+            md5=dataset.md5,
+            cache_dir_path=global_config.cache.dir_path,
+            training_data_proportion=training_data_proportion,
+            random_state=global_config.split_random_state,
+            feature_mask=feature_mask
+        )
+        if not cross_validation_folds:
+            trained_model, training_statistics, metrics = _fit_final_model(
+                algorithm_name=algorithm_name,
+                training_params=training_params,
+                x_train=x_train,
+                x_test=x_test,
+                y_train=y_train,
+                y_test=y_test,
+                threads=threads,
+                early_stopping_rounds=early_stopping_rounds,
+                validation_proportion=validation_proportion,
+                binned_path_prefix=binned_path_prefix,
+                projection=projection,
+                projection_components=projection_components,
+                reporter=reporter
+            )
+        else:
+            folds = service.get_cross_validation_folds(
+                split=split,
+                y=dataset_arrays.y,
+                folds=cross_validation_folds,
+                random_state=global_config.split_random_state
+            )
+            # Folds are fitted in child processes while final model is refitted
+            # in worker process, so cross-validation does not delay registration much.
+            # Final model takes threads left by folds, and with a single leased thread
+            # it waits for folds instead of oversubscribing the budget
+            processes = min(cross_validation_folds, max(1, threads - 1))
+            threads_per_fold = max(1, threads // (processes + 1))
+            final_threads = threads - processes * threads_per_fold
+            logger.info(
+                f"Evaluate {cross_validation_folds} folds in {processes} processes "
+                f"with {threads_per_fold} threads each"
+            )
+            with parallel.get_process_pool(max_workers=processes) as executor:
+                futures = [
+                    executor.submit(
+                        service.evaluate_fold,
+                        algorithm_name=algorithm_name,
+                        training_params=training_params,
+                        md5=dataset.md5,
+                        cache_dir_path=global_config.cache.dir_path,
+                        split=fold,
+                        threads=threads_per_fold,
+                        early_stopping_rounds=early_stopping_rounds,
+                        validation_proportion=validation_proportion,
+                        random_state=global_config.split_random_state,
+                        feature_mask=feature_mask,
+                        projection=projection,
+                        projection_components=projection_components
+                    ) for fold in folds
+                ]
+                if final_threads < 1:
+                    wait(futures)
+                trained_model, training_statistics, metrics = _fit_final_model(
+                    algorithm_name=algorithm_name,
+                    training_params=training_params,
+                    x_train=x_train,
+                    x_test=x_test,
+                    y_train=y_train,
+                    y_test=y_test,
+                    threads=max(1, final_threads),
+                    early_stopping_rounds=early_stopping_rounds,
+                    validation_proportion=validation_proportion,
+                    binned_path_prefix=binned_path_prefix,
+                    projection=projection,
+                    projection_components=projection_components,
+                    reporter=reporter
+                )
+                with reporter.stage("cross_validation"):
+                    cross_validation = service.summarize_cross_validation(
+                        fold_metrics=[future.result() for future in futures]
+                    )
+            logger.info(f"Cross-validation of model finished: {cross_validation}")
+    return trained_model, training_statistics, metrics, cross_validation, feature_mask
+
+
+def _train_model_out_of_core(
+        dataset: DatasetDocument,
+        algorithm_name: AvailableAlgorithm,
+        training_params: dict,
+        training_data_proportion: float,
+        reporter: ProgressReporter
+) -> tuple[TModel, TrainingStatistics, Metrics]:
+    dataset_arrays = service.stream_dataset(
+        dataset=dataset,
+        minio=minio,
+        bucket_name=global_config.minio.preprocessed_datasets_bucket_name,
+        cache_config=global_config.cache,
+        chunk_size=global_config.training_chunk_size,
+        reporter=reporter
+    )
+    with reporter.stage("split"):
+        split = cache.load_split(
+            md5=dataset.md5,
+            cache_dir_path=global_config.cache.dir_path,
+            samples=len(dataset_arrays.y),
+            training_data_proportion=training_data_proportion,
+            random_state=global_config.split_random_state
+        )
+    with cpu.allocate_threads(
+        redis=redis,
+        budget=global_config.cpu_budget,
+        requested=global_config.cpu_threads_per_task,
+        expiration=global_config.locked_task_expiration
+    ) as threads:
+        logger.info(
+            f"Train model of algorithm {algorithm_name!r} out of core "
+            f"in chunks of {global_config.training_chunk_size} rows with {threads} threads"
+        )
+        with reporter.stage("fit"):
+            trained_model, training_statistics = service.train_model_out_of_core(
+                model=service.create_model(
+                    algorithm_name=algorithm_name,
+                    training_params=training_params,
+                    threads=threads
+                ),
+                dataset=dataset_arrays,
+                train_indices=split.train_indices,
+                chunk_size=global_config.training_chunk_size,
+                cache_dir_path=global_config.cache.dir_path,
+                reporter=reporter
+            )
+        with reporter.stage("metrics"):
+            x_test, y_test = service.sample_test_data(
+                dataset=dataset_arrays,
+                test_indices=split.test_indices,
+                max_samples=global_config.max_test_samples,
+                random_state=global_config.split_random_state
+            )
+            logger.info(f"Calculate metrics on {len(y_test)} sampled test rows")
+            metrics = service.calculate_metrics(model=trained_model, x_test=x_test, y_test=y_test)
+            metrics.inference_profile = service.profile_model(
+                model=trained_model,
+                x_test=x_test,
+                samples=global_config.profile_samples,
+                single_rows=global_config.profile_single_rows
+            )
+    return trained_model, training_statistics, metrics
+
+
+def _fit_final_model(
+        algorithm_name: AvailableAlgorithm,
+        training_params: dict,
+        x_train: np.ndarray,
+        x_test: np.ndarray,
+        y_train: np.ndarray,
+        y_test: np.ndarray,
+        threads: int,
+        early_stopping_rounds: int | None = None,
+        validation_proportion: float = 0.1,
+        binned_path_prefix: str | None = None,
+        projection: Projection | None = None,
+        projection_components: int = 32,
+        reporter: ProgressReporter | None = None
+) -> tuple[TModel, TrainingStatistics, Metrics]:
+    algorithm_model = service.create_model(
+        algorithm_name=algorithm_name,
+        training_params=training_params,
+        threads=threads,
+        projection=projection,
+        projection_components=projection_components,
+        random_state=global_config.split_random_state
+    )
+    logger.info(f"Train model of algorithm {algorithm_name!r} with {threads} threads")
+    with threadpool_limits(limits=threads):
+        with reporter.stage("fit") if reporter else contextlib.nullcontext():
+            trained_model, training_statistics = service.train_model(
+                model=algorithm_model,
+                x_train=x_train,
+                y_train=y_train,
+                early_stopping_rounds=early_stopping_rounds,
+                validation_proportion=validation_proportion,
+                random_state=global_config.split_random_state,
+                binned_path_prefix=binned_path_prefix,
+                reporter=reporter
+            )
+        logger.info(f"Calculate metrics for model of algorithm {algorithm_name!r}")
+        with reporter.stage("metrics") if reporter else contextlib.nullcontext():
+            metrics = service.calculate_metrics(
+                model=trained_model,
+                x_test=x_test,
+                y_test=y_test,
+                x_train=x_train
+            )
+            metrics.inference_profile = service.profile_model(
+                model=trained_model,
+                x_test=x_test,
+                samples=global_config.profile_samples,
+                single_rows=global_config.profile_single_rows
+            )
+    return trained_model, training_statistics, metrics
+
+
+@worker.celery.task(
+    base=TrainingModelTask,
+    redis=redis,
+    locked_task_expiration=global_config.locked_task_expiration,
+)
+def retrain_model(
+        filename: str,
+        model_id: str,
+        dataset_id: str,
+        training_data_proportion: float,
+        additional_estimators: int
+) -> None:
+    logger.info(f"Start retraining model {model_id!r} on dataset {dataset_id!r}")
+    parent = core_service.get_document_by_id(
+        id_=model_id,
+        collection=mongo_collection_models,
+        document_class=ModelDocument
+    )
+    if parent.algorithm not in INCREMENTAL_ALGORITHMS:
+        raise ValueError(f"Incremental training is not supported for algorithm {parent.algorithm}")
+    dataset = core_service.get_document_by_id(
+        id_=dataset_id,
+        collection=mongo_collection_datasets,
+        document_class=DatasetDocument
+    )
+    filename = core_service.render_filename(raw_filename=filename, expected_extension=Extension.PKL)
+    model = service.load_model(
+        model=parent,
+        minio=minio,
+        bucket_name=global_config.minio.trained_models_bucket_name
+    )
+    dataset_arrays = service.load_dataset(
+        dataset=dataset,
+        minio=minio,
+        bucket_name=global_config.minio.preprocessed_datasets_bucket_name,
+        cache_config=global_config.cache
+    )
+    split = cache.load_split(
+        md5=dataset.md5,
+        cache_dir_path=global_config.cache.dir_path,
+        samples=len(dataset_arrays.y),
         training_data_proportion=training_data_proportion,
-        parameters=training_params,
-        accuracy=metrics.accuracy,
-        precision=metrics.precision,
-        recall=metrics.recall
+        random_state=global_config.split_random_state
     )
-    storage.upload_file(
-        minio_client=minio,
+    with cpu.allocate_threads(
+        redis=redis,
+        budget=global_config.cpu_budget,
+        requested=global_config.cpu_threads_per_task,
+        expiration=global_config.locked_task_expiration
+    ) as threads:
+        logger.info(
+            f"Continue training of model {model_id!r} on {len(split.train_indices)} new samples"
+        )
+        retrained_model, training_statistics = service.retrain_model(
+            model=model,
+            algorithm_name=parent.algorithm,
+            x_train=pruning.apply_mask(
+                x=dataset_arrays.x[split.train_indices],
+                feature_mask=parent.feature_mask
+            ),
+            y_train=dataset_arrays.y[split.train_indices],
+            additional_estimators=additional_estimators,
+            threads=threads
+        )
+        x_test = pruning.apply_mask(
+            x=dataset_arrays.x[split.test_indices],
+            feature_mask=parent.feature_mask
+        )
+        metrics = service.calculate_metrics(
+            model=retrained_model,
+            x_test=x_test,
+            y_test=dataset_arrays.y[split.test_indices]
+        )
+        metrics.inference_profile = service.profile_model(
+            model=retrained_model,
+            x_test=x_test,
+            samples=global_config.profile_samples,
+            single_rows=global_config.profile_single_rows
+        )
+    service.register_model(
+        trained_model=retrained_model,
+        filename=filename,
+        dataset_id=dataset.id,
+        algorithm_name=parent.algorithm,
+        training_params=parent.parameters,
+        training_data_proportion=training_data_proportion,
+        training_statistics=training_statistics,
+        metrics=metrics,
+        minio=minio,
         bucket_name=global_config.minio.trained_models_bucket_name,
-        file_name=md5,
-        file_data=serialized_model,
-        part_size=global_config.minio.part_size
+        collection=mongo_collection_models,
+        part_size=global_config.minio.part_size,
+        parent=parent,
+        feature_mask=parent.feature_mask
     )
-    logger.info(f"Add model with md5 {md5!r} to database")
-    mongo_collection_models.insert_one(model.model_dump())
+
+
+@worker.celery.task(
+    base=TrainingModelTask,
+    redis=redis,
+    locked_task_expiration=global_config.locked_task_expiration,
+)
+def distill_model(
+        filename: str,
+        dataset_id: str,
+        teacher_ids: list[str],
+        training_params: dict,
+        algorithm_name: AvailableAlgorithm,
+        training_data_proportion: float
+) -> None:
+    logger.info(f"Start distilling models {teacher_ids} into model of algorithm {algorithm_name!r}")
+    teacher_documents = [
+        core_service.get_document_by_id(
+            id_=id_,
+            collection=mongo_collection_models,
+            document_class=ModelDocument
+        ) for id_ in teacher_ids
+    ]
+    dataset = core_service.get_document_by_id(
+        id_=dataset_id,
+        collection=mongo_collection_datasets,
+        document_class=DatasetDocument
+    )
+    filename = core_service.render_filename(raw_filename=filename, expected_extension=Extension.PKL)
+    dataset_arrays = service.load_dataset(
+        dataset=dataset,
+        minio=minio,
+        bucket_name=global_config.minio.preprocessed_datasets_bucket_name,
+        cache_config=global_config.cache
+    )
+    split = cache.load_split(
+        md5=dataset.md5,
+        cache_dir_path=global_config.cache.dir_path,
+        samples=len(dataset_arrays.y),
+        training_data_proportion=training_data_proportion,
+        random_state=global_config.split_random_state
+    )
+    x_train, x_test = dataset_arrays.x[split.train_indices], dataset_arrays.x[split.test_indices]
+    y_test = dataset_arrays.y[split.test_indices]
+    with cpu.allocate_threads(
+        redis=redis,
+        budget=global_config.cpu_budget,
+        requested=global_config.cpu_threads_per_task,
+        expiration=global_config.locked_task_expiration
+    ) as threads:
+        teachers = [
+            (
+                teacher_document,
+                cpu.set_model_threads(
+                    model=service.load_model(
+                        model=teacher_document,
+                        minio=minio,
+                        bucket_name=global_config.minio.trained_models_bucket_name
+                    ),
+                    algorithm_name=teacher_document.algorithm,
+                    threads=threads
+                )
+            ) for teacher_document in teacher_documents
+        ]
+        logger.info(f"Label {len(x_train)} training rows with vote of {len(teachers)} models")
+        with threadpool_limits(limits=threads):
+            train_votes = service.label_with_ensemble(
+                teachers=teachers,
+                x=x_train,
+                chunk_size=global_config.training_chunk_size
+            )
+            test_votes = service.label_with_ensemble(
+                teachers=teachers,
+                x=x_test,
+                chunk_size=global_config.training_chunk_size
+            )
+        del teachers
+        # Pre-binned data is cached for true labels, so student is fitted from raw data
+        trained_model, training_statistics, metrics = _fit_final_model(
+            algorithm_name=algorithm_name,
+            training_params=training_params,
+            x_train=x_train,
+            x_test=x_test,
+            y_train=train_votes,
+            y_test=y_test,
+            threads=threads
+        )
+        metrics.agreement_rate = distillation.calculate_agreement_rate(
+            model=trained_model,
+            x=x_test,
+            votes=test_votes
+        )
     logger.info(
-        f"Model with md5 {md5!r} and filename {filename!r} "
-        f"was uploaded to storage and saved to database successfully"
+        f"Distilled model agrees with ensemble on {metrics.agreement_rate:.2%} of test rows, "
+        f"prediction time {metrics.prediction_time} seconds"
     )
+    service.register_model(
+        trained_model=trained_model,
+        filename=filename,
+        dataset_id=dataset.id,
+        algorithm_name=algorithm_name,
+        training_params=training_params,
+        training_data_proportion=training_data_proportion,
+        training_statistics=training_statistics,
+        metrics=metrics,
+        minio=minio,
+        bucket_name=global_config.minio.trained_models_bucket_name,
+        collection=mongo_collection_models,
+        part_size=global_config.minio.part_size,
+        teacher_ids=teacher_ids
+    )
+
+
+class BatchTrainingModelTask(Task):
+    redis: Redis
+    locked_task_expiration: int
+
+    def before_start(self, task_id, args, kwargs) -> None:
+        filenames = [spec["filename"] for spec in kwargs["models"]]
+        for filename in filenames:
+            rendered_filename = core_service.render_filename(filename, Extension.PKL)
+            if core_service.get_documents_by_query(
+                document_class=ModelDocument,
+                collection=mongo_collection_models,
+                field_name="name",
+                value=rendered_filename
+            ):
+                logger.error(f"Model with name {filename!r} has already existed in database")
+                raise ValueError(
+                    f"Model with name {rendered_filename!r} has already existed in database"
+                )
+
+        locked_filenames: list[str] = []
+        for filename in filenames:
+            if not self.redis.set(filename, 'lock', ex=self.locked_task_expiration, nx=True):
+                logger.error(f"Model with name {filename!r} has already locked by another task")
+                if locked_filenames:
+                    self.redis.delete(*locked_filenames)
+                raise LockException()
+            locked_filenames.append(filename)
+
+    def on_success(self, retval, task_id, args, kwargs) -> None:
+        self.redis.delete(*[spec["filename"] for spec in kwargs["models"]])
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo) -> None:
+        if isinstance(exc, LockException):
+            return
+        self.redis.delete(*[spec["filename"] for spec in kwargs["models"]])
+
+
+@worker.celery.task(
+    base=BatchTrainingModelTask,
+    redis=redis,
+    locked_task_expiration=global_config.locked_task_expiration,
+)
+def train_models(
+        dataset_id: str,
+        models: list[dict],
+        training_data_proportion: float,
+        max_workers: int | None
+) -> None:
+    specs = [ModelSpec(**spec) for spec in models]
+    logger.info(f"Start batch training of {len(specs)} models for dataset {dataset_id!r}")
+    dataset = core_service.get_document_by_id(
+        id_=dataset_id,
+        collection=mongo_collection_datasets,
+        document_class=DatasetDocument
+    )
+    dataset_arrays = service.load_dataset(
+        dataset=dataset,
+        minio=minio,
+        bucket_name=global_config.minio.preprocessed_datasets_bucket_name,
+        cache_config=global_config.cache
+    )
+    split = cache.load_split(
+        md5=dataset.md5,
+        cache_dir_path=global_config.cache.dir_path,
+        samples=len(dataset_arrays.y),
+        training_data_proportion=training_data_proportion,
+        random_state=global_config.split_random_state
+    )
+
+    failed_filenames = []
+    with cpu.allocate_threads(
+        redis=redis,
+        budget=global_config.cpu_budget,
+        requested=global_config.cpu_threads_per_task,
+        expiration=global_config.locked_task_expiration
+    ) as threads:
+        processes = min(max_workers or len(specs), len(specs), threads)
+        threads_per_model = max(1, threads // processes)
+        logger.info(f"Fit models in {processes} processes with {threads_per_model} threads each")
+        with parallel.get_process_pool(max_workers=processes) as executor:
+            futures: dict[Future, ModelSpec] = {
+                executor.submit(
+                    service.fit_model,
+                    algorithm_name=spec.algorithm_name,
+                    training_params=spec.training_params,
+                    md5=dataset.md5,
+                    cache_dir_path=global_config.cache.dir_path,
+                    split=split,
+                    threads=threads_per_model,
+                    profile_samples=global_config.profile_samples,
+                    profile_single_rows=global_config.profile_single_rows
+                ): spec for spec in specs
+            }
+            for future in as_completed(futures):
+                spec = futures[future]
+                try:
+                    trained_model, training_statistics, metrics = future.result()
+                    service.register_model(
+                        trained_model=trained_model,
+                        filename=core_service.render_filename(
+                            raw_filename=spec.filename,
+                            expected_extension=Extension.PKL
+                        ),
+                        dataset_id=dataset.id,
+                        algorithm_name=spec.algorithm_name,
+                        training_params=spec.training_params,
+                        training_data_proportion=training_data_proportion,
+                        training_statistics=training_statistics,
+                        metrics=metrics,
+                        minio=minio,
+                        bucket_name=global_config.minio.trained_models_bucket_name,
+                        collection=mongo_collection_models,
+                        part_size=global_config.minio.part_size
+                    )
+                except Exception:
+                    logger.exception(f"Training of model {spec.filename!r} failed")
+                    failed_filenames.append(spec.filename)
+    if failed_filenames:
+        raise RuntimeError(f"Training of models {failed_filenames} failed")
+    logger.info(f"Batch training of {len(specs)} models finished successfully")
 
 
 @worker.celery.task(
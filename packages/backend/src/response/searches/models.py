@@ -0,0 +1,36 @@
+from pydantic import (
+    Field,
+    BaseModel,
+    model_validator
+)
+
+from ...core import AvailableAlgorithm
+from ...core.enums import (
+    Metric,
+    SearchStrategy
+)
+
+
+class SearchParams(BaseModel):
+    filename: str = Field(description="Base name of files of registered top models")
+    dataset_id: str
+    algorithm_name: AvailableAlgorithm
+    parameter_space: dict[str, list] = Field(description="Candidate values of each parameter")
+    strategy: SearchStrategy = SearchStrategy.GRID
+    scoring: Metric = Metric.ACCURACY
+    n_trials: int | None = Field(
+        default=None,
+        gt=0,
+        description="Number of sampled candidates for random search and successive halving"
+    )
+    top_k: int = Field(default=1, gt=0, description="Number of best models to register")
+    training_data_proportion: float = Field(gt=0, lt=1)
+    halving_factor: int = Field(default=3, ge=2)
+    max_workers: int | None = Field(default=None, gt=0)
+
+    @model_validator(mode="after")
+    def validate_n_trials(self) -> "SearchParams":
+        if self.strategy == SearchStrategy.RANDOM and self.n_trials is None:
+            raise ValueError("Number of trials is required for random search")
+        return self
+
@@ -0,0 +1,70 @@
+from fastapi import (
+    Path,
+    status,
+    APIRouter
+)
+from fastapi.responses import JSONResponse
+from fastapi_pagination.utils import disable_installed_extensions_check
+from fastapi_pagination import (
+    Page,
+    paginate
+)
+
+from . import tasks
+from . import service
+from .models import SearchParams
+from ...core.models import SearchDocument
+from ...core import service as core_service
+from ...core import mongo_collection_searches
+
+router = APIRouter(prefix="/searches", tags=["Searches"])
+disable_installed_extensions_check()
+
+
+@router.post(path="/", name="Запустить подбор гиперпараметров")
+def run_search(params: SearchParams) -> JSONResponse:
+    try:
+        service.validate_parameter_space(
+            algorithm_name=params.algorithm_name,
+            parameter_space=params.parameter_space
+        )
+    except ValueError as exc:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"status": f"Wrong parameter space: {exc}"}
+        )
+    tasks.run_search.apply_async(kwargs=params.model_dump())
+    return JSONResponse(
+        status_code=status.HTTP_201_CREATED,
+        content={
+            "status": f"Search of {params.strategy.value} strategy for algorithm "
+                      f"{params.algorithm_name.value} is started"
+        }
+    )
+
+
+@router.get(
+    path="/",
+    name="Получить задачи подбора гиперпараметров",
+    response_model=Page[SearchDocument]
+)
+def get_searches() -> Page[SearchDocument]:
+    return paginate(
+        core_service.get_documents(
+            document_class=SearchDocument,
+            collection=mongo_collection_searches
+        )
+    )
+
+
+@router.get(
+    path="/{id}",
+    name="Получить результаты подбора гиперпараметров",
+    response_model=SearchDocument
+)
+def get_search(id_: str = Path(alias="id")) -> SearchDocument:
+    return core_service.get_document_by_id(
+        id_=id_,
+        collection=mongo_collection_searches,
+        document_class=SearchDocument
+    )
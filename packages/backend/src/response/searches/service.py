@@ -0,0 +1,232 @@
+import math
+import random
+import logging
+import pathlib
+from concurrent.futures import (
+    Executor,
+    as_completed
+)
+
+import numpy as np
+from threadpoolctl import threadpool_limits
+
+from ...core import (
+    cache,
+    parallel,
+    AvailableAlgorithm,
+    available_algorithms_params
+)
+from ...core.enums import (
+    Metric,
+    Extension,
+    SearchStrategy
+)
+from ...core.models import (
+    SearchTrial,
+    DatasetSplit
+)
+from ...core import service as core_service
+from ..models import service as models_service
+
+logger = logging.getLogger(__name__)
+
+
+def validate_parameter_space(
+        algorithm_name: AvailableAlgorithm,
+        parameter_space: dict[str, list]
+) -> None:
+    params_class = available_algorithms_params[algorithm_name]
+    for name, values in parameter_space.items():
+        if name not in params_class.model_fields:
+            raise ValueError(f"Algorithm {algorithm_name.value} has no parameter {name}")
+        if not values:
+            raise ValueError(f"Parameter {name} has no candidate values")
+        for value in values:
+            params_class(**{name: value})
+
+
+def generate_candidates(
+        parameter_space: dict[str, list],
+        strategy: SearchStrategy,
+        n_trials: int | None,
+        random_state: int
+) -> list[dict]:
+    names = sorted(parameter_space)
+    sizes = [len(parameter_space[name]) for name in names]
+    total = math.prod(sizes)
+    if strategy == SearchStrategy.GRID or n_trials is None or n_trials >= total:
+        indices = list(range(total))
+    else:
+        # Candidates are sampled by index in the grid, so huge grids are never materialized
+        indices = random.Random(random_state).sample(range(total), n_trials)
+
+    candidates = []
+    for index in indices:
+        candidate = {}
+        for name, size in zip(reversed(names), reversed(sizes), strict=True):
+            index, value_index = divmod(index, size)
+            candidate[name] = parameter_space[name][value_index]
+        candidates.append(candidate)
+    return candidates
+
+
+def run_trial(
+        algorithm_name: AvailableAlgorithm,
+        parameters: dict,
+        md5: str,
+        cache_dir_path: str,
+        train_indices: np.ndarray,
+        test_indices: np.ndarray,
+        rung: int,
+        keep_model: bool,
+        threads: int
+) -> tuple[SearchTrial, bytes | None]:
+    dataset = cache.open_dataset(md5=md5, cache_dir_path=cache_dir_path)
+    with threadpool_limits(limits=threads):
+        trained_model, training_statistics = models_service.train_model(
+            model=models_service.create_model(
+                algorithm_name=algorithm_name,
+                training_params=parameters,
+                threads=threads
+            ),
+            x_train=dataset.x[train_indices],
+            y_train=dataset.y[train_indices]
+        )
+        metrics = models_service.calculate_metrics(
+            model=trained_model,
+            x_test=dataset.x[test_indices],
+            y_test=dataset.y[test_indices]
+        )
+    trial = SearchTrial(
+        parameters=parameters,
+        rung=rung,
+        training_samples=len(train_indices),
+        training_time=training_statistics.training_time,
+        prediction_time=metrics.prediction_time,
+        accuracy=metrics.accuracy,
+        precision=metrics.precision,
+        recall=metrics.recall
+    )
+    return trial, models_service.serialize_model(trained_model) if keep_model else None
+
+
+def run_search(
+        algorithm_name: AvailableAlgorithm,
+        candidates: list[dict],
+        md5: str,
+        cache_dir_path: str,
+        split: DatasetSplit,
+        strategy: SearchStrategy,
+        scoring: Metric,
+        top_k: int,
+        halving_factor: int,
+        max_workers: int,
+        threads: int
+) -> tuple[list[SearchTrial], list[tuple[SearchTrial, bytes]]]:
+    """Run trials in process pool and return all trials with serialized top models."""
+    if strategy == SearchStrategy.SUCCESSIVE_HALVING and len(candidates) > 1:
+        rungs = 1 + math.ceil(math.log(len(candidates), halving_factor))
+    else:
+        rungs = 1
+    train_samples = len(split.train_indices)
+
+    trials: list[SearchTrial] = []
+    results: list[tuple[SearchTrial, bytes | None]] = []
+    processes = min(max_workers, threads)
+    threads_per_trial = max(1, threads // processes)
+    with parallel.get_process_pool(max_workers=processes) as executor:
+        for rung in range(rungs):
+            # Each rung trains survivors on a larger prefix of shuffled training indices,
+            # the last rung always uses the whole training data
+            samples = max(
+                train_samples // halving_factor ** (rungs - 1 - rung),
+                min(train_samples, halving_factor * 10)
+            )
+            is_last_rung = rung == rungs - 1
+            logger.info(
+                f"Run rung {rung} of search: {len(candidates)} candidates on {samples} samples"
+            )
+            results = _run_trials(
+                executor=executor,
+                algorithm_name=algorithm_name,
+                candidates=candidates,
+                md5=md5,
+                cache_dir_path=cache_dir_path,
+                train_indices=split.train_indices[:samples],
+                test_indices=split.test_indices,
+                rung=rung,
+                scoring=scoring,
+                top_k=top_k if is_last_rung else 0,
+                threads=threads_per_trial
+            )
+            trials.extend(trial for trial, _ in results)
+            if not is_last_rung:
+                survivors = math.ceil(len(candidates) / halving_factor)
+                candidates = [
+                    trial.parameters
+                    for trial, _ in rank_trials(results, scoring=scoring)[:survivors]
+                ]
+    top_models = [
+        (trial, serialized_model)
+        for trial, serialized_model in rank_trials(results, scoring=scoring)[:top_k]
+        if serialized_model is not None
+    ]
+    return trials, top_models
+
+
+def rank_trials(
+        results: list[tuple[SearchTrial, bytes | None]],
+        scoring: Metric
+) -> list[tuple[SearchTrial, bytes | None]]:
+    return sorted(
+        results,
+        key=lambda result: (-getattr(result[0], scoring.value), result[0].training_time)
+    )
+
+
+def render_top_model_filename(filename: str, rank: int) -> str:
+    path = pathlib.Path(filename)
+    stem = path.stem if path.suffix == f".{Extension.PKL.value}" else filename
+    return core_service.render_filename(
+        raw_filename=f"{stem}_{rank}",
+        expected_extension=Extension.PKL
+    )
+
+
+def _run_trials(
+        executor: Executor,
+        algorithm_name: AvailableAlgorithm,
+        candidates: list[dict],
+        md5: str,
+        cache_dir_path: str,
+        train_indices: np.ndarray,
+        test_indices: np.ndarray,
+        rung: int,
+        scoring: Metric,
+        top_k: int,
+        threads: int
+) -> list[tuple[SearchTrial, bytes | None]]:
+    futures = [
+        executor.submit(
+            run_trial,
+            algorithm_name=algorithm_name,
+            parameters=parameters,
+            md5=md5,
+            cache_dir_path=cache_dir_path,
+            train_indices=train_indices,
+            test_indices=test_indices,
+            rung=rung,
+            keep_model=bool(top_k),
+            threads=threads
+        ) for parameters in candidates
+    ]
+    results: list[tuple[SearchTrial, bytes | None]] = []
+    for future in as_completed(futures):
+        results.append(future.result())
+        if len(results) > top_k:
+            # Only serialized models which can still get into top are kept in memory
+            ranked_results = rank_trials(results, scoring=scoring)
+            results = ranked_results[:top_k] + [
+                (trial, None) for trial, _ in ranked_results[top_k:]
+            ]
+    return results
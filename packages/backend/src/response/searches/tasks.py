@@ -0,0 +1,193 @@
+import time
+import logging
+import datetime
+
+from bson import ObjectId
+from celery import Task
+from redis import Redis
+
+from . import service
+from ... import worker
+from ...core import (
+    cpu,
+    redis,
+    cache,
+    minio,
+    LockException,
+    global_config,
+    AvailableAlgorithm,
+    service as core_service,
+    mongo_collection_models,
+    mongo_collection_datasets,
+    mongo_collection_searches
+)
+from ...core.enums import (
+    Metric,
+    JobStatus,
+    SearchStrategy
+)
+from ...core.models import (
+    Model,
+    Search,
+    ModelDocument,
+    DatasetDocument
+)
+from ..models import service as models_service
+
+logger = logging.getLogger(__name__)
+
+
+class SearchTask(Task):
+    redis: Redis
+    locked_task_expiration: int
+
+    def before_start(self, task_id, args, kwargs) -> None:
+        for rank in range(1, kwargs["top_k"] + 1):
+            filename = service.render_top_model_filename(kwargs["filename"], rank)
+            if core_service.get_documents_by_query(
+                document_class=ModelDocument,
+                collection=mongo_collection_models,
+                field_name="name",
+                value=filename
+            ):
+                logger.error(f"Model with name {filename!r} has already existed in database")
+                raise ValueError(f"Model with name {filename!r} has already existed in database")
+
+        status = self.redis.set(kwargs["filename"], 'lock', ex=self.locked_task_expiration, nx=True)
+        if not status:
+            logger.error(
+                f"Search with name {kwargs['filename']!r} has already locked by another task"
+            )
+            raise LockException()
+
+    def on_success(self, retval, task_id, args, kwargs) -> None:
+        self.redis.delete(kwargs["filename"])
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo) -> None:
+        if isinstance(exc, LockException):
+            return
+        self.redis.delete(kwargs["filename"])
+
+
+@worker.celery.task(
+    base=SearchTask,
+    redis=redis,
+    locked_task_expiration=global_config.locked_task_expiration
+)
+def run_search(
+        filename: str,
+        dataset_id: str,
+        algorithm_name: AvailableAlgorithm,
+        parameter_space: dict[str, list],
+        strategy: SearchStrategy,
+        scoring: Metric,
+        n_trials: int | None,
+        top_k: int,
+        training_data_proportion: float,
+        halving_factor: int,
+        max_workers: int | None
+) -> None:
+    logger.info(f"Start {strategy} search for algorithm {algorithm_name!r} on {dataset_id!r}")
+    dataset = core_service.get_document_by_id(
+        id_=dataset_id,
+        collection=mongo_collection_datasets,
+        document_class=DatasetDocument
+    )
+    search = Search(
+        dataset_id=dataset.id,
+        algorithm=algorithm_name,
+        strategy=strategy,
+        parameter_space=parameter_space,
+        scoring=scoring,
+        training_data_proportion=training_data_proportion,
+        status=JobStatus.RUNNING,
+        created_at=datetime.datetime.now(tz=datetime.timezone(datetime.timedelta(hours=3)))
+    )
+    search_id = mongo_collection_searches.insert_one(search.model_dump()).inserted_id
+    start_time = time.time()
+    try:
+        dataset_arrays = models_service.load_dataset(
+            dataset=dataset,
+            minio=minio,
+            bucket_name=global_config.minio.preprocessed_datasets_bucket_name,
+            cache_config=global_config.cache
+        )
+        split = cache.load_split(
+            md5=dataset.md5,
+            cache_dir_path=global_config.cache.dir_path,
+            samples=len(dataset_arrays.y),
+            training_data_proportion=training_data_proportion,
+            random_state=global_config.split_random_state
+        )
+        candidates = service.generate_candidates(
+            parameter_space=parameter_space,
+            strategy=strategy,
+            n_trials=n_trials,
+            random_state=global_config.split_random_state
+        )
+        logger.info(f"Generated {len(candidates)} candidates for search {search_id!r}")
+        with cpu.allocate_threads(
+            redis=redis,
+            budget=global_config.cpu_budget,
+            requested=global_config.cpu_threads_per_task,
+            expiration=global_config.locked_task_expiration
+        ) as threads:
+            trials, top_models = service.run_search(
+                algorithm_name=algorithm_name,
+                candidates=candidates,
+                md5=dataset.md5,
+                cache_dir_path=global_config.cache.dir_path,
+                split=split,
+                strategy=strategy,
+                scoring=scoring,
+                top_k=top_k,
+                halving_factor=halving_factor,
+                max_workers=max_workers or threads,
+                threads=threads
+            )
+
+        model_ids = []
+        created_at = datetime.datetime.now(tz=datetime.timezone(datetime.timedelta(hours=3)))
+        for rank, (trial, serialized_model) in enumerate(top_models, start=1):
+            md5 = models_service.get_model_md5(
+                serialized_model=serialized_model,
+                collection=mongo_collection_models,
+                part_size=global_config.minio.part_size
+            )
+            model = Model(
+                name=service.render_top_model_filename(filename, rank),
+                dataset_id=dataset.id,
+                md5=md5,
+                algorithm=algorithm_name,
+                created_at=created_at,
+                training_time=trial.training_time,
+                training_data_proportion=training_data_proportion,
+                parameters=trial.parameters,
+                accuracy=trial.accuracy,
+                precision=trial.precision,
+                recall=trial.recall
+            )
+            model_ids.append(models_service.save_model(
+                model=model,
+                serialized_model=serialized_model,
+                minio=minio,
+                bucket_name=global_config.minio.trained_models_bucket_name,
+                collection=mongo_collection_models,
+                part_size=global_config.minio.part_size
+            ))
+    except Exception:
+        mongo_collection_searches.update_one(
+            filter={"_id": ObjectId(search_id)},
+            update={"$set": {"status": JobStatus.FAILED}}
+        )
+        raise
+    mongo_collection_searches.update_one(
+        filter={"_id": ObjectId(search_id)},
+        update={"$set": {
+            "status": JobStatus.COMPLETED,
+            "search_time": round(time.time() - start_time, 6),
+            "trials": [trial.model_dump() for trial in trials],
+            "model_ids": model_ids
+        }}
+    )
+    logger.info(f"Search {search_id!r} finished, registered models: {model_ids}")
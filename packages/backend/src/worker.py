@@ -1,10 +1,22 @@
 import logging
+import threading
 
 from celery import Celery, chain
-from celery.signals import worker_ready
+from celery.worker import WorkController
+from celery.signals import (
+    worker_ready,
+    worker_shutdown,
+    celeryd_after_setup
+)
 
 from . import initializer
-from .core import global_config
+from .core import (
+    redis,
+    queues,
+    affinity,
+    global_config
+)
+from .core.enums import TaskQueue
 
 logging.basicConfig(
     level=logging.DEBUG,
@@ -25,15 +37,40 @@ celery = Celery(
         "src.initializer.tasks",
         "src.response.datasets.tasks",
         "src.response.models.tasks",
+        "src.response.searches.tasks",
+        "src.response.benchmarks.tasks",
         "src.response.classifications.tasks"
     ],
     worker_hijack_root_logger=False
 )
+queues.configure(celery=celery, config=global_config.celery)
+
+# Heartbeats of worker nodes joined to classification hash ring
+_heartbeats: dict[str, threading.Event] = {}
+
+
+@celeryd_after_setup.connect
+def on_setup(sender: str, instance: WorkController, **kwargs: object) -> None:
+    if not _joins_affinity_ring():
+        return
+    queue = affinity.get_worker_queue(sender)
+    instance.app.amqp.queues.select_add(queue, routing_key=queue)
+    logger.info(f"Worker {sender!r} consumes its classification queue {queue!r}")
 
 
 @worker_ready.connect
-def on_startup(**kwargs) -> None:
+def on_startup(sender, **kwargs) -> None:
     celery.control.purge()
+    if _joins_affinity_ring():
+        _heartbeats[sender.hostname] = affinity.start_heartbeat(
+            redis=redis,
+            node=sender.hostname,
+            interval=global_config.celery.affinity_heartbeat_interval
+        )
+    # Initial files are loaded once by workers consuming initialization queue
+    profile_queues = queues.QUEUES_BY_PROFILE[global_config.celery.worker_profile]
+    if TaskQueue.INITIALIZATION not in profile_queues:
+        return
     logger.info(f"Start tasks for initial loading dataset and trained models")
     chain(
         initializer.tasks.load_preprocessed_datasets.s(
@@ -48,3 +85,19 @@ def on_startup(**kwargs) -> None:
         )
     )()
 
+
+@worker_shutdown.connect
+def on_shutdown(sender: WorkController, **kwargs: object) -> None:
+    stopped = _heartbeats.pop(sender.hostname, None)
+    if stopped is None:
+        return
+    stopped.set()
+    # Models of leaving worker are moved to the rest of ring by the next classification
+    affinity.unregister_worker(redis=redis, node=sender.hostname)
+
+
+def _joins_affinity_ring() -> bool:
+    profile_queues = queues.QUEUES_BY_PROFILE[global_config.celery.worker_profile]
+    return global_config.celery.classification_affinity and (
+        TaskQueue.CLASSIFICATION in profile_queues
+    )